@@ -1,22 +1,348 @@
 from __future__ import annotations
 
+import math
 import time
+from collections import OrderedDict
+from collections.abc import Sequence
+from dataclasses import dataclass
+from typing import Literal
 
-from fastapi import HTTPException, Request, status
+from fastapi import HTTPException, Request, Response, status
+from prometheus_client import Counter
+from redis.commands.core import AsyncScript
+from redis.exceptions import RedisError
 
 from app.core.config import settings
+from app.core.logging import get_logger
+from app.core.security import decode_access_token
 from app.infrastructure.cache.redis import get_client
 
+logger = get_logger(__name__)
 
-async def rate_limiter(request: Request) -> None:
-    client = await get_client()
-    identifier = request.headers.get("x-user-id") or request.client.host
-    key = f"rate:{identifier}:{int(time.time() // 60)}"
-    current = await client.incr(key)
-    if current == 1:
-        await client.expire(key, 60)
-    if current > settings.rate_limit_per_minute:
-        raise HTTPException(
-            status_code=status.HTTP_429_TOO_MANY_REQUESTS,
-            detail="Rate limit exceeded",
+RATE_LIMIT_DECISIONS = Counter(
+    "rate_limit_decisions_total",
+    "Rate limiter decisions",
+    labelnames=("result",),
+)
+
+# Token buckets for every limit of a request are checked and charged in one
+# atomic call. KEYS are bucket keys; ARGV holds now (ms), cost and then a
+# (capacity, window ms) pair per key. Tokens are only deducted when every
+# bucket can pay, so a rejected request does not drain the others.
+TOKEN_BUCKET_SCRIPT = """
+local now = tonumber(ARGV[1])
+local cost = tonumber(ARGV[2])
+local levels = {}
+local allowed = 1
+local retry_ms = 0
+for i = 1, #KEYS do
+  local capacity = tonumber(ARGV[1 + 2 * i])
+  local window = tonumber(ARGV[2 + 2 * i])
+  local rate = capacity / window
+  local state = redis.call('HMGET', KEYS[i], 't', 'ts')
+  local tokens = tonumber(state[1])
+  local ts = tonumber(state[2])
+  if tokens == nil then
+    tokens = capacity
+    ts = now
+  end
+  tokens = math.min(capacity, tokens + math.max(0, now - ts) * rate)
+  levels[i] = tokens
+  if tokens < cost then
+    allowed = 0
+    retry_ms = math.max(retry_ms, math.ceil((cost - tokens) / rate))
+  end
+end
+local limit = 0
+local remaining = -1
+local reset_ms = 0
+for i = 1, #KEYS do
+  local capacity = tonumber(ARGV[1 + 2 * i])
+  local window = tonumber(ARGV[2 + 2 * i])
+  local tokens = levels[i]
+  if allowed == 1 then
+    tokens = tokens - cost
+  end
+  redis.call('HSET', KEYS[i], 't', tostring(tokens), 'ts', now)
+  redis.call('PEXPIRE', KEYS[i], window)
+  local left = math.max(0, math.floor(tokens))
+  if remaining < 0 or left < remaining then
+    remaining = left
+    limit = capacity
+    reset_ms = math.ceil((capacity - tokens) / (capacity / window))
+  end
+end
+return {allowed, limit, remaining, reset_ms, retry_ms}
+"""
+
+# Leased mode: a worker takes up to ``want`` tokens from each bucket in one call
+# and spends them locally. ARGV holds now (ms) and then a
+# (capacity, window ms, want, refund) tuple per key; ``refund`` returns the
+# unspent part of the worker's previous lease before the new grant is taken.
+# Replies with (granted, remaining, reset ms) per key.
+LEASE_SCRIPT = """
+local now = tonumber(ARGV[1])
+local result = {}
+for i = 1, #KEYS do
+  local base = 1 + 4 * (i - 1)
+  local capacity = tonumber(ARGV[base + 1])
+  local window = tonumber(ARGV[base + 2])
+  local want = tonumber(ARGV[base + 3])
+  local refund = tonumber(ARGV[base + 4])
+  local rate = capacity / window
+  local state = redis.call('HMGET', KEYS[i], 't', 'ts')
+  local tokens = tonumber(state[1])
+  local ts = tonumber(state[2])
+  if tokens == nil then
+    tokens = capacity
+    ts = now
+  end
+  tokens = math.min(capacity, tokens + math.max(0, now - ts) * rate + refund)
+  local granted = math.max(0, math.min(want, math.floor(tokens)))
+  tokens = tokens - granted
+  redis.call('HSET', KEYS[i], 't', tostring(tokens), 'ts', now)
+  redis.call('PEXPIRE', KEYS[i], window)
+  table.insert(result, granted)
+  table.insert(result, math.floor(tokens))
+  table.insert(result, math.ceil((capacity - tokens) / rate))
+end
+return result
+"""
+
+
+@dataclass(frozen=True)
+class RateLimit:
+    scope: Literal["ip", "user"]
+    limit: int
+    window_seconds: int = 60
+
+
+@dataclass(frozen=True)
+class RateLimitDecision:
+    allowed: bool
+    limit: int
+    remaining: int
+    reset_seconds: int
+    retry_after_seconds: int
+
+
+def default_limits() -> tuple[RateLimit, ...]:
+    return (
+        RateLimit(scope="ip", limit=settings.rate_limit_ip_per_minute),
+        RateLimit(scope="user", limit=settings.rate_limit_per_minute),
+    )
+
+
+def _identifiers(request: Request) -> dict[str, str]:
+    identifiers = {"ip": request.client.host if request.client else "unknown"}
+    authorization = request.headers.get("authorization", "")
+    scheme, _, token = authorization.partition(" ")
+    if scheme.lower() == "bearer" and token:
+        subject = decode_access_token(token)
+        if subject:
+            identifiers["user"] = subject
+    return identifiers
+
+
+_token_bucket: AsyncScript | None = None
+
+
+async def _token_bucket_script() -> AsyncScript:
+    global _token_bucket
+    if _token_bucket is None:
+        client = await get_client()
+        _token_bucket = client.register_script(TOKEN_BUCKET_SCRIPT)
+    return _token_bucket
+
+
+async def _evaluate_strict(
+    buckets: Sequence[tuple[str, RateLimit]], cost: int
+) -> RateLimitDecision:
+    script = await _token_bucket_script()
+    args: list[int] = [int(time.time() * 1000), cost]
+    for _, limit in buckets:
+        args.extend((limit.limit, limit.window_seconds * 1000))
+    allowed, limit, remaining, reset_ms, retry_ms = await script(
+        keys=[key for key, _ in buckets], args=args
+    )
+    return RateLimitDecision(
+        allowed=bool(allowed),
+        limit=int(limit),
+        remaining=int(remaining),
+        reset_seconds=math.ceil(int(reset_ms) / 1000),
+        retry_after_seconds=math.ceil(int(retry_ms) / 1000),
+    )
+
+
+_lease: AsyncScript | None = None
+
+
+async def _lease_script() -> AsyncScript:
+    global _lease
+    if _lease is None:
+        client = await get_client()
+        _lease = client.register_script(LEASE_SCRIPT)
+    return _lease
+
+
+async def _lease_remote(
+    requests: Sequence[tuple[str, RateLimit, int, int]],
+) -> list[tuple[int, int, int]]:
+    """Lease tokens for ``(key, limit, want, refund)`` requests in one round trip."""
+
+    script = await _lease_script()
+    args: list[int] = [int(time.time() * 1000)]
+    for _, limit, want, refund in requests:
+        args.extend((limit.limit, limit.window_seconds * 1000, want, refund))
+    reply = await script(keys=[key for key, _, _, _ in requests], args=args)
+    return [
+        (int(reply[index]), int(reply[index + 1]), int(reply[index + 2]))
+        for index in range(0, len(reply), 3)
+    ]
+
+
+@dataclass
+class _Lease:
+    tokens: int
+    expires_at: float
+    limit: int
+    remote_remaining: int
+    reset_seconds: int
+
+
+class LeasedQuota:
+    """Spends rate-limit tokens from per-worker leases instead of Redis.
+
+    A worker only talks to Redis when a bucket's lease is exhausted or older
+    than ``lease_seconds``; leftovers are refunded with the next lease. Global
+    overshoot is bounded by ``block_size`` tokens per worker and bucket.
+    """
+
+    def __init__(self, block_size: int, lease_seconds: float, max_leases: int = 10000) -> None:
+        self.block_size = block_size
+        self.lease_seconds = lease_seconds
+        self.max_leases = max_leases
+        self._leases: OrderedDict[str, _Lease] = OrderedDict()
+
+    def _usable(self, key: str, cost: int, now: float) -> bool:
+        lease = self._leases.get(key)
+        return lease is not None and lease.expires_at > now and lease.tokens >= cost
+
+    async def _renew(self, buckets: Sequence[tuple[str, RateLimit]], cost: int, now: float) -> None:
+        requests = []
+        for key, limit in buckets:
+            previous = self._leases.pop(key, None)
+            refund = previous.tokens if previous is not None else 0
+            want = min(max(self.block_size, cost), limit.limit)
+            requests.append((key, limit, want, refund))
+
+        grants = await _lease_remote(requests)
+        for request, grant in zip(requests, grants, strict=True):
+            key, limit, _, _ = request
+            granted, remaining, reset_ms = grant
+            self._leases[key] = _Lease(
+                tokens=granted,
+                expires_at=now + self.lease_seconds,
+                limit=limit.limit,
+                remote_remaining=remaining,
+                reset_seconds=math.ceil(reset_ms / 1000),
+            )
+        while len(self._leases) > self.max_leases:
+            self._leases.popitem(last=False)
+
+    async def evaluate(
+        self, buckets: Sequence[tuple[str, RateLimit]], cost: int
+    ) -> RateLimitDecision:
+        now = time.monotonic()
+        stale = [(key, limit) for key, limit in buckets if not self._usable(key, cost, now)]
+        if stale:
+            await self._renew(stale, cost, now)
+
+        leases = [(self._leases[key], limit) for key, limit in buckets]
+        allowed = all(lease.tokens >= cost for lease, _ in leases)
+        retry_after = 0
+        if allowed:
+            for lease, _ in leases:
+                lease.tokens -= cost
+        else:
+            retry_after = max(
+                math.ceil((cost - lease.tokens) * limit.window_seconds / limit.limit)
+                for lease, limit in leases
+                if lease.tokens < cost
+            )
+
+        tightest = min(leases, key=lambda item: item[0].tokens + item[0].remote_remaining)[0]
+        return RateLimitDecision(
+            allowed=allowed,
+            limit=tightest.limit,
+            remaining=tightest.tokens + tightest.remote_remaining,
+            reset_seconds=tightest.reset_seconds,
+            retry_after_seconds=retry_after,
         )
+
+
+leased_quota = LeasedQuota(
+    block_size=settings.rate_limit_lease_size,
+    lease_seconds=settings.rate_limit_lease_seconds,
+)
+
+
+async def _evaluate(buckets: Sequence[tuple[str, RateLimit]], cost: int) -> RateLimitDecision:
+    if settings.rate_limit_mode == "leased":
+        return await leased_quota.evaluate(buckets, cost)
+    return await _evaluate_strict(buckets, cost)
+
+
+class RateLimiter:
+    """FastAPI dependency enforcing token-bucket limits.
+
+    Each request is charged ``cost`` tokens against every applicable limit
+    (per IP, and per user when a valid bearer token is present). In ``strict``
+    mode that is one Redis round trip per request; in ``leased`` mode tokens
+    come from locally held leases. Attach it to a route or a whole router with
+    ``Depends(RateLimiter(cost=...))``.
+    """
+
+    def __init__(self, cost: int = 1, limits: Sequence[RateLimit] | None = None) -> None:
+        self.cost = cost
+        self._limits = tuple(limits) if limits is not None else None
+
+    @property
+    def limits(self) -> tuple[RateLimit, ...]:
+        return self._limits if self._limits is not None else default_limits()
+
+    async def __call__(self, request: Request, response: Response) -> None:
+        identifiers = _identifiers(request)
+        buckets = [
+            (f"rate:{limit.scope}:{limit.window_seconds}:{identifiers[limit.scope]}", limit)
+            for limit in self.limits
+            if limit.scope in identifiers
+        ]
+        if not buckets:
+            return
+        try:
+            decision = await _evaluate(buckets, self.cost)
+        except RedisError as exc:
+            RATE_LIMIT_DECISIONS.labels(result="error").inc()
+            logger.warning("rate_limit_unavailable", error=str(exc))
+            return
+
+        headers = {
+            "RateLimit-Limit": str(decision.limit),
+            "RateLimit-Remaining": str(decision.remaining),
+            "RateLimit-Reset": str(decision.reset_seconds),
+        }
+        if not decision.allowed:
+            RATE_LIMIT_DECISIONS.labels(result="rejected").inc()
+            headers["Retry-After"] = str(max(1, decision.retry_after_seconds))
+            raise HTTPException(
+                status_code=status.HTTP_429_TOO_MANY_REQUESTS,
+                detail="Rate limit exceeded",
+                headers=headers,
+            )
+        RATE_LIMIT_DECISIONS.labels(result="allowed").inc()
+        response.headers.update(headers)
+
+
+rate_limiter = RateLimiter()
+auth_rate_limiter = RateLimiter(cost=settings.rate_limit_auth_cost)
@@ -3,34 +3,108 @@ from __future__ import annotations
 import uuid
 from typing import AsyncGenerator, Callable, Optional
 
-from fastapi import Depends, HTTPException, Security, status
+from fastapi import Depends, HTTPException, Request, Security, status
 from fastapi.security import OAuth2PasswordBearer
+from sqlalchemy.exc import DBAPIError, OperationalError
 from sqlmodel.ext.asyncio.session import AsyncSession
 
 from app.core.config import settings
 from app.core.security import decode_access_token
 from app.domain.models import User, UserRole
 from app.domain.services import users as user_service
+from app.infrastructure.cache.principal import principal_cache
+from app.infrastructure.db.routing import READ_ROUTING, read_your_writes, replica_set
 from app.infrastructure.db.session import get_session
+from app.infrastructure.db.unit_of_work import unit_of_work
 
 oauth2_scheme = OAuth2PasswordBearer(tokenUrl=f"{settings.api_v1_str}/auth/token")
 
 
-async def get_db_session() -> AsyncGenerator[AsyncSession, None]:
+def _bearer_subject(request: Request) -> str | None:
+    scheme, _, token = request.headers.get("authorization", "").partition(" ")
+    if scheme.lower() != "bearer" or not token:
+        return None
+    return decode_access_token(token)
+
+
+async def get_db_session(request: Request) -> AsyncGenerator[AsyncSession, None]:
+    """Primary session run as one unit of work: a single commit per request.
+
+    Declare it with ``Depends(get_db_session, scope="function")`` so the
+    commit happens before the response is sent, not after.
+    """
+
+    subject = _bearer_subject(request) if replica_set.enabled else None
     async for session in get_session():
-        yield session
+        if subject:
+            session.sync_session.info["on_write"] = lambda: read_your_writes.mark_local(subject)
+        async with unit_of_work(session):
+            yield session
+        if subject and session.sync_session.info.get("wrote"):
+            await read_your_writes.publish(subject)
+
+
+async def get_read_session(request: Request) -> AsyncGenerator[AsyncSession, None]:
+    """Session for pure read paths, served by a replica when one is usable.
+
+    Falls back to the primary when no replica is configured or healthy, and
+    for a short window after the caller's own writes (read-your-writes).
+    Never write through this session.
+    """
+
+    if not replica_set.enabled:
+        async for session in get_session():
+            yield session
+        return
+
+    subject = _bearer_subject(request)
+    replica = replica_set.pick()
+    reason = "replica"
+    if replica is None:
+        reason = "no_healthy_replica"
+    elif subject and await read_your_writes.is_sticky(subject):
+        reason = "read_your_writes"
+        replica = None
+
+    if replica is None:
+        READ_ROUTING.labels(target="primary", reason=reason).inc()
+        async for session in get_session():
+            yield session
+        return
+
+    READ_ROUTING.labels(target="replica", reason=reason).inc()
+    async with replica.sessions() as session:
+        try:
+            yield session
+        except DBAPIError as exc:
+            if exc.connection_invalidated or isinstance(exc, OperationalError):
+                replica.mark(False, f"request failed: {exc.orig}")
+            raise
 
 
 async def get_current_user(
-    token: str = Security(oauth2_scheme), session: AsyncSession = Depends(get_db_session)
+    token: str = Security(oauth2_scheme),
+    session: AsyncSession = Depends(get_db_session, scope="function"),
 ) -> User:
     subject = decode_access_token(token)
     if not subject:
         raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="Invalid token")
 
-    user = await user_service.get_user_by_id(session, uuid.UUID(subject))
+    # Local and Stack Auth tokens both carry ``users.id`` as ``sub``; see JWKSCache.
+    try:
+        user_id = uuid.UUID(subject)
+    except ValueError as exc:
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED, detail="Invalid token"
+        ) from exc
+    user = await principal_cache.get(user_id)
+    if user:
+        return user
+
+    user = await user_service.get_user_by_id(session, user_id)
     if not user:
         raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="User not found")
+    await principal_cache.set(user)
     return user
 
 
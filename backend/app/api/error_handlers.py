@@ -3,7 +3,10 @@ from __future__ import annotations
 from fastapi import FastAPI, HTTPException
 from fastapi.responses import JSONResponse
 
+from app.core.hashing import PasswordHashPoolSaturated
 from app.core.logging import get_logger
+from app.infrastructure.cache.quiz_state import QuizStateBusy
+from app.infrastructure.db.write_behind import AttemptBufferFull
 
 logger = get_logger(__name__)
 
@@ -20,6 +23,34 @@ def register_error_handlers(app: FastAPI) -> None:
         return JSONResponse(
             status_code=exc.status_code,
             content={"error": exc.detail, "status_code": exc.status_code},
+            headers=exc.headers,
+        )
+
+    @app.exception_handler(PasswordHashPoolSaturated)
+    async def hash_pool_saturated_handler(request, exc: PasswordHashPoolSaturated):  # type: ignore[override]
+        logger.warning("password_hash_pool_rejected", path=str(request.url))
+        return JSONResponse(
+            status_code=503,
+            content={"error": "Service busy, try again shortly", "status_code": 503},
+            headers={"Retry-After": str(exc.retry_after)},
+        )
+
+    @app.exception_handler(AttemptBufferFull)
+    async def attempt_buffer_full_handler(request, exc: AttemptBufferFull):  # type: ignore[override]
+        logger.warning("quiz_attempt_buffer_rejected", path=str(request.url))
+        return JSONResponse(
+            status_code=503,
+            content={"error": "Service busy, try again shortly", "status_code": 503},
+            headers={"Retry-After": str(exc.retry_after)},
+        )
+
+    @app.exception_handler(QuizStateBusy)
+    async def quiz_state_busy_handler(request, exc: QuizStateBusy):  # type: ignore[override]
+        logger.warning("quiz_state_busy", path=str(request.url))
+        return JSONResponse(
+            status_code=503,
+            content={"error": "Service busy, try again shortly", "status_code": 503},
+            headers={"Retry-After": str(exc.retry_after)},
         )
 
     @app.exception_handler(Exception)
@@ -3,6 +3,7 @@ from __future__ import annotations
 from fastapi import APIRouter
 
 from .routers import (
+    admin,
     anatomy,
     auth,
     campaigns,
@@ -28,3 +29,4 @@ api_router.include_router(leaderboard.router)
 api_router.include_router(anatomy.router)
 api_router.include_router(classrooms.router)
 api_router.include_router(webhooks.router)
+api_router.include_router(admin.router)
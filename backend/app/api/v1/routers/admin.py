@@ -0,0 +1,22 @@
+from __future__ import annotations
+
+from fastapi import APIRouter, Depends, Query
+
+from app.api.dependencies import require_roles
+from app.domain.models import UserRole
+from app.domain.schemas.admin import SlowStatementRead, SlowStatementReport
+from app.infrastructure.observability.slow_queries import slow_query_log
+
+router = APIRouter(prefix="/admin", tags=["admin"])
+
+
+@router.get("/slow-queries", response_model=SlowStatementReport)
+async def slow_queries(
+    limit: int = Query(default=20, ge=1, le=100),
+    _: object = Depends(require_roles(UserRole.admin)),
+) -> SlowStatementReport:
+    return SlowStatementReport(
+        threshold_ms=slow_query_log.threshold_ms,
+        explain_sample_rate=slow_query_log.explain_sample_rate,
+        statements=[SlowStatementRead.model_validate(entry) for entry in slow_query_log.top(limit)],
+    )
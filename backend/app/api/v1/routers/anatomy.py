@@ -5,7 +5,7 @@ import uuid
 from fastapi import APIRouter, Depends, HTTPException, UploadFile, status
 from sqlmodel.ext.asyncio.session import AsyncSession
 
-from app.api.dependencies import get_current_user, get_db_session, require_roles
+from app.api.dependencies import get_current_user, get_db_session, get_read_session, require_roles
 from app.domain.models import UserRole
 from app.domain.schemas.anatomy import AnatomyLayerRead, AnatomyStructureCreate, AnatomyStructureRead
 from app.domain.services import anatomy as anatomy_service
@@ -18,7 +18,7 @@ router = APIRouter(prefix="/anatomy", tags=["anatomy"])
 async def list_structures(
     system: str | None = None,
     q: str | None = None,
-    session: AsyncSession = Depends(get_db_session),
+    session: AsyncSession = Depends(get_read_session),
     _: object = Depends(get_current_user),
 ):
     structures = await anatomy_service.list_structures(session, system, q)
@@ -28,7 +28,7 @@ async def list_structures(
 @router.get("/structures/{structure_id}", response_model=AnatomyStructureRead)
 async def get_structure(
     structure_id: uuid.UUID,
-    session: AsyncSession = Depends(get_db_session),
+    session: AsyncSession = Depends(get_read_session),
     _: object = Depends(get_current_user),
 ):
     structure = await anatomy_service.get_structure(session, structure_id)
@@ -40,7 +40,7 @@ async def get_structure(
 @router.get("/structures/{structure_id}/layers", response_model=list[AnatomyLayerRead])
 async def get_layers(
     structure_id: uuid.UUID,
-    session: AsyncSession = Depends(get_db_session),
+    session: AsyncSession = Depends(get_read_session),
     _: object = Depends(get_current_user),
 ):
     layers = await anatomy_service.get_layers(session, structure_id)
@@ -64,7 +64,7 @@ async def get_layers(
 )
 async def create_structure(
     payload: AnatomyStructureCreate,
-    session: AsyncSession = Depends(get_db_session),
+    session: AsyncSession = Depends(get_db_session, scope="function"),
     _: object = Depends(require_roles(UserRole.teacher, UserRole.admin)),
 ):
     structure = await anatomy_service.create_structure(session, payload)
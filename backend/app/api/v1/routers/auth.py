@@ -2,13 +2,19 @@ from __future__ import annotations
 
 import uuid
 
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Depends, HTTPException, Security, status
 from fastapi.security import OAuth2PasswordRequestForm
 from sqlmodel.ext.asyncio.session import AsyncSession
 
-from app.api.common.rate_limit import rate_limiter
-from app.api.dependencies import get_current_user, get_db_session
-from app.core.security import create_access_token, create_refresh_token, decode_refresh_token
+from app.api.common.rate_limit import auth_rate_limiter
+from app.api.dependencies import get_current_user, get_db_session, oauth2_scheme
+from app.core.logging import audit_logger
+from app.core.security import (
+    create_access_token,
+    create_refresh_token,
+    decode_token_claims,
+    new_token_family,
+)
 from app.domain.schemas.user import (
     AuthCredentials,
     TokenRefreshRequest,
@@ -19,14 +25,28 @@ from app.domain.schemas.user import (
 from app.domain.services import missions as mission_service
 from app.domain.services import progress as progress_service
 from app.domain.services import users as user_service
+from app.infrastructure.cache.revocation import revocation_list
 
 router = APIRouter(prefix="/auth", tags=["auth"])
 
 
-@router.post("/register", response_model=UserRead, status_code=status.HTTP_201_CREATED)
+def _issue_tokens(user_id: uuid.UUID, family: str | None = None) -> TokenResponse:
+    family = family or new_token_family()
+    return TokenResponse(
+        access_token=create_access_token(str(user_id), family),
+        refresh_token=create_refresh_token(str(user_id), family),
+    )
+
+
+@router.post(
+    "/register",
+    response_model=UserRead,
+    status_code=status.HTTP_201_CREATED,
+    dependencies=[Depends(auth_rate_limiter)],
+)
 async def register_user(
     payload: UserCreate,
-    session: AsyncSession = Depends(get_db_session),
+    session: AsyncSession = Depends(get_db_session, scope="function"),
 ):
     try:
         user = await user_service.create_user(session, payload)
@@ -38,53 +58,69 @@ async def register_user(
     return UserRead.model_validate(user)
 
 
-@router.post("/login", response_model=TokenResponse, dependencies=[Depends(rate_limiter)])
+@router.post(
+    "/login", response_model=TokenResponse, dependencies=[Depends(auth_rate_limiter)]
+)
 async def login(
     credentials: AuthCredentials,
-    session: AsyncSession = Depends(get_db_session),
+    session: AsyncSession = Depends(get_db_session, scope="function"),
 ):
     user = await user_service.authenticate_user(session, credentials.email, credentials.password)
     if not user:
         raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="Invalid credentials")
 
-    return TokenResponse(
-        access_token=create_access_token(str(user.id)),
-        refresh_token=create_refresh_token(str(user.id)),
-    )
+    return _issue_tokens(user.id)
 
 
-@router.post("/token", response_model=TokenResponse)
+@router.post(
+    "/token", response_model=TokenResponse, dependencies=[Depends(auth_rate_limiter)]
+)
 async def token_exchange(
     form: OAuth2PasswordRequestForm = Depends(),
-    session: AsyncSession = Depends(get_db_session),
+    session: AsyncSession = Depends(get_db_session, scope="function"),
 ):
     user = await user_service.authenticate_user(session, form.username, form.password)
     if not user:
         raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="Invalid credentials")
-    return TokenResponse(
-        access_token=create_access_token(str(user.id)),
-        refresh_token=create_refresh_token(str(user.id)),
-    )
+    return _issue_tokens(user.id)
 
 
 @router.post("/refresh", response_model=TokenResponse)
 async def refresh_token(
     payload: TokenRefreshRequest,
-    session: AsyncSession = Depends(get_db_session),
+    session: AsyncSession = Depends(get_db_session, scope="function"),
 ):
-    subject = decode_refresh_token(payload.refresh_token)
-    if not subject:
-        raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="Invalid refresh token")
-    user = await user_service.get_user_by_id(session, uuid.UUID(subject))
+    claims = decode_token_claims(payload.refresh_token, "refresh")
+    if not claims:
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED, detail="Invalid refresh token"
+        )
+
+    if not await revocation_list.claim(claims["jti"], claims["exp"]):
+        await revocation_list.revoke_family(claims["fam"])
+        audit_logger.log("refresh_token_reused", claims.get("sub"), {"family": claims["fam"]})
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED, detail="Invalid refresh token"
+        )
+    if revocation_list.is_family_revoked(claims["fam"]):
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED, detail="Invalid refresh token"
+        )
+
+    user = await user_service.get_user_by_id(session, uuid.UUID(claims["sub"]))
     if not user:
         raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="User not found")
 
-    return TokenResponse(
-        access_token=create_access_token(str(user.id)),
-        refresh_token=create_refresh_token(str(user.id)),
-    )
+    return _issue_tokens(user.id, claims["fam"])
 
 
 @router.post("/logout", status_code=status.HTTP_204_NO_CONTENT)
-async def logout(_: str = Depends(get_current_user)) -> None:
+async def logout(
+    token: str = Security(oauth2_scheme),
+    _: object = Depends(get_current_user),
+) -> None:
+    claims = decode_token_claims(token, "access")
+    if claims:
+        await revocation_list.revoke(claims["jti"], claims["exp"])
+        await revocation_list.revoke_family(claims["fam"])
     return None
@@ -5,7 +5,7 @@ import uuid
 from fastapi import APIRouter, Depends, status
 from sqlmodel.ext.asyncio.session import AsyncSession
 
-from app.api.dependencies import get_current_user, get_db_session, require_roles
+from app.api.dependencies import get_current_user, get_db_session, get_read_session, require_roles
 from app.domain.models import CampaignProgressStatus, UserRole
 from app.domain.schemas.campaign import CampaignCreate, CampaignProgressUpdate, CampaignRead
 from app.domain.services import campaigns as campaign_service
@@ -14,7 +14,7 @@ router = APIRouter(prefix="/campaigns", tags=["campaigns"])
 
 
 @router.get("", response_model=list[CampaignRead])
-async def list_campaigns(session: AsyncSession = Depends(get_db_session)):
+async def list_campaigns(session: AsyncSession = Depends(get_read_session)):
     campaigns = await campaign_service.list_campaigns(session)
     return [CampaignRead.model_validate(campaign) for campaign in campaigns]
 
@@ -22,7 +22,7 @@ async def list_campaigns(session: AsyncSession = Depends(get_db_session)):
 @router.post("", response_model=CampaignRead, status_code=status.HTTP_201_CREATED)
 async def create_campaign(
     payload: CampaignCreate,
-    session: AsyncSession = Depends(get_db_session),
+    session: AsyncSession = Depends(get_db_session, scope="function"),
     _: object = Depends(require_roles(UserRole.teacher, UserRole.admin)),
 ):
     campaign = await campaign_service.create_campaign(session, payload)
@@ -33,7 +33,7 @@ async def create_campaign(
 async def update_lesson_progress(
     lesson_id: uuid.UUID,
     update: CampaignProgressUpdate,
-    session: AsyncSession = Depends(get_db_session),
+    session: AsyncSession = Depends(get_db_session, scope="function"),
     current_user=Depends(get_current_user),
 ):
     progress = await campaign_service.record_lesson_progress(
@@ -5,7 +5,7 @@ import uuid
 from fastapi import APIRouter, Depends, HTTPException, status
 from sqlmodel.ext.asyncio.session import AsyncSession
 
-from app.api.dependencies import get_current_user, get_db_session, require_roles
+from app.api.dependencies import get_current_user, get_db_session, get_read_session, require_roles
 from app.domain.models import UserRole
 from app.domain.schemas.classroom import ClassroomCreate, ClassroomRead, ClassroomRoster, EnrollmentRequest
 from app.domain.schemas.user import UserRead
@@ -17,7 +17,7 @@ router = APIRouter(prefix="/classrooms", tags=["classrooms"])
 @router.post("", response_model=ClassroomRead, status_code=status.HTTP_201_CREATED)
 async def create_classroom(
     payload: ClassroomCreate,
-    session: AsyncSession = Depends(get_db_session),
+    session: AsyncSession = Depends(get_db_session, scope="function"),
     teacher=Depends(require_roles(UserRole.teacher, UserRole.admin)),
 ):
     classroom = await classroom_service.create_classroom(
@@ -36,7 +36,7 @@ async def create_classroom(
 @router.post("/enroll", response_model=ClassroomRead)
 async def enroll(
     payload: EnrollmentRequest,
-    session: AsyncSession = Depends(get_db_session),
+    session: AsyncSession = Depends(get_db_session, scope="function"),
     current_user=Depends(get_current_user),
 ):
     try:
@@ -57,7 +57,7 @@ async def enroll(
 @router.get("/{classroom_id}/roster", response_model=ClassroomRoster)
 async def get_roster(
     classroom_id: str,
-    session: AsyncSession = Depends(get_db_session),
+    session: AsyncSession = Depends(get_read_session),
     _: object = Depends(require_roles(UserRole.teacher, UserRole.admin)),
 ):
     classroom_uuid = uuid.UUID(classroom_id)
@@ -3,37 +3,26 @@ from __future__ import annotations
 from fastapi import APIRouter, Depends
 from sqlmodel.ext.asyncio.session import AsyncSession
 
-from app.api.dependencies import get_current_user, get_db_session
+from app.api.dependencies import get_current_user, get_db_session, get_read_session
 from app.domain.schemas.dashboard import DashboardSummary, DailyMissionSummary, SystemProgressSummary
-from app.domain.services import missions as mission_service
-from app.domain.services import progress as progress_service
+from app.domain.services import summary as summary_service
 
 router = APIRouter(prefix="/dashboard", tags=["dashboard"])
 
 
 @router.get("/summary", response_model=DashboardSummary)
 async def get_dashboard_summary(
-    session: AsyncSession = Depends(get_db_session),
+    session: AsyncSession = Depends(get_db_session, scope="function"),
+    read_session: AsyncSession = Depends(get_read_session),
     current_user=Depends(get_current_user),
 ) -> DashboardSummary:
-    missions = await mission_service.get_active_missions(session, current_user)
-    systems = await progress_service.get_system_progress(session, current_user)
-
-    mission_payload = [
-        DailyMissionSummary(
-            mission_id=str(progress.mission_id),
-            title=progress.mission.title,
-            progress=progress.progress,
-            target=progress.mission.target,
-            xp_reward=progress.mission.xp_reward,
-            expires_at=progress.expires_at,
-        )
-        for progress in missions
-    ]
+    state = await summary_service.get_summary_state(session, read_session, current_user)
+
+    mission_payload = [DailyMissionSummary.model_validate(entry) for entry in state.missions]
 
     system_payload = [
-        SystemProgressSummary(system=record.system, completion_rate=record.completion_rate)
-        for record in systems
+        SystemProgressSummary(system=system, completion_rate=completion_rate)
+        for system, completion_rate in state.systems.items()
     ]
 
     return DashboardSummary(
@@ -2,12 +2,16 @@ from __future__ import annotations
 
 from datetime import datetime
 
-from fastapi import APIRouter, Depends
+from fastapi import APIRouter, Depends, Query
 from sqlmodel.ext.asyncio.session import AsyncSession
 
-from app.api.dependencies import get_current_user, get_db_session
+from app.api.dependencies import get_current_user, get_db_session, get_read_session
 from app.domain.models import LeaderboardScope
-from app.domain.schemas.leaderboard import LeaderboardEntry, LeaderboardResponse
+from app.domain.schemas.leaderboard import (
+    LeaderboardEntry,
+    LeaderboardResponse,
+    LeaderboardStanding,
+)
 from app.domain.services import leaderboard as leaderboard_service
 
 router = APIRouter(prefix="/leaderboard", tags=["leaderboard"])
@@ -17,10 +21,16 @@ router = APIRouter(prefix="/leaderboard", tags=["leaderboard"])
 async def get_leaderboard(
     scope: LeaderboardScope = LeaderboardScope.global_scope,
     reference_id: str | None = None,
-    session: AsyncSession = Depends(get_db_session),
+    session: AsyncSession = Depends(get_db_session, scope="function"),
+    read_session: AsyncSession = Depends(get_read_session),
     current_user=Depends(get_current_user),
 ):
-    snapshot = await leaderboard_service.latest_snapshot(session, scope, reference_id)
+    entries = await leaderboard_service.top_entries(read_session, scope, reference_id)
+    if entries is not None:
+        return LeaderboardResponse(
+            scope=scope, entries=entries, generated_at=datetime.utcnow().isoformat()
+        )
+    snapshot = await leaderboard_service.latest_snapshot(read_session, scope, reference_id)
     if not snapshot:
         snapshot = await leaderboard_service.build_leaderboard(session, scope, reference_id)
     entries = [LeaderboardEntry(**entry) for entry in snapshot.data.get("entries", [])]
@@ -29,3 +39,16 @@ async def get_leaderboard(
         entries=entries,
         generated_at=snapshot.generated_at.isoformat(),
     )
+
+
+@router.get("/me", response_model=LeaderboardStanding)
+async def get_my_standing(
+    scope: LeaderboardScope = LeaderboardScope.global_scope,
+    reference_id: str | None = None,
+    radius: int = Query(default=2, ge=0, le=25),
+    read_session: AsyncSession = Depends(get_read_session),
+    current_user=Depends(get_current_user),
+):
+    return await leaderboard_service.standing(
+        read_session, current_user, scope, reference_id, radius
+    )
@@ -14,7 +14,7 @@ router = APIRouter(prefix="/missions", tags=["missions"])
 
 @router.get("/daily", response_model=list[MissionProgressRead])
 async def list_daily_missions(
-    session: AsyncSession = Depends(get_db_session),
+    session: AsyncSession = Depends(get_db_session, scope="function"),
     current_user=Depends(get_current_user),
 ):
     missions = await mission_service.get_active_missions(session, current_user)
@@ -36,7 +36,7 @@ async def list_daily_missions(
 async def update_mission_progress(
     mission_id: uuid.UUID,
     payload: MissionProgressUpdate,
-    session: AsyncSession = Depends(get_db_session),
+    session: AsyncSession = Depends(get_db_session, scope="function"),
     current_user=Depends(get_current_user),
 ):
     try:
@@ -2,11 +2,16 @@ from __future__ import annotations
 
 import uuid
 
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Depends, HTTPException, Query, status
 from sqlmodel.ext.asyncio.session import AsyncSession
 
-from app.api.dependencies import get_current_user, get_db_session
+from app.api.dependencies import get_current_user, get_db_session, get_read_session, require_roles
+from app.domain.models import UserRole
+from app.domain.models.progress import AnatomySystem
 from app.domain.schemas.quiz import (
+    QuestionStatsRead,
+    QuizAnswerBatch,
+    QuizAnswerBatchRead,
     QuizAttemptCreate,
     QuizAttemptRead,
     QuizOptionChoice,
@@ -14,7 +19,7 @@ from app.domain.schemas.quiz import (
     QuizSessionCreate,
     QuizSessionRead,
 )
-from app.domain.services import progress as progress_service
+from app.domain.services import calibration as calibration_service
 from app.domain.services import quiz as quiz_service
 
 router = APIRouter(prefix="/quizzes", tags=["quizzes"])
@@ -23,7 +28,7 @@ router = APIRouter(prefix="/quizzes", tags=["quizzes"])
 @router.post("/sessions", response_model=QuizSessionRead, status_code=status.HTTP_201_CREATED)
 async def create_quiz_session(
     payload: QuizSessionCreate,
-    session: AsyncSession = Depends(get_db_session),
+    session: AsyncSession = Depends(get_db_session, scope="function"),
     current_user=Depends(get_current_user),
 ):
     quiz_session, questions = await quiz_service.create_session(
@@ -58,22 +63,19 @@ async def create_quiz_session(
 async def submit_attempt(
     session_id: uuid.UUID,
     payload: QuizAttemptCreate,
-    session: AsyncSession = Depends(get_db_session),
+    session: AsyncSession = Depends(get_db_session, scope="function"),
     current_user=Depends(get_current_user),
 ):
-    quiz_session = await quiz_service.get_session(session, session_id)
-    if not quiz_session or quiz_session.user_id != current_user.id:
+    try:
+        answered = await quiz_service.answer(
+            session, current_user, session_id, payload.question_id, payload.option_id
+        )
+    except ValueError as exc:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(exc)) from exc
+    if answered is None:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Session not found")
 
-    attempt = await quiz_service.submit_answer(
-        session, quiz_session, payload.question_id, payload.option_id
-    )
-    if attempt.is_correct and quiz_session.system:
-        from app.domain.models.progress import AnatomySystem
-
-        await progress_service.update_system_progress(
-            session, current_user, AnatomySystem(quiz_session.system), 0.05
-        )
+    attempt, _ = answered
     return QuizAttemptRead(
         id=attempt.id,
         question_id=attempt.question_id,
@@ -82,11 +84,42 @@ async def submit_attempt(
     )
 
 
+@router.post("/sessions/{session_id}/answers", response_model=QuizAnswerBatchRead)
+async def submit_answers(
+    session_id: uuid.UUID,
+    payload: QuizAnswerBatch,
+    session: AsyncSession = Depends(get_db_session, scope="function"),
+    current_user=Depends(get_current_user),
+):
+    quiz_session = await quiz_service.get_session(session, session_id)
+    if not quiz_session or quiz_session.user_id != current_user.id:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Session not found")
+
+    try:
+        attempts = await quiz_service.submit_answers(session, quiz_session, payload.answers)
+    except ValueError as exc:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(exc)) from exc
+
+    return QuizAnswerBatchRead(
+        score=quiz_session.score,
+        correct=sum(attempt.is_correct for attempt in attempts),
+        attempts=[
+            QuizAttemptRead(
+                id=attempt.id,
+                question_id=attempt.question_id,
+                selected_option_id=attempt.selected_option_id,
+                is_correct=attempt.is_correct,
+            )
+            for attempt in attempts
+        ],
+    )
+
+
 @router.post("/sessions/{session_id}/complete", response_model=QuizSessionRead)
 async def complete_session(
     session_id: uuid.UUID,
     duration_seconds: int,
-    session: AsyncSession = Depends(get_db_session),
+    session: AsyncSession = Depends(get_db_session, scope="function"),
     current_user=Depends(get_current_user),
 ):
     quiz_session = await quiz_service.get_session(session, session_id)
@@ -101,3 +134,30 @@ async def complete_session(
         completed=quiz_session.completed,
         questions=[],
     )
+
+
+@router.get("/questions/stats", response_model=list[QuestionStatsRead])
+async def list_question_stats(
+    system: AnatomySystem | None = None,
+    limit: int = Query(default=50, ge=1, le=200),
+    session: AsyncSession = Depends(get_read_session),
+    _: object = Depends(require_roles(UserRole.teacher, UserRole.admin)),
+):
+    rows = await calibration_service.list_question_stats(
+        session, system.value if system else None, limit
+    )
+    return [
+        QuestionStatsRead(
+            question_id=stats.question_id,
+            prompt=question.prompt,
+            anatomy_system=question.anatomy_system,
+            difficulty=question.difficulty,
+            attempts=stats.attempts,
+            p_value=stats.p_value,
+            point_biserial=stats.point_biserial,
+            irt_difficulty=stats.irt_difficulty,
+            irt_discrimination=stats.irt_discrimination,
+            calibrated_at=stats.calibrated_at,
+        )
+        for stats, question in rows
+    ]
@@ -14,7 +14,7 @@ router = APIRouter(prefix="/webhooks", tags=["webhooks"])
 @router.post("", response_model=WebhookRead, status_code=status.HTTP_201_CREATED)
 async def create_webhook(
     payload: WebhookSubscription,
-    session: AsyncSession = Depends(get_db_session),
+    session: AsyncSession = Depends(get_db_session, scope="function"),
     _: object = Depends(require_roles(UserRole.teacher, UserRole.admin)),
 ):
     subscription = await webhook_service.create_subscription(session, payload)
@@ -24,7 +24,7 @@ async def create_webhook(
 @router.get("", response_model=list[WebhookRead])
 async def list_webhooks(
     event: str | None = None,
-    session: AsyncSession = Depends(get_db_session),
+    session: AsyncSession = Depends(get_db_session, scope="function"),
     _: object = Depends(require_roles(UserRole.teacher, UserRole.admin)),
 ):
     subscriptions = await webhook_service.list_subscriptions(session, event)
@@ -34,7 +34,7 @@ async def list_webhooks(
 @router.post("/test", status_code=status.HTTP_202_ACCEPTED)
 async def test_webhook(
     payload: WebhookDelivery,
-    session: AsyncSession = Depends(get_db_session),
+    session: AsyncSession = Depends(get_db_session, scope="function"),
     _: object = Depends(require_roles(UserRole.teacher, UserRole.admin)),
 ):
     subscriptions = await webhook_service.list_subscriptions(session, payload.event)
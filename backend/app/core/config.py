@@ -30,10 +30,38 @@ class Settings(BaseSettings):
     refresh_token_expire_minutes: int = Field(default=4320, alias="REFRESH_TOKEN_EXPIRE_MINUTES")
     jwt_algorithm: str = Field(default="HS256", alias="JWT_ALGORITHM")
     rate_limit_per_minute: int = Field(default=120, alias="RATE_LIMIT_PER_MINUTE")
+    rate_limit_ip_per_minute: int = Field(default=600, alias="RATE_LIMIT_IP_PER_MINUTE")
+    rate_limit_auth_cost: int = Field(default=10, alias="RATE_LIMIT_AUTH_COST")
+    rate_limit_mode: Literal["strict", "leased"] = Field(default="strict", alias="RATE_LIMIT_MODE")
+    rate_limit_lease_size: int = Field(default=10, alias="RATE_LIMIT_LEASE_SIZE")
+    rate_limit_lease_seconds: float = Field(default=2.0, alias="RATE_LIMIT_LEASE_SECONDS")
+    password_hash_executor: Literal["thread", "process"] = Field(
+        default="thread", alias="PASSWORD_HASH_EXECUTOR"
+    )
+    password_hash_workers: int = Field(default=4, alias="PASSWORD_HASH_WORKERS")
+    password_hash_queue_size: int = Field(default=64, alias="PASSWORD_HASH_QUEUE_SIZE")
+    password_hash_retry_after_seconds: int = Field(
+        default=1, alias="PASSWORD_HASH_RETRY_AFTER_SECONDS"
+    )
 
     # database
     database_url: str = Field(alias="DATABASE_URL")
     sync_database_url: str | None = Field(default=None, alias="SYNC_DATABASE_URL")
+    db_pool_size: int = Field(default=5, alias="DB_POOL_SIZE")
+    db_max_overflow: int = Field(default=10, alias="DB_MAX_OVERFLOW")
+    db_pool_timeout_seconds: float = Field(default=30.0, alias="DB_POOL_TIMEOUT_SECONDS")
+    db_pool_recycle_seconds: int = Field(default=3600, alias="DB_POOL_RECYCLE_SECONDS")
+    db_pool_pre_ping: bool = Field(default=False, alias="DB_POOL_PRE_PING")
+    db_pool_probe_seconds: int = Field(default=30, alias="DB_POOL_PROBE_SECONDS")
+    sql_n_plus_one_threshold: int = Field(default=5, alias="SQL_N_PLUS_ONE_THRESHOLD")
+    sql_slow_query_ms: float = Field(default=200.0, alias="SQL_SLOW_QUERY_MS")
+    sql_explain_sample_rate: float = Field(default=0.1, alias="SQL_EXPLAIN_SAMPLE_RATE")
+    read_database_url: str | None = Field(default=None, alias="READ_DATABASE_URL")
+    read_replica_sticky_seconds: float = Field(default=5.0, alias="READ_REPLICA_STICKY_SECONDS")
+    read_replica_max_lag_seconds: float = Field(
+        default=10.0, alias="READ_REPLICA_MAX_LAG_SECONDS"
+    )
+    read_replica_check_seconds: int = Field(default=15, alias="READ_REPLICA_CHECK_SECONDS")
 
     stack_project_id: str | None = Field(default=None, alias="STACK_PROJECT_ID")
     stack_jwks_url: str | None = Field(default=None, alias="STACK_JWKS_URL")
@@ -43,9 +71,60 @@ class Settings(BaseSettings):
     stack_allowed_issuers: Sequence[str] = Field(
         default_factory=list, alias="STACK_ALLOWED_ISSUERS"
     )
+    stack_jwks_refresh_seconds: int = Field(default=600, alias="STACK_JWKS_REFRESH_SECONDS")
+    stack_jwks_unknown_kid_cooldown_seconds: float = Field(
+        default=30.0, alias="STACK_JWKS_UNKNOWN_KID_COOLDOWN_SECONDS"
+    )
 
     # cache
     redis_url: str = Field(alias="REDIS_URL")
+    cache_ttl_jitter: float = Field(default=0.1, alias="CACHE_TTL_JITTER")
+    cache_lock_timeout_seconds: float = Field(default=5.0, alias="CACHE_LOCK_TIMEOUT_SECONDS")
+    cache_local_max_bytes: int = Field(default=32 * 1024 * 1024, alias="CACHE_LOCAL_MAX_BYTES")
+    cache_local_ttl_seconds: float = Field(default=60.0, alias="CACHE_LOCAL_TTL_SECONDS")
+    cache_codec: Literal["json", "msgpack"] = Field(default="msgpack", alias="CACHE_CODEC")
+    cache_compression_threshold_bytes: int = Field(
+        default=1024, alias="CACHE_COMPRESSION_THRESHOLD_BYTES"
+    )
+    principal_cache_ttl_seconds: float = Field(default=30.0, alias="PRINCIPAL_CACHE_TTL_SECONDS")
+    principal_cache_max_entries: int = Field(default=10000, alias="PRINCIPAL_CACHE_MAX_ENTRIES")
+    principal_cache_redis_enabled: bool = Field(
+        default=False, alias="PRINCIPAL_CACHE_REDIS_ENABLED"
+    )
+    principal_cache_redis_ttl_seconds: int = Field(
+        default=300, alias="PRINCIPAL_CACHE_REDIS_TTL_SECONDS"
+    )
+    content_catalog_refresh_seconds: int = Field(
+        default=30, alias="CONTENT_CATALOG_REFRESH_SECONDS"
+    )
+    quiz_state_ttl_seconds: int = Field(default=3600, alias="QUIZ_STATE_TTL_SECONDS")
+    quiz_state_redis_enabled: bool = Field(default=True, alias="QUIZ_STATE_REDIS_ENABLED")
+    quiz_state_claim_seconds: int = Field(default=300, alias="QUIZ_STATE_CLAIM_SECONDS")
+    quiz_attempt_journal_dir: str | None = Field(
+        default="var/quiz-attempts", alias="QUIZ_ATTEMPT_JOURNAL_DIR"
+    )
+    quiz_attempt_journal_fsync: bool = Field(default=False, alias="QUIZ_ATTEMPT_JOURNAL_FSYNC")
+    quiz_attempt_flush_size: int = Field(default=500, alias="QUIZ_ATTEMPT_FLUSH_SIZE")
+    quiz_attempt_flush_seconds: float = Field(default=1.0, alias="QUIZ_ATTEMPT_FLUSH_SECONDS")
+    quiz_attempt_buffer_max: int = Field(default=10000, alias="QUIZ_ATTEMPT_BUFFER_MAX")
+    question_rating_flush_seconds: int = Field(default=60, alias="QUESTION_RATING_FLUSH_SECONDS")
+    question_calibration_hour: int = Field(default=-1, alias="QUESTION_CALIBRATION_HOUR")
+    question_calibration_chunk_rows: int = Field(
+        default=50000, alias="QUESTION_CALIBRATION_CHUNK_ROWS"
+    )
+    question_calibration_min_attempts: int = Field(
+        default=100, alias="QUESTION_CALIBRATION_MIN_ATTEMPTS"
+    )
+    question_min_point_biserial: float = Field(default=0.0, alias="QUESTION_MIN_POINT_BISERIAL")
+    bkt_p_init: float = Field(default=0.1, alias="BKT_P_INIT")
+    bkt_p_transit: float = Field(default=0.15, alias="BKT_P_TRANSIT")
+    bkt_p_slip: float = Field(default=0.1, alias="BKT_P_SLIP")
+    bkt_p_guess: float = Field(default=0.25, alias="BKT_P_GUESS")
+    mastery_flush_seconds: int = Field(default=5, alias="MASTERY_FLUSH_SECONDS")
+    leaderboard_redis_enabled: bool = Field(default=False, alias="LEADERBOARD_REDIS_ENABLED")
+    leaderboard_reconcile_seconds: int = Field(
+        default=3600, alias="LEADERBOARD_RECONCILE_SECONDS"
+    )
 
     # pagination
     default_page_size: int = Field(default=20, alias="DEFAULT_PAGE_SIZE")
@@ -85,6 +164,18 @@ class Settings(BaseSettings):
     def async_database_url(self) -> str:
         return self._ensure_driver(self.database_url, self._async_driver)
 
+    @property
+    def async_read_database_urls(self) -> list[str]:
+        """Replica URLs from READ_DATABASE_URL (comma separated), with async drivers."""
+
+        if not self.read_database_url:
+            return []
+        return [
+            self._ensure_driver(url.strip(), self._async_driver)
+            for url in self.read_database_url.split(",")
+            if url.strip()
+        ]
+
     @property
     def sync_database_url_value(self) -> str:
         return self.sync_database_url or self.database_url
@@ -1,25 +1,204 @@
 from __future__ import annotations
 
 from fastapi import FastAPI
+from redis.exceptions import RedisError
+from sqlalchemy.exc import SQLAlchemyError
 
 from app.core.config import settings
+from app.core.hashing import password_hash_pool
+from app.core.jwks import jwks_cache
 from app.core.logging import get_logger, log_health_event, setup_logging
-from app.infrastructure.db.session import init_models
+from app.domain.services import calibration as calibration_service
+from app.domain.services import elo as elo_service
+from app.domain.services import leaderboard as leaderboard_service
+from app.domain.services import mastery as mastery_service
+from app.domain.services import quiz as quiz_service
+from app.domain.services.catalog import content_catalog
+from app.infrastructure.cache.leaderboard import leaderboard_store
+from app.infrastructure.cache.quiz_state import quiz_state_store
+from app.infrastructure.cache.redis import start_invalidation_listener, stop_invalidation_listener
+from app.infrastructure.cache.revocation import revocation_list
+from app.infrastructure.db.pool import probe_engine
+from app.infrastructure.db.routing import replica_set
+from app.infrastructure.db.session import AsyncSessionLocal, engine, init_models
+from app.infrastructure.db.unit_of_work import unit_of_work
+from app.infrastructure.db.write_behind import attempt_write_behind
 from app.infrastructure.jobs.scheduler import scheduler, shutdown_scheduler, start_scheduler
 from app.infrastructure.observability.tracing import configure_tracing
 
 logger = get_logger(__name__)
 
 
+async def refresh_content_catalog(preload: bool = False) -> None:
+    try:
+        async with AsyncSessionLocal() as session:
+            await content_catalog.refresh(session, preload=preload)
+    except SQLAlchemyError as exc:
+        logger.warning("content_catalog_refresh_failed", error=str(exc))
+
+
+async def flush_quiz_sessions() -> None:
+    """Persist quiz sessions whose hot state expired."""
+
+    session_ids = await quiz_state_store.claim_expired()
+    if not session_ids:
+        return
+    try:
+        async with AsyncSessionLocal() as session, unit_of_work(session):
+            flushed = await quiz_service.flush_sessions(session, session_ids)
+    except (SQLAlchemyError, RedisError) as exc:
+        for session_id in session_ids:
+            await quiz_state_store.release(session_id)
+        logger.error("quiz_sessions_flush_failed", sessions=len(session_ids), error=str(exc))
+        return
+    logger.info("quiz_sessions_flushed", sessions=flushed)
+
+
+async def flush_question_ratings() -> None:
+    deltas = elo_service.question_ratings.take()
+    if not deltas:
+        return
+    try:
+        async with AsyncSessionLocal() as session, unit_of_work(session):
+            await elo_service.write_question_ratings(session, deltas)
+    except SQLAlchemyError as exc:
+        await elo_service.question_ratings.restore(deltas)
+        logger.warning("question_ratings_flush_failed", questions=len(deltas), error=str(exc))
+
+
+async def flush_mastery() -> None:
+    changes = mastery_service.mastery_updates.take()
+    if not changes:
+        return
+    try:
+        async with AsyncSessionLocal() as session, unit_of_work(session):
+            await mastery_service.write_mastery(session, changes)
+    except SQLAlchemyError as exc:
+        await mastery_service.mastery_updates.restore(changes)
+        logger.warning("mastery_flush_failed", pairs=len(changes), error=str(exc))
+
+
+async def calibrate_questions() -> None:
+    replica = replica_set.pick()
+    source = replica.engine if replica else engine
+    try:
+        async with AsyncSessionLocal() as session, unit_of_work(session):
+            await calibration_service.calibrate_questions(source, session)
+    except SQLAlchemyError as exc:
+        logger.error("question_calibration_failed", error=str(exc))
+
+
+async def reconcile_leaderboards() -> None:
+    try:
+        async with AsyncSessionLocal() as session:
+            users = await leaderboard_service.reconcile_leaderboards(session)
+    except (SQLAlchemyError, RedisError) as exc:
+        logger.error("leaderboard_reconcile_failed", error=str(exc))
+        return
+    logger.info("leaderboards_reconciled", users=users)
+
+
 async def on_startup(app: FastAPI) -> None:
     setup_logging(settings.log_level)
     configure_tracing()
     await init_models()
     start_scheduler()
     scheduler.add_job(log_health_event, "interval", seconds=60, args=["health_ping"], id="health_ping", replace_existing=True)
+    start_invalidation_listener()
+    await refresh_content_catalog(preload=True)
+    if settings.content_catalog_refresh_seconds > 0:
+        scheduler.add_job(
+            refresh_content_catalog,
+            "interval",
+            seconds=settings.content_catalog_refresh_seconds,
+            id="content_catalog_refresh",
+            replace_existing=True,
+        )
+    await attempt_write_behind.start()
+    scheduler.add_job(
+        flush_quiz_sessions,
+        "interval",
+        seconds=60,
+        id="quiz_sessions_flush",
+        replace_existing=True,
+    )
+    scheduler.add_job(
+        flush_question_ratings,
+        "interval",
+        seconds=settings.question_rating_flush_seconds,
+        id="question_ratings_flush",
+        replace_existing=True,
+    )
+    scheduler.add_job(
+        flush_mastery,
+        "interval",
+        seconds=settings.mastery_flush_seconds,
+        id="mastery_flush",
+        replace_existing=True,
+    )
+    if settings.question_calibration_hour >= 0:
+        scheduler.add_job(
+            calibrate_questions,
+            "cron",
+            hour=settings.question_calibration_hour,
+            id="question_calibration",
+            replace_existing=True,
+        )
+    if leaderboard_store.enabled:
+        if not await leaderboard_store.is_built():
+            await reconcile_leaderboards()
+        scheduler.add_job(
+            reconcile_leaderboards,
+            "interval",
+            seconds=settings.leaderboard_reconcile_seconds,
+            id="leaderboard_reconcile",
+            replace_existing=True,
+        )
+    revocation_list.start()
+    scheduler.add_job(
+        revocation_list.prune,
+        "interval",
+        seconds=60,
+        id="token_revocation_prune",
+        replace_existing=True,
+    )
+    if settings.db_pool_probe_seconds > 0:
+        scheduler.add_job(
+            probe_engine,
+            "interval",
+            seconds=settings.db_pool_probe_seconds,
+            args=[engine, "primary"],
+            id="db_pool_probe",
+            replace_existing=True,
+        )
+    if replica_set.enabled:
+        await replica_set.check()
+        scheduler.add_job(
+            replica_set.check,
+            "interval",
+            seconds=settings.read_replica_check_seconds,
+            id="read_replica_health",
+            replace_existing=True,
+        )
+    if jwks_cache.enabled:
+        await jwks_cache.refresh()
+        scheduler.add_job(
+            jwks_cache.refresh,
+            "interval",
+            seconds=settings.stack_jwks_refresh_seconds,
+            id="stack_jwks_refresh",
+            replace_existing=True,
+        )
     log_health_event("service_startup", environment=settings.project_env)
 
 
 async def on_shutdown(app: FastAPI) -> None:
     shutdown_scheduler()
+    await attempt_write_behind.stop()
+    await flush_question_ratings()
+    await flush_mastery()
+    await revocation_list.stop()
+    await stop_invalidation_listener()
+    await replica_set.dispose()
+    password_hash_pool.shutdown()
     log_health_event("service_shutdown")
@@ -0,0 +1,117 @@
+from __future__ import annotations
+
+import asyncio
+import time
+from collections.abc import Callable
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
+from typing import Any, Literal, TypeVar
+
+from prometheus_client import Counter, Gauge, Histogram
+
+from .config import settings
+from .logging import get_logger
+
+logger = get_logger(__name__)
+
+T = TypeVar("T")
+
+HASH_POOL_DEPTH = Gauge(
+    "password_hash_pool_depth",
+    "Password hashing jobs currently queued or running in the worker pool",
+)
+HASH_POOL_CAPACITY = Gauge(
+    "password_hash_pool_capacity",
+    "Maximum password hashing jobs admitted (workers + queue)",
+)
+HASH_POOL_REJECTIONS = Counter(
+    "password_hash_pool_rejections_total",
+    "Password hashing jobs rejected because the pool queue was full",
+)
+HASH_LATENCY = Histogram(
+    "password_hash_duration_seconds",
+    "Wall time of password hashing jobs, including time spent queued",
+    labelnames=("operation",),
+    buckets=(0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0),
+)
+
+
+class PasswordHashPoolSaturated(Exception):
+    """Raised when the hashing pool has no room left for another job."""
+
+    def __init__(self, retry_after: int) -> None:
+        super().__init__("Password hashing pool is saturated")
+        self.retry_after = retry_after
+
+
+class PasswordHashPool:
+    """Bounded executor that keeps bcrypt work off the event loop.
+
+    Admission is decided on the event loop thread, so a plain counter is enough:
+    at most ``max_workers + max_queue`` jobs are in flight, anything beyond that
+    is rejected immediately instead of piling up behind a login storm.
+    """
+
+    def __init__(
+        self,
+        kind: Literal["thread", "process"],
+        max_workers: int,
+        max_queue: int,
+        retry_after: int,
+    ) -> None:
+        self.kind = kind
+        self.max_workers = max_workers
+        self.max_queue = max_queue
+        self.retry_after = retry_after
+        self._executor: Executor | None = None
+        self._in_flight = 0
+        HASH_POOL_CAPACITY.set(self.capacity)
+
+    @property
+    def capacity(self) -> int:
+        return self.max_workers + self.max_queue
+
+    @property
+    def in_flight(self) -> int:
+        return self._in_flight
+
+    def _get_executor(self) -> Executor:
+        if self._executor is None:
+            if self.kind == "process":
+                self._executor = ProcessPoolExecutor(max_workers=self.max_workers)
+            else:
+                self._executor = ThreadPoolExecutor(
+                    max_workers=self.max_workers, thread_name_prefix="password-hash"
+                )
+            logger.info("password_hash_pool_started", kind=self.kind, workers=self.max_workers)
+        return self._executor
+
+    async def run(self, operation: str, func: Callable[..., T], *args: Any) -> T:
+        if self._in_flight >= self.capacity:
+            HASH_POOL_REJECTIONS.inc()
+            logger.warning("password_hash_pool_saturated", in_flight=self._in_flight)
+            raise PasswordHashPoolSaturated(self.retry_after)
+
+        self._in_flight += 1
+        HASH_POOL_DEPTH.set(self._in_flight)
+        started = time.perf_counter()
+        try:
+            loop = asyncio.get_running_loop()
+            return await loop.run_in_executor(self._get_executor(), func, *args)
+        finally:
+            self._in_flight -= 1
+            HASH_POOL_DEPTH.set(self._in_flight)
+            HASH_LATENCY.labels(operation=operation).observe(time.perf_counter() - started)
+
+    def shutdown(self) -> None:
+        if self._executor is not None:
+            self._executor.shutdown(wait=False, cancel_futures=True)
+            self._executor = None
+            logger.info("password_hash_pool_stopped")
+
+
+password_hash_pool = PasswordHashPool(
+    kind=settings.password_hash_executor,
+    max_workers=settings.password_hash_workers,
+    max_queue=settings.password_hash_queue_size,
+    retry_after=settings.password_hash_retry_after_seconds,
+)
@@ -0,0 +1,135 @@
+from __future__ import annotations
+
+import asyncio
+import json
+import time
+from collections.abc import Sequence
+from pathlib import Path
+from typing import Any
+
+import httpx
+from jose import JWTError, jwt
+
+from .config import settings
+from .logging import get_logger
+
+logger = get_logger(__name__)
+
+ASYMMETRIC_ALGORITHMS = ("RS256", "ES256")
+
+
+class JWKSCache:
+    """Signing keys for externally issued tokens, indexed by ``kid``.
+
+    Keys are refreshed in the background (startup + scheduler job). Request
+    paths only read the local dictionary; an unknown ``kid`` schedules at most
+    one refetch per cooldown window and the token is rejected meanwhile.
+
+    The ``sub`` claim is used as-is as the local ``users.id``. Stack Auth user
+    ids are UUIDs, so a Stack user can sign in only once a local account was
+    created with that same id; any other subject is answered with 401.
+    """
+
+    def __init__(
+        self,
+        url: str | None,
+        audiences: Sequence[str] = (),
+        issuers: Sequence[str] = (),
+        unknown_kid_cooldown_seconds: float = 30.0,
+    ) -> None:
+        self.url = url
+        self.audiences = list(audiences)
+        self.issuers = list(issuers)
+        self.unknown_kid_cooldown_seconds = unknown_kid_cooldown_seconds
+        self._keys: dict[str, dict[str, Any]] = {}
+        self._refresh_task: asyncio.Task[None] | None = None
+        self._last_unknown_kid_refresh = float("-inf")
+
+    @property
+    def enabled(self) -> bool:
+        return bool(self.url)
+
+    @property
+    def kids(self) -> list[str]:
+        return list(self._keys)
+
+    def load_document(self, document: dict[str, Any]) -> None:
+        keys = {key["kid"]: key for key in document.get("keys", []) if key.get("kid")}
+        self._keys = keys
+        logger.info("jwks_loaded", kids=list(keys))
+
+    async def _fetch_document(self) -> dict[str, Any]:
+        assert self.url is not None
+        if self.url.startswith("file://"):
+            path = Path(self.url.removeprefix("file://"))
+            return json.loads(await asyncio.to_thread(path.read_text, encoding="utf-8"))
+        async with httpx.AsyncClient(timeout=5) as client:
+            response = await client.get(self.url)
+            response.raise_for_status()
+            return response.json()
+
+    async def refresh(self) -> None:
+        if not self.enabled:
+            return
+        try:
+            document = await self._fetch_document()
+        except (httpx.HTTPError, OSError, ValueError) as exc:
+            logger.warning("jwks_refresh_failed", url=self.url, error=str(exc))
+            return
+        self.load_document(document)
+
+    def _schedule_unknown_kid_refresh(self, kid: str) -> None:
+        if self._refresh_task is not None and not self._refresh_task.done():
+            return
+        now = time.monotonic()
+        if now - self._last_unknown_kid_refresh < self.unknown_kid_cooldown_seconds:
+            return
+        try:
+            loop = asyncio.get_running_loop()
+        except RuntimeError:
+            return
+        self._last_unknown_kid_refresh = now
+        logger.info("jwks_unknown_kid", kid=kid)
+        self._refresh_task = loop.create_task(self.refresh())
+
+    def decode(self, token: str) -> dict[str, Any] | None:
+        try:
+            header = jwt.get_unverified_header(token)
+        except JWTError:
+            return None
+        algorithm = header.get("alg")
+        kid = header.get("kid")
+        if algorithm not in ASYMMETRIC_ALGORITHMS or not kid:
+            return None
+
+        key = self._keys.get(kid)
+        if key is None:
+            self._schedule_unknown_kid_refresh(kid)
+            return None
+
+        try:
+            payload = jwt.decode(
+                token,
+                key,
+                algorithms=[algorithm],
+                options={"verify_aud": False, "verify_iss": False},
+            )
+        except JWTError:
+            return None
+
+        if self.audiences:
+            audience = payload.get("aud")
+            audiences = audience if isinstance(audience, list) else [audience]
+            if not set(audiences) & set(self.audiences):
+                return None
+        if self.issuers and payload.get("iss") not in self.issuers:
+            return None
+        return payload
+
+
+jwks_cache = JWKSCache(
+    url=settings.stack_jwks_url,
+    audiences=settings.stack_allowed_audiences,
+    issuers=settings.stack_allowed_issuers,
+    unknown_kid_cooldown_seconds=settings.stack_jwks_unknown_kid_cooldown_seconds,
+)
@@ -10,6 +10,9 @@ import structlog
 def setup_logging(level: str = "INFO") -> None:
     """Configure structlog and standard logging handlers."""
 
+    # Imported here: the observability module itself logs through this one.
+    from app.infrastructure.observability.queries import add_query_stats
+
     timestamper = structlog.processors.TimeStamper(fmt="iso", utc=True)
 
     structlog.configure(
@@ -17,6 +20,7 @@ def setup_logging(level: str = "INFO") -> None:
             structlog.stdlib.filter_by_level,
             structlog.stdlib.add_logger_name,
             structlog.stdlib.add_log_level,
+            add_query_stats,
             timestamper,
             structlog.processors.StackInfoRenderer(),
             structlog.processors.format_exc_info,
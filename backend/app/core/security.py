@@ -1,12 +1,17 @@
 from __future__ import annotations
 
+import uuid
 from datetime import datetime, timedelta, timezone
 from typing import Any, Optional
 
 from jose import JWTError, jwt
 from passlib.context import CryptContext
 
+from app.infrastructure.cache.revocation import revocation_list
+
 from .config import settings
+from .hashing import password_hash_pool
+from .jwks import jwks_cache
 
 pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
 
@@ -19,35 +24,67 @@ def get_password_hash(password: str) -> str:
     return pwd_context.hash(password)
 
 
-def _create_token(subject: str, expires_delta: timedelta, token_type: str) -> str:
+async def verify_password_async(plain_password: str, hashed_password: str) -> bool:
+    return await password_hash_pool.run("verify", verify_password, plain_password, hashed_password)
+
+
+async def hash_password_async(password: str) -> str:
+    return await password_hash_pool.run("hash", get_password_hash, password)
+
+
+def new_token_family() -> str:
+    return uuid.uuid4().hex
+
+
+def _create_token(
+    subject: str, expires_delta: timedelta, token_type: str, family: str | None = None
+) -> str:
     now = datetime.now(timezone.utc)
     payload = {
         "sub": subject,
         "exp": now + expires_delta,
         "iat": now,
         "type": token_type,
+        "jti": uuid.uuid4().hex,
+        "fam": family or new_token_family(),
     }
     return jwt.encode(payload, settings.secret_key, algorithm=settings.jwt_algorithm)
 
 
-def create_access_token(subject: str) -> str:
+def create_access_token(subject: str, family: str | None = None) -> str:
     expires_delta = timedelta(minutes=settings.access_token_expire_minutes)
-    return _create_token(subject, expires_delta, "access")
+    return _create_token(subject, expires_delta, "access", family)
 
 
-def create_refresh_token(subject: str) -> str:
+def create_refresh_token(subject: str, family: str | None = None) -> str:
     expires_delta = timedelta(minutes=settings.refresh_token_expire_minutes)
-    return _create_token(subject, expires_delta, "refresh")
+    return _create_token(subject, expires_delta, "refresh", family)
 
 
-def decode_token(token: str, token_type: str) -> Optional[str]:
+def decode_token_claims(token: str, token_type: str) -> Optional[dict[str, Any]]:
     try:
         payload = jwt.decode(token, settings.secret_key, algorithms=[settings.jwt_algorithm])
-        if payload.get("type") != token_type:
-            return None
-        return str(payload.get("sub"))
     except JWTError:
         return None
+    if payload.get("type") != token_type or not payload.get("jti"):
+        return None
+    return payload
+
+
+def _subject(payload: dict[str, Any]) -> str | None:
+    subject = payload.get("sub")
+    return str(subject) if subject else None
+
+
+def decode_token(token: str, token_type: str) -> Optional[str]:
+    if token_type == "access" and jwks_cache.enabled:
+        external_payload = jwks_cache.decode(token)
+        if external_payload is not None:
+            return _subject(external_payload)
+    payload = decode_token_claims(token, token_type)
+    if payload is None or revocation_list.is_revoked(payload):
+        return None
+    return _subject(payload)
 
 
 def decode_access_token(token: str) -> Optional[str]:
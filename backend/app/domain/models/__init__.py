@@ -1,5 +1,6 @@
 ﻿from .anatomy import AnatomyLayer, AnatomyStructure
 from .campaign import Campaign, CampaignLesson
+from .content import ContentVersion
 from .leaderboard import LeaderboardScope, LeaderboardSnapshot
 from .mission import Mission, MissionFrequency, MissionProgress, MissionProgressStatus
 from .organization import Classroom, ClassroomMembership, Organization
@@ -12,7 +13,8 @@ from .progress import (
     QuizSession,
     UserSystemProgress,
 )
-from .quiz import DifficultyLevel, QuestionType, QuizOption, QuizQuestion
+from .quiz import DifficultyLevel, QuestionStats, QuestionType, QuizOption, QuizQuestion
+from .review import ReviewState
 from .webhook import WebhookSubscription as WebhookSubscriptionModel
 from .user import ProfileType, User, UserRole
 
@@ -21,6 +23,7 @@ __all__ = [
     "AnatomyStructure",
     "Campaign",
     "CampaignLesson",
+    "ContentVersion",
     "LeaderboardScope",
     "LeaderboardSnapshot",
     "Mission",
@@ -38,9 +41,11 @@ __all__ = [
     "QuizSession",
     "UserSystemProgress",
     "DifficultyLevel",
+    "QuestionStats",
     "QuestionType",
     "QuizOption",
     "QuizQuestion",
+    "ReviewState",
     "ProfileType",
     "User",
     "UserRole",
@@ -0,0 +1,13 @@
+from datetime import datetime
+
+from sqlmodel import Field, SQLModel
+
+
+class ContentVersion(SQLModel, table=True):
+    """Monotonic version per content catalog, bumped in the writing transaction."""
+
+    __tablename__ = "content_versions"
+
+    name: str = Field(primary_key=True, max_length=32)
+    version: int = Field(default=0, nullable=False)
+    updated_at: datetime = Field(default_factory=datetime.utcnow, nullable=False)
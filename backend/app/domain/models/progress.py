@@ -2,6 +2,7 @@
 import uuid
 from datetime import date
 
+from sqlalchemy import UniqueConstraint
 from sqlalchemy.orm import Mapped
 from sqlmodel import Field, Relationship
 
@@ -19,6 +20,9 @@ class AnatomySystem(str, enum.Enum):
 
 class UserSystemProgress(BaseSQLModel, table=True):
     __tablename__ = "user_system_progress"
+    __table_args__ = (
+        UniqueConstraint("user_id", "system", name="uq_user_system_progress_user_system"),
+    )
 
     user_id: uuid.UUID = Field(foreign_key="users.id", nullable=False, index=True)
     system: AnatomySystem = Field(nullable=False, index=True)
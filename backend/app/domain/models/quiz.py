@@ -1,5 +1,6 @@
 ﻿import enum
 import uuid
+from datetime import datetime
 
 from sqlalchemy.orm import Mapped
 from sqlmodel import Field, Relationship
@@ -27,6 +28,7 @@ class QuizQuestion(BaseSQLModel, table=True):
     type: QuestionType = Field(default=QuestionType.multiple_choice)
     difficulty: DifficultyLevel = Field(default=DifficultyLevel.medium)
     media_url: str | None = Field(default=None)
+    elo_rating: int = Field(default=1200, nullable=False)
 
     options: Mapped[list["QuizOption"]] = Relationship(back_populates="question")
 
@@ -34,8 +36,22 @@ class QuizQuestion(BaseSQLModel, table=True):
 class QuizOption(BaseSQLModel, table=True):
     __tablename__ = "quiz_options"
 
-    question_id: uuid.UUID = Field(foreign_key="quiz_questions.id", nullable=False)
+    question_id: uuid.UUID = Field(foreign_key="quiz_questions.id", nullable=False, index=True)
     label: str = Field(nullable=False)
     is_correct: bool = Field(default=False)
 
     question: Mapped["QuizQuestion"] = Relationship(back_populates="options")
+
+
+class QuestionStats(BaseSQLModel, table=True):
+    """Offline calibration of one question, replaced by every calibration run."""
+
+    __tablename__ = "question_stats"
+
+    question_id: uuid.UUID = Field(foreign_key="quiz_questions.id", nullable=False, unique=True)
+    attempts: int = Field(default=0, nullable=False)
+    p_value: float = Field(nullable=False)
+    point_biserial: float | None = Field(default=None)
+    irt_difficulty: float | None = Field(default=None)
+    irt_discrimination: float | None = Field(default=None)
+    calibrated_at: datetime = Field(nullable=False)
@@ -0,0 +1,26 @@
+import uuid
+from datetime import datetime
+
+from sqlalchemy import Index, UniqueConstraint
+from sqlmodel import Field
+
+from .base import BaseSQLModel
+
+
+class ReviewState(BaseSQLModel, table=True):
+    """Spaced-repetition schedule of one question for one user."""
+
+    __tablename__ = "review_states"
+    __table_args__ = (
+        UniqueConstraint("user_id", "question_id", name="uq_review_states_user_question"),
+        Index("ix_review_states_user_due", "user_id", "due_at"),
+    )
+
+    user_id: uuid.UUID = Field(foreign_key="users.id", nullable=False)
+    question_id: uuid.UUID = Field(foreign_key="quiz_questions.id", nullable=False)
+    interval_days: float = Field(default=0.0, nullable=False)
+    ease: float = Field(default=2.5, nullable=False)
+    repetitions: int = Field(default=0, nullable=False)
+    lapses: int = Field(default=0, nullable=False)
+    due_at: datetime = Field(default_factory=datetime.utcnow, nullable=False)
+    last_reviewed_at: datetime | None = Field(default=None)
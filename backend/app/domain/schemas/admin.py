@@ -0,0 +1,22 @@
+from __future__ import annotations
+
+from datetime import datetime
+
+from .common import ORMModel
+
+
+class SlowStatementRead(ORMModel):
+    shape: str
+    count: int
+    total_ms: float
+    mean_ms: float
+    max_ms: float
+    caller: str | None = None
+    last_seen: datetime | None = None
+    explain: list[str] | None = None
+
+
+class SlowStatementReport(ORMModel):
+    threshold_ms: float
+    explain_sample_rate: float
+    statements: list[SlowStatementRead]
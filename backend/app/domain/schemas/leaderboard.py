@@ -1,10 +1,13 @@
 from __future__ import annotations
 
-from typing import List
+import uuid
+from datetime import datetime
+from typing import List, Optional
 
 from pydantic import BaseModel
 
 from app.domain.models.leaderboard import LeaderboardScope
+from .common import ORMModel
 
 
 class LeaderboardEntry(BaseModel):
@@ -20,3 +23,17 @@ class LeaderboardResponse(BaseModel):
     scope: LeaderboardScope
     entries: List[LeaderboardEntry]
     generated_at: str
+
+
+class LeaderboardStanding(BaseModel):
+    scope: LeaderboardScope
+    rank: Optional[int]
+    entries: List[LeaderboardEntry]
+
+
+class LeaderboardSnapshotRead(ORMModel):
+    id: uuid.UUID
+    scope: LeaderboardScope
+    reference_id: Optional[uuid.UUID]
+    generated_at: datetime
+    data: dict
@@ -1,9 +1,10 @@
 from __future__ import annotations
 
 import uuid
+from datetime import datetime
 from typing import List, Optional
 
-from pydantic import BaseModel, Field
+from pydantic import BaseModel, Field, field_validator
 
 from app.domain.models import DifficultyLevel, QuestionType
 from app.domain.models.progress import QuizMode
@@ -49,3 +50,41 @@ class QuizAttemptRead(BaseModel):
     question_id: uuid.UUID
     selected_option_id: Optional[uuid.UUID]
     is_correct: bool
+
+
+class QuizAnswer(QuizAttemptCreate):
+    answered_at: datetime
+
+
+class QuizAnswerBatch(BaseModel):
+    answers: List[QuizAnswer] = Field(min_length=1, max_length=50)
+
+    @field_validator("answers")
+    @classmethod
+    def _ordered_and_unique(cls, answers: List[QuizAnswer]) -> List[QuizAnswer]:
+        question_ids = {answer.question_id for answer in answers}
+        if len(question_ids) != len(answers):
+            raise ValueError("Each question can be answered once per batch")
+        stamps = [answer.answered_at.timestamp() for answer in answers]
+        if stamps != sorted(stamps):
+            raise ValueError("Answers must be ordered by answered_at")
+        return answers
+
+
+class QuizAnswerBatchRead(BaseModel):
+    score: float
+    correct: int
+    attempts: List[QuizAttemptRead]
+
+
+class QuestionStatsRead(BaseModel):
+    question_id: uuid.UUID
+    prompt: str
+    anatomy_system: str
+    difficulty: DifficultyLevel
+    attempts: int
+    p_value: float
+    point_biserial: Optional[float]
+    irt_difficulty: Optional[float]
+    irt_discrimination: Optional[float]
+    calibrated_at: datetime
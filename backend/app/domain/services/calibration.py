@@ -0,0 +1,365 @@
+from __future__ import annotations
+
+import asyncio
+import time
+import uuid
+from collections.abc import AsyncIterator, Callable, Sequence
+from dataclasses import dataclass
+from datetime import datetime, timedelta
+from typing import Any
+
+import numpy as np
+from prometheus_client import Gauge
+from sqlalchemy import delete
+from sqlalchemy.ext.asyncio import AsyncEngine
+from sqlmodel import select
+from sqlmodel.ext.asyncio.session import AsyncSession
+
+from app.core.config import settings
+from app.core.logging import get_logger
+from app.domain.models import QuestionStats, QuizAttempt, QuizQuestion, QuizSession
+from app.domain.services.catalog import QUESTIONS, bump_content_version
+
+logger = get_logger(__name__)
+
+# Abilities are standardised and binned on [-ABILITY_RANGE, ABILITY_RANGE].
+ABILITY_BINS = 61
+ABILITY_RANGE = 3.0
+# Gaussian prior on (intercept, slope - 1): keeps items everyone gets right finite.
+PRIOR_PRECISION = 0.1
+NEWTON_STEPS = 25
+MIN_DISCRIMINATION = 0.1
+
+CALIBRATION_ROWS = Gauge(
+    "question_calibration_rows",
+    "Quiz attempts used by the last question calibration run",
+)
+CALIBRATION_THROUGHPUT = Gauge(
+    "question_calibration_rows_per_second",
+    "Rows streamed per second by the last question calibration run",
+)
+
+
+@dataclass(frozen=True, slots=True)
+class ItemStats:
+    question_id: uuid.UUID
+    attempts: int
+    p_value: float
+    point_biserial: float | None
+    irt_difficulty: float | None
+    irt_discrimination: float | None
+
+
+@dataclass(frozen=True, slots=True)
+class CalibrationReport:
+    rows: int
+    rows_read: int
+    questions: int
+    seconds: float
+
+    @property
+    def rows_per_second(self) -> float:
+        return self.rows_read / self.seconds if self.seconds > 0 else 0.0
+
+
+def _accumulate(
+    total: np.ndarray, index: np.ndarray, size: int, weights: np.ndarray | None = None
+) -> np.ndarray:
+    if total.size < size:
+        total = np.pad(total, (0, size - total.size))
+    total += np.bincount(index, weights=weights, minlength=size)
+    return total
+
+
+def _sigmoid(z: np.ndarray) -> np.ndarray:
+    return 1.0 / (1.0 + np.exp(-np.clip(z, -30.0, 30.0)))
+
+
+def _logit(p: np.ndarray) -> np.ndarray:
+    return np.log(p / (1.0 - p))
+
+
+def _optional(value: float) -> float | None:
+    return None if np.isnan(value) else round(float(value), 4)
+
+
+class DenseIndex:
+    """Dense integer ids for 16-byte keys, in first-seen order."""
+
+    def __init__(self) -> None:
+        self._ids: dict[bytes, int] = {}
+
+    def __len__(self) -> int:
+        return len(self._ids)
+
+    def lookup(self, keys: np.ndarray, grow: bool) -> np.ndarray:
+        """Ids of ``keys``; unknown keys get a new id, or ``-1`` without ``grow``.
+
+        Only distinct keys of the chunk touch the dictionary.
+        """
+
+        unique, inverse = np.unique(keys, return_inverse=True)
+        ids = self._ids
+        resolve = (
+            (lambda key: ids.setdefault(key, len(ids))) if grow else (lambda key: ids.get(key, -1))
+        )
+        dense = np.fromiter(map(resolve, unique.tolist()), dtype=np.int64, count=unique.size)
+        return dense[inverse.reshape(-1)]
+
+    def keys(self) -> list[uuid.UUID]:
+        # numpy drops trailing NUL bytes of fixed-width strings.
+        return [uuid.UUID(bytes=key.ljust(16, b"\0")) for key in self._ids]
+
+
+class ItemCalibrator:
+    """Per-question p-values, point-biserials and 2PL parameters in two passes.
+
+    The first pass counts attempts and correct answers per user and per
+    question. The second places every attempt at its user's ability,
+    estimated from the user's other answers, and sums per-question moments
+    plus a question x ability-bin table of attempts and correct answers.
+    The 2PL model is then fitted on that table alone, so memory grows with
+    users and questions, never with attempts.
+    """
+
+    def __init__(self) -> None:
+        self.users = DenseIndex()
+        self.questions = DenseIndex()
+        self.rows = 0
+        self._user_n = np.zeros(0)
+        self._user_c = np.zeros(0)
+        self._item_n = np.zeros(0)
+        self._item_c = np.zeros(0)
+        self._scale: tuple[float, float] | None = None
+        self._moments = np.zeros((0, 5))
+        self._table_n = np.zeros(0)
+        self._table_c = np.zeros(0)
+
+    def count(self, users: np.ndarray, questions: np.ndarray, correct: np.ndarray) -> None:
+        """First pass over one chunk."""
+
+        user = self.users.lookup(users, grow=True)
+        item = self.questions.lookup(questions, grow=True)
+        weights = correct.astype(np.float64)
+        self._user_n = _accumulate(self._user_n, user, len(self.users))
+        self._user_c = _accumulate(self._user_c, user, len(self.users), weights)
+        self._item_n = _accumulate(self._item_n, item, len(self.questions))
+        self._item_c = _accumulate(self._item_c, item, len(self.questions), weights)
+        self.rows += user.size
+
+    def _ability_scale(self) -> tuple[float, float]:
+        if self._scale is None:
+            theta = _logit((self._user_c + 0.5) / (self._user_n + 1.0))
+            spread = float(theta.std()) if theta.size else 0.0
+            self._scale = (float(theta.mean()) if theta.size else 0.0, spread or 1.0)
+            items = len(self.questions)
+            self._moments = np.zeros((items, 5))
+            self._table_n = np.zeros(items * ABILITY_BINS)
+            self._table_c = np.zeros(items * ABILITY_BINS)
+        return self._scale
+
+    def observe(self, users: np.ndarray, questions: np.ndarray, correct: np.ndarray) -> None:
+        """Second pass over one chunk; rows not seen by the first pass are skipped."""
+
+        mean, spread = self._ability_scale()
+        user = self.users.lookup(users, grow=False)
+        item = self.questions.lookup(questions, grow=False)
+        keep = (user >= 0) & (item >= 0)
+        user, item, y = user[keep], item[keep], correct[keep].astype(np.float64)
+        n, c = self._user_n[user], self._user_c[user]
+        others = np.maximum(n - 1.0, 0.0)
+        rest = np.clip(c - y, 0.0, others)
+
+        # Item-rest correlation: the user's score on their other answers.
+        multi = others > 0
+        x = np.divide(rest, others, out=np.zeros_like(rest), where=multi)
+        items = len(self._moments)
+        for column, weights in enumerate((None, x, x * x, y, x * y)):
+            self._moments[:, column] += np.bincount(
+                item[multi],
+                weights=None if weights is None else weights[multi],
+                minlength=items,
+            )
+
+        theta = (_logit((rest + 0.5) / (others + 1.0)) - mean) / spread
+        position = (theta + ABILITY_RANGE) / (2 * ABILITY_RANGE) * (ABILITY_BINS - 1)
+        bins = np.clip(np.rint(position), 0, ABILITY_BINS - 1).astype(np.int64)
+        cell = item * ABILITY_BINS + bins
+        self._table_n += np.bincount(cell, minlength=self._table_n.size)
+        self._table_c += np.bincount(cell, weights=y, minlength=self._table_c.size)
+
+    def _point_biserial(self) -> np.ndarray:
+        n, sx, sxx, sy, sxy = self._moments.T
+        cov = n * sxy - sx * sy
+        var = (n * sxx - sx * sx) * (n * sy - sy * sy)
+        return np.divide(
+            cov, np.sqrt(np.maximum(var, 0.0)), out=np.full_like(n, np.nan), where=var > 0
+        )
+
+    def _fit_2pl(self) -> tuple[np.ndarray, np.ndarray]:
+        """Newton steps on logit P(correct) = alpha + beta * theta, all questions at once."""
+
+        items = len(self._moments)
+        n = self._table_n.reshape(items, ABILITY_BINS)
+        c = self._table_c.reshape(items, ABILITY_BINS)
+        theta = np.linspace(-ABILITY_RANGE, ABILITY_RANGE, ABILITY_BINS)
+        total = np.maximum(n.sum(axis=1), 1.0)
+        alpha = _logit(np.clip((c.sum(axis=1) + 0.5) / (total + 1.0), 1e-3, 1 - 1e-3))
+        beta = np.ones(items)
+        for _ in range(NEWTON_STEPS):
+            p = _sigmoid(alpha[:, None] + beta[:, None] * theta)
+            residual = c - n * p
+            weight = n * p * (1.0 - p)
+            g0 = residual.sum(axis=1) - PRIOR_PRECISION * alpha
+            g1 = (residual * theta).sum(axis=1) - PRIOR_PRECISION * (beta - 1.0)
+            h00 = weight.sum(axis=1) + PRIOR_PRECISION
+            h01 = (weight * theta).sum(axis=1)
+            h11 = (weight * theta * theta).sum(axis=1) + PRIOR_PRECISION
+            det = h00 * h11 - h01 * h01
+            step0 = (h11 * g0 - h01 * g1) / det
+            step1 = (h00 * g1 - h01 * g0) / det
+            alpha += step0
+            beta += step1
+            if max(np.abs(step0).max(initial=0.0), np.abs(step1).max(initial=0.0)) < 1e-6:
+                break
+        difficulty = np.divide(
+            -alpha, beta, out=np.full_like(alpha, np.nan), where=beta > MIN_DISCRIMINATION
+        )
+        return np.clip(difficulty, -2 * ABILITY_RANGE, 2 * ABILITY_RANGE), beta
+
+    def results(self, min_attempts: int) -> list[ItemStats]:
+        self._ability_scale()
+        fitted = self._item_n >= min_attempts
+        point_biserial = np.where(fitted, self._point_biserial(), np.nan)
+        difficulty, discrimination = self._fit_2pl()
+        difficulty = np.where(fitted, difficulty, np.nan)
+        discrimination = np.where(fitted, discrimination, np.nan)
+        p_value = self._item_c / np.maximum(self._item_n, 1.0)
+        return [
+            ItemStats(
+                question_id=question_id,
+                attempts=int(self._item_n[index]),
+                p_value=round(float(p_value[index]), 4),
+                point_biserial=_optional(point_biserial[index]),
+                irt_difficulty=_optional(difficulty[index]),
+                irt_discrimination=_optional(discrimination[index]),
+            )
+            for index, question_id in enumerate(self.questions.keys())
+        ]
+
+
+def _columns(rows: Sequence[Any]) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+    count = len(rows)
+    return (
+        np.fromiter((row[0].bytes for row in rows), dtype="S16", count=count),
+        np.fromiter((row[1].bytes for row in rows), dtype="S16", count=count),
+        np.fromiter((row[2] for row in rows), dtype=np.bool_, count=count),
+    )
+
+
+async def _stream_attempts(
+    source: AsyncEngine, cutoff: datetime, chunk_rows: int
+) -> AsyncIterator[Sequence[Any]]:
+    """Attempts older than ``cutoff`` in chunks, read through a server-side cursor."""
+
+    statement = (
+        select(QuizSession.user_id, QuizAttempt.question_id, QuizAttempt.is_correct)
+        .join(QuizSession, QuizSession.id == QuizAttempt.session_id)
+        .where(QuizAttempt.created_at < cutoff)
+        .execution_options(yield_per=chunk_rows)
+    )
+    async with source.connect() as conn:
+        result = await conn.stream(statement)
+        async for rows in result.partitions():
+            yield rows
+
+
+def _feed(
+    step: Callable[[np.ndarray, np.ndarray, np.ndarray], None], rows: Sequence[Any]
+) -> int:
+    step(*_columns(rows))
+    return len(rows)
+
+
+async def calibrate_questions(
+    source: AsyncEngine,
+    session: AsyncSession,
+    chunk_rows: int | None = None,
+    min_attempts: int | None = None,
+    now: datetime | None = None,
+) -> CalibrationReport:
+    """Recompute ``question_stats`` from every attempt in ``source``.
+
+    Attempts younger than twice the hot-state lifetime may still be on
+    their way to the table, so they are left for the next run; both passes
+    then read the same rows. The number crunching runs in a worker thread,
+    chunk by chunk, so the event loop keeps serving requests meanwhile. The
+    caller commits ``session``.
+    """
+
+    chunk_rows = chunk_rows or settings.question_calibration_chunk_rows
+    if min_attempts is None:
+        min_attempts = settings.question_calibration_min_attempts
+    now = now or datetime.utcnow()
+    cutoff = now - timedelta(seconds=settings.quiz_state_ttl_seconds * 2)
+    started = time.perf_counter()
+
+    calibrator = ItemCalibrator()
+    async for rows in _stream_attempts(source, cutoff, chunk_rows):
+        await asyncio.to_thread(_feed, calibrator.count, rows)
+    rows_read = calibrator.rows
+    async for rows in _stream_attempts(source, cutoff, chunk_rows):
+        rows_read += await asyncio.to_thread(_feed, calibrator.observe, rows)
+    items = await asyncio.to_thread(calibrator.results, min_attempts)
+
+    await session.exec(delete(QuestionStats))
+    session.add_all(
+        QuestionStats(
+            question_id=item.question_id,
+            attempts=item.attempts,
+            p_value=item.p_value,
+            point_biserial=item.point_biserial,
+            irt_difficulty=item.irt_difficulty,
+            irt_discrimination=item.irt_discrimination,
+            calibrated_at=now,
+        )
+        for item in items
+    )
+    # The question selector leaves out items flagged by the new statistics.
+    await bump_content_version(session, QUESTIONS)
+    await session.flush()
+
+    report = CalibrationReport(
+        rows=calibrator.rows,
+        rows_read=rows_read,
+        questions=len(items),
+        seconds=time.perf_counter() - started,
+    )
+    CALIBRATION_ROWS.set(report.rows)
+    CALIBRATION_THROUGHPUT.set(report.rows_per_second)
+    logger.info(
+        "question_calibration_finished",
+        rows=report.rows,
+        questions=report.questions,
+        seconds=round(report.seconds, 2),
+        rows_per_second=round(report.rows_per_second),
+    )
+    return report
+
+
+async def list_question_stats(
+    session: AsyncSession, system: str | None, limit: int
+) -> list[tuple[QuestionStats, QuizQuestion]]:
+    """Calibrated questions, least discriminating first."""
+
+    statement = select(QuestionStats, QuizQuestion).join(
+        QuizQuestion, QuizQuestion.id == QuestionStats.question_id
+    )
+    if system:
+        statement = statement.where(QuizQuestion.anatomy_system == system)
+    result = await session.exec(
+        statement.order_by(
+            QuestionStats.point_biserial.is_(None), QuestionStats.point_biserial
+        ).limit(limit)
+    )
+    return list(result.all())
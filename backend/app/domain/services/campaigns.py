@@ -9,13 +9,17 @@ from sqlmodel.ext.asyncio.session import AsyncSession
 
 from app.domain.models import Campaign, CampaignLesson, CampaignProgress, CampaignProgressStatus, User
 from app.domain.schemas.campaign import CampaignCreate
+from app.domain.services import users as user_service
+from app.domain.services.catalog import (
+    CAMPAIGNS,
+    CampaignEntry,
+    bump_content_version,
+    content_catalog,
+)
 
 
-async def list_campaigns(session: AsyncSession) -> List[Campaign]:
-    result = await session.exec(
-        select(Campaign).options(selectinload(Campaign.lessons))
-    )
-    return result.unique().all()
+async def list_campaigns(session: AsyncSession) -> tuple[CampaignEntry, ...]:
+    return (await content_catalog.campaigns(session)).campaigns
 
 
 async def get_campaign(session: AsyncSession, campaign_id: uuid.UUID) -> Campaign | None:
@@ -24,10 +28,7 @@ async def get_campaign(session: AsyncSession, campaign_id: uuid.UUID) -> Campaig
         .options(selectinload(Campaign.lessons))
         .where(Campaign.id == campaign_id)
     )
-    campaign = result.first()
-    if campaign:
-        await session.refresh(campaign)
-    return campaign
+    return result.first()
 
 
 async def create_campaign(session: AsyncSession, payload: CampaignCreate) -> Campaign:
@@ -50,8 +51,10 @@ async def create_campaign(session: AsyncSession, payload: CampaignCreate) -> Cam
             xp_reward=lesson_payload.xp_reward,
         )
         session.add(lesson)
-    await session.commit()
-    await session.refresh(campaign)
+    await session.flush()
+    # Loads the lessons just inserted so the caller can serialize them.
+    await session.refresh(campaign, attribute_names=["lessons"])
+    await bump_content_version(session, CAMPAIGNS)
     return campaign
 
 
@@ -84,11 +87,15 @@ async def record_lesson_progress(
     if not progress:
         progress = CampaignProgress(user_id=user.id, lesson_id=lesson_id)
 
+    was_completed = progress.status == CampaignProgressStatus.completed
     progress.status = status
     progress.score = score
     progress.touch()
 
     session.add(progress)
-    await session.commit()
-    await session.refresh(progress)
+    await session.flush()
+    if status == CampaignProgressStatus.completed and not was_completed:
+        lesson = await session.get(CampaignLesson, lesson_id)
+        if lesson:
+            await user_service.increment_user_xp(session, user, lesson.xp_reward)
     return progress
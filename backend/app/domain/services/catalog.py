@@ -0,0 +1,459 @@
+from __future__ import annotations
+
+import asyncio
+import uuid
+from collections.abc import Awaitable, Callable, Mapping
+from dataclasses import dataclass
+from datetime import datetime
+from functools import partial
+from types import MappingProxyType
+from typing import Any
+
+from prometheus_client import Counter, Gauge
+from redis.exceptions import RedisError
+from sqlalchemy import update
+from sqlalchemy.orm import selectinload
+from sqlmodel import select
+from sqlmodel.ext.asyncio.session import AsyncSession
+
+from app.core.config import settings
+from app.core.logging import get_logger
+from app.domain.models import (
+    AnatomyLayer,
+    AnatomyStructure,
+    Campaign,
+    ContentVersion,
+    DifficultyLevel,
+    Mission,
+    MissionFrequency,
+    QuestionStats,
+    QuestionType,
+    QuizQuestion,
+)
+from app.domain.services.question_pool import bucket_size, pack_question_ids, sample_question_ids
+from app.infrastructure.cache.redis import invalidate, on_invalidation
+from app.infrastructure.db.unit_of_work import on_commit
+
+logger = get_logger(__name__)
+
+CAMPAIGNS = "campaigns"
+MISSIONS = "missions"
+QUESTIONS = "questions"
+ANATOMY = "anatomy"
+SECTIONS = (CAMPAIGNS, MISSIONS, QUESTIONS, ANATOMY)
+
+RATING_BAND_WIDTH = 100
+
+# (anatomy_system, difficulty, rating band)
+QuestionBucket = tuple[str, DifficultyLevel, int]
+
+CATALOG_LOADS = Counter(
+    "content_catalog_loads_total",
+    "Content catalog sections loaded from the database",
+    labelnames=("section", "reason"),
+)
+CATALOG_VERSION = Gauge(
+    "content_catalog_version",
+    "Version of each content catalog section held by this worker",
+    labelnames=("section",),
+)
+
+
+def _invalidation_key(section: str) -> str:
+    return f"content-catalog:{section}"
+
+
+@dataclass(frozen=True, slots=True)
+class LessonEntry:
+    id: uuid.UUID
+    created_at: datetime
+    updated_at: datetime
+    order: int
+    title: str
+    content_url: str
+    duration_minutes: int
+    xp_reward: int
+
+
+@dataclass(frozen=True, slots=True)
+class CampaignEntry:
+    id: uuid.UUID
+    created_at: datetime
+    updated_at: datetime
+    title: str
+    description: str
+    anatomy_system: str
+    recommended_level: int
+    lessons: tuple[LessonEntry, ...]
+
+
+@dataclass(frozen=True, slots=True)
+class MissionEntry:
+    id: uuid.UUID
+    title: str
+    description: str
+    xp_reward: int
+    target: int
+    frequency: MissionFrequency
+    category: str
+
+
+@dataclass(frozen=True, slots=True)
+class OptionEntry:
+    id: uuid.UUID
+    label: str
+    is_correct: bool
+
+
+@dataclass(frozen=True, slots=True)
+class QuestionEntry:
+    id: uuid.UUID
+    prompt: str
+    anatomy_system: str
+    type: QuestionType
+    difficulty: DifficultyLevel
+    media_url: str | None
+    elo_rating: int
+    options: tuple[OptionEntry, ...]
+
+
+@dataclass(frozen=True, slots=True)
+class LayerEntry:
+    id: uuid.UUID
+    created_at: datetime
+    updated_at: datetime
+    structure_id: uuid.UUID
+    name: str
+    visible: bool
+
+
+@dataclass(frozen=True, slots=True)
+class StructureEntry:
+    id: uuid.UUID
+    created_at: datetime
+    updated_at: datetime
+    name: str
+    latin_name: str | None
+    system: str
+    region: str
+    description: str
+    tags: tuple[str, ...]
+    asset_uri: str | None
+    layers: tuple[LayerEntry, ...]
+
+
+@dataclass(frozen=True, slots=True)
+class CampaignCatalog:
+    version: int
+    campaigns: tuple[CampaignEntry, ...]
+
+
+@dataclass(frozen=True, slots=True)
+class MissionCatalog:
+    version: int
+    by_title: Mapping[str, MissionEntry]
+
+
+@dataclass(frozen=True, slots=True)
+class QuestionCatalog:
+    version: int
+    by_id: Mapping[uuid.UUID, QuestionEntry]
+    buckets: Mapping[QuestionBucket, bytes]
+
+    def _keys(
+        self, system: str | None, difficulty: DifficultyLevel | None
+    ) -> list[QuestionBucket]:
+        return [
+            key
+            for key in self.buckets
+            if (system is None or key[0] == system) and (difficulty is None or key[1] == difficulty)
+        ]
+
+    def sample(
+        self, system: str | None, difficulty: DifficultyLevel | None, k: int
+    ) -> list[QuestionEntry]:
+        keys = self._keys(system, difficulty)
+        sampled = sample_question_ids(self.buckets, keys, k)
+        return [self.by_id[question_id] for question_id in sampled]
+
+    def sample_near(
+        self, system: str | None, difficulty: DifficultyLevel | None, rating: int, k: int
+    ) -> list[QuestionEntry]:
+        """``k`` questions from the rating bands closest to ``rating``.
+
+        Bands are taken outwards from the player's own band until they hold
+        at least ``k`` questions, then the draw is uniform over them.
+        """
+
+        keys = self._keys(system, difficulty)
+        target = rating // RATING_BAND_WIDTH
+        chosen: list[QuestionBucket] = []
+        available = 0
+        for key in sorted(keys, key=lambda key: (abs(key[2] - target), key[2])):
+            distance = abs(key[2] - target)
+            if chosen and available >= k and distance > abs(chosen[-1][2] - target):
+                break
+            chosen.append(key)
+            available += bucket_size(self.buckets, key)
+        return [
+            self.by_id[question_id] for question_id in sample_question_ids(self.buckets, chosen, k)
+        ]
+
+
+@dataclass(frozen=True, slots=True)
+class AnatomyCatalog:
+    version: int
+    structures: tuple[StructureEntry, ...]
+    by_id: Mapping[uuid.UUID, StructureEntry]
+    by_system: Mapping[str, tuple[StructureEntry, ...]]
+
+    def search(self, system: str | None, query: str | None) -> tuple[StructureEntry, ...]:
+        structures = self.by_system.get(system, ()) if system else self.structures
+        if not query:
+            return structures
+        needle = query.casefold()
+        return tuple(entry for entry in structures if needle in entry.name.casefold())
+
+
+async def _load_campaigns(session: AsyncSession, version: int) -> CampaignCatalog:
+    result = await session.exec(
+        select(Campaign).options(selectinload(Campaign.lessons)).order_by(Campaign.title)
+    )
+    campaigns = tuple(
+        CampaignEntry(
+            id=campaign.id,
+            created_at=campaign.created_at,
+            updated_at=campaign.updated_at,
+            title=campaign.title,
+            description=campaign.description,
+            anatomy_system=campaign.anatomy_system,
+            recommended_level=campaign.recommended_level,
+            lessons=tuple(
+                LessonEntry(
+                    id=lesson.id,
+                    created_at=lesson.created_at,
+                    updated_at=lesson.updated_at,
+                    order=lesson.order,
+                    title=lesson.title,
+                    content_url=lesson.content_url,
+                    duration_minutes=lesson.duration_minutes,
+                    xp_reward=lesson.xp_reward,
+                )
+                for lesson in sorted(campaign.lessons, key=lambda lesson: lesson.order)
+            ),
+        )
+        for campaign in result.all()
+    )
+    return CampaignCatalog(version=version, campaigns=campaigns)
+
+
+async def _load_missions(session: AsyncSession, version: int) -> MissionCatalog:
+    result = await session.exec(select(Mission))
+    by_title = {
+        mission.title: MissionEntry(
+            id=mission.id,
+            title=mission.title,
+            description=mission.description,
+            xp_reward=mission.xp_reward,
+            target=mission.target,
+            frequency=mission.frequency,
+            category=mission.category,
+        )
+        for mission in result.all()
+    }
+    return MissionCatalog(version=version, by_title=MappingProxyType(by_title))
+
+
+def rating_bucket(system: str, difficulty: DifficultyLevel, rating: int) -> QuestionBucket:
+    return system, DifficultyLevel(difficulty), rating // RATING_BAND_WIDTH
+
+
+async def _load_questions(session: AsyncSession, version: int) -> QuestionCatalog:
+    result = await session.exec(select(QuizQuestion).options(selectinload(QuizQuestion.options)))
+    by_id = {
+        question.id: QuestionEntry(
+            id=question.id,
+            prompt=question.prompt,
+            anatomy_system=question.anatomy_system,
+            type=question.type,
+            difficulty=question.difficulty,
+            media_url=question.media_url,
+            elo_rating=question.elo_rating,
+            options=tuple(
+                OptionEntry(id=option.id, label=option.label, is_correct=option.is_correct)
+                for option in question.options
+            ),
+        )
+        for question in result.all()
+    }
+    # Calibration flags items that strong players miss more than weak ones
+    # (usually a wrong answer key); they are still graded but never drawn.
+    flagged = set(
+        (
+            await session.exec(
+                select(QuestionStats.question_id).where(
+                    QuestionStats.point_biserial < settings.question_min_point_biserial
+                )
+            )
+        ).all()
+    )
+    buckets = pack_question_ids(
+        (entry.id, rating_bucket(entry.anatomy_system, entry.difficulty, entry.elo_rating))
+        for entry in by_id.values()
+        if entry.id not in flagged
+    )
+    return QuestionCatalog(
+        version=version, by_id=MappingProxyType(by_id), buckets=MappingProxyType(buckets)
+    )
+
+
+async def _load_anatomy(session: AsyncSession, version: int) -> AnatomyCatalog:
+    layers: dict[uuid.UUID, list[LayerEntry]] = {}
+    for layer in (await session.exec(select(AnatomyLayer))).all():
+        layers.setdefault(layer.structure_id, []).append(
+            LayerEntry(
+                id=layer.id,
+                created_at=layer.created_at,
+                updated_at=layer.updated_at,
+                structure_id=layer.structure_id,
+                name=layer.name,
+                visible=layer.visible,
+            )
+        )
+    result = await session.exec(select(AnatomyStructure).order_by(AnatomyStructure.name))
+    structures = tuple(
+        StructureEntry(
+            id=structure.id,
+            created_at=structure.created_at,
+            updated_at=structure.updated_at,
+            name=structure.name,
+            latin_name=structure.latin_name,
+            system=structure.system,
+            region=structure.region,
+            description=structure.description,
+            tags=tuple(structure.tags or ()),
+            asset_uri=structure.asset_uri,
+            layers=tuple(layers.get(structure.id, ())),
+        )
+        for structure in result.all()
+    )
+    by_system: dict[str, list[StructureEntry]] = {}
+    for entry in structures:
+        by_system.setdefault(entry.system, []).append(entry)
+    return AnatomyCatalog(
+        version=version,
+        structures=structures,
+        by_id=MappingProxyType({entry.id: entry for entry in structures}),
+        by_system=MappingProxyType({key: tuple(value) for key, value in by_system.items()}),
+    )
+
+
+_LOADERS: dict[str, Callable[[AsyncSession, int], Awaitable[Any]]] = {
+    CAMPAIGNS: _load_campaigns,
+    MISSIONS: _load_missions,
+    QUESTIONS: _load_questions,
+    ANATOMY: _load_anatomy,
+}
+
+
+async def _read_versions(session: AsyncSession) -> dict[str, int]:
+    result = await session.exec(select(ContentVersion.name, ContentVersion.version))
+    return {name: version for name, version in result.all()}
+
+
+class ContentCatalog:
+    """Read-mostly content held in memory as immutable, indexed snapshots.
+
+    Each section (campaigns, missions, questions, anatomy) carries the
+    version from ``content_versions`` it was loaded at. Writers bump that
+    version in their transaction (:func:`bump_content_version`); after the
+    commit every worker hears about it on the cache invalidation channel and
+    marks the section stale. The next reader loads a new snapshot and swaps
+    it in whole, so a request never sees half of a reload. :meth:`refresh`
+    compares versions with the database as a safety net for missed messages
+    and writes made outside the API.
+    """
+
+    def __init__(self) -> None:
+        self._snapshots: dict[str, Any] = {}
+        self._stale: set[str] = set()
+        self._lock = asyncio.Lock()
+
+    def mark_stale(self, section: str) -> None:
+        self._stale.add(section)
+
+    def loaded_version(self, section: str) -> int | None:
+        snapshot = self._snapshots.get(section)
+        return snapshot.version if snapshot is not None else None
+
+    async def _section(self, session: AsyncSession, section: str) -> Any:
+        snapshot = self._snapshots.get(section)
+        if snapshot is not None and section not in self._stale:
+            return snapshot
+        async with self._lock:
+            snapshot = self._snapshots.get(section)
+            if snapshot is None or section in self._stale:
+                versions = await _read_versions(session)
+                snapshot = await self._load(session, section, versions.get(section, 0), "miss")
+            return snapshot
+
+    async def _load(self, session: AsyncSession, section: str, version: int, reason: str) -> Any:
+        self._stale.discard(section)
+        snapshot = await _LOADERS[section](session, version)
+        self._snapshots[section] = snapshot
+        CATALOG_LOADS.labels(section=section, reason=reason).inc()
+        CATALOG_VERSION.labels(section=section).set(version)
+        logger.info("content_catalog_loaded", section=section, version=version, reason=reason)
+        return snapshot
+
+    async def campaigns(self, session: AsyncSession) -> CampaignCatalog:
+        return await self._section(session, CAMPAIGNS)
+
+    async def missions(self, session: AsyncSession) -> MissionCatalog:
+        return await self._section(session, MISSIONS)
+
+    async def questions(self, session: AsyncSession) -> QuestionCatalog:
+        return await self._section(session, QUESTIONS)
+
+    async def anatomy(self, session: AsyncSession) -> AnatomyCatalog:
+        return await self._section(session, ANATOMY)
+
+    async def refresh(self, session: AsyncSession, preload: bool = False) -> None:
+        """Reload sections whose database version moved (or every section, on ``preload``)."""
+
+        versions = await _read_versions(session)
+        async with self._lock:
+            for section in SECTIONS:
+                version = versions.get(section, 0)
+                loaded = self.loaded_version(section)
+                if loaded is None and preload:
+                    await self._load(session, section, version, "preload")
+                elif loaded is not None and (loaded != version or section in self._stale):
+                    await self._load(session, section, version, "version")
+
+
+content_catalog = ContentCatalog()
+for _name in SECTIONS:
+    on_invalidation(_invalidation_key(_name), partial(content_catalog.mark_stale, _name))
+
+
+async def _announce(section: str) -> None:
+    content_catalog.mark_stale(section)
+    try:
+        await invalidate(_invalidation_key(section))
+    except RedisError as exc:
+        logger.warning("content_catalog_announce_failed", section=section, error=str(exc))
+
+
+async def bump_content_version(session: AsyncSession, section: str) -> None:
+    """Record a write to ``section``; workers reload it once the transaction commits."""
+
+    result = await session.exec(
+        update(ContentVersion)
+        .where(ContentVersion.name == section)
+        .values(version=ContentVersion.version + 1, updated_at=datetime.utcnow())
+    )
+    if not result.rowcount:
+        session.add(ContentVersion(name=section, version=1))
+        await session.flush()
+    await on_commit(session, partial(_announce, section))
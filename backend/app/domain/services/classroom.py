@@ -9,6 +9,7 @@ from sqlmodel import select
 from sqlmodel.ext.asyncio.session import AsyncSession
 
 from app.domain.models import Classroom, ClassroomMembership, User
+from app.domain.services import leaderboard as leaderboard_service
 
 
 def _generate_invite_code(length: int = 8) -> str:
@@ -33,8 +34,7 @@ async def create_classroom(
         role="teacher",
     )
     session.add(membership)
-    await session.commit()
-    await session.refresh(classroom)
+    await session.flush()
     return classroom
 
 
@@ -59,8 +59,8 @@ async def enroll_with_code(session: AsyncSession, user: User, invite_code: str)
         role="student",
     )
     session.add(membership)
-    await session.commit()
-    await session.refresh(classroom)
+    await session.flush()
+    await leaderboard_service.join_classroom_board(session, user, classroom.id)
     return classroom
 
 
@@ -0,0 +1,174 @@
+from __future__ import annotations
+
+import uuid
+from collections.abc import Mapping, Sequence
+from functools import partial
+
+from prometheus_client import Counter, Gauge
+from sqlalchemy import bindparam, update
+from sqlmodel import select
+from sqlmodel.ext.asyncio.session import AsyncSession
+
+from app.domain.models import QuizAttempt, QuizQuestion, User
+from app.domain.services.catalog import (
+    QUESTIONS,
+    RATING_BAND_WIDTH,
+    bump_content_version,
+    content_catalog,
+)
+from app.infrastructure.cache.principal import principal_cache
+from app.infrastructure.db.unit_of_work import on_commit
+
+K_PLAYER = 32
+K_QUESTION = 16
+DEFAULT_RATING = 1200
+
+QUESTION_RATINGS_PENDING = Gauge(
+    "question_rating_pending",
+    "Questions with rating changes waiting to be written by this worker",
+)
+QUESTION_RATINGS_WRITTEN = Counter(
+    "question_rating_updates_total",
+    "Question rating rows written by the coalescing flush",
+)
+
+
+def expected_score(player: float, question: float) -> float:
+    return 1 / (1 + 10 ** ((question - player) / 400))
+
+
+class QuestionRatingBuffer:
+    """Per-worker sum of question rating changes not yet written.
+
+    Every graded attempt moves its question's rating, so writing them one by
+    one would make popular questions row-lock hotspots. Changes are summed
+    here and written as one executemany per flush; the fractional part of
+    each sum stays behind for the next one.
+    """
+
+    def __init__(self) -> None:
+        self._deltas: dict[uuid.UUID, float] = {}
+        # Changes this worker wrote since the catalog snapshot it compared them with.
+        self.written: dict[uuid.UUID, int] = {}
+        self.written_version: int | None = None
+
+    def __len__(self) -> int:
+        return len(self._deltas)
+
+    def pending(self, question_id: uuid.UUID) -> float:
+        return self._deltas.get(question_id, 0.0)
+
+    async def merge(self, deltas: Mapping[uuid.UUID, float]) -> None:
+        for question_id, delta in deltas.items():
+            self._deltas[question_id] = self._deltas.get(question_id, 0.0) + delta
+        QUESTION_RATINGS_PENDING.set(len(self._deltas))
+
+    def take(self) -> dict[uuid.UUID, int]:
+        """Remove and return the whole-point part of every pending change."""
+
+        taken = {}
+        for question_id, delta in list(self._deltas.items()):
+            whole = round(delta)
+            if whole:
+                taken[question_id] = whole
+                self._deltas[question_id] = delta - whole
+            if abs(self._deltas[question_id]) < 1e-9:
+                del self._deltas[question_id]
+        QUESTION_RATINGS_PENDING.set(len(self._deltas))
+        return taken
+
+    async def restore(self, taken: Mapping[uuid.UUID, int]) -> None:
+        await self.merge({question_id: float(delta) for question_id, delta in taken.items()})
+
+    def applied(self, question_id: uuid.UUID, version: int) -> int:
+        """Changes written by this worker that catalog ``version`` does not show yet."""
+
+        if self.written_version != version:
+            return 0
+        return self.written.get(question_id, 0)
+
+    async def mark_written(self, version: int, deltas: Mapping[uuid.UUID, int]) -> None:
+        """Record committed changes against the catalog snapshot they were compared with."""
+
+        if self.written_version != version:
+            self.written, self.written_version = {}, version
+        for question_id, delta in deltas.items():
+            self.written[question_id] = self.written.get(question_id, 0) + delta
+
+
+question_ratings = QuestionRatingBuffer()
+
+
+async def rate_attempts(
+    session: AsyncSession, user_id: uuid.UUID, attempts: Sequence[QuizAttempt]
+) -> None:
+    """Play each attempt as an Elo match between the user and the question.
+
+    The user's rating is written in the caller's transaction; question
+    changes join :data:`question_ratings` once it commits.
+    """
+
+    if not attempts:
+        return
+    result = await session.exec(select(User.elo_rating).where(User.id == user_id))
+    rating = result.first()
+    if rating is None:
+        return
+    catalog = await content_catalog.questions(session)
+    player = float(rating)
+    deltas: dict[uuid.UUID, float] = {}
+    for attempt in sorted(attempts, key=lambda attempt: attempt.created_at):
+        entry = catalog.by_id.get(attempt.question_id)
+        question = (
+            (entry.elo_rating if entry else DEFAULT_RATING)
+            + question_ratings.applied(attempt.question_id, catalog.version)
+            + question_ratings.pending(attempt.question_id)
+            + deltas.get(attempt.question_id, 0.0)
+        )
+        surprise = (1.0 if attempt.is_correct else 0.0) - expected_score(player, question)
+        player += K_PLAYER * surprise
+        deltas[attempt.question_id] = deltas.get(attempt.question_id, 0.0) - K_QUESTION * surprise
+
+    change = round(player - rating)
+    if change:
+        await session.exec(
+            update(User).where(User.id == user_id).values(elo_rating=User.elo_rating + change)
+        )
+        await on_commit(session, partial(principal_cache.invalidate, user_id))
+    await on_commit(session, partial(question_ratings.merge, deltas))
+
+
+async def write_question_ratings(session: AsyncSession, deltas: Mapping[uuid.UUID, int]) -> None:
+    """Apply coalesced rating changes, in id order so concurrent flushes cannot deadlock.
+
+    When a question moves to another rating band the questions catalog is
+    bumped, so every worker rebuilds its selection index.
+    """
+
+    if not deltas:
+        return
+    table = QuizQuestion.__table__
+    await session.exec(
+        update(table)
+        .where(table.c.id == bindparam("question_id"))
+        .values(elo_rating=table.c.elo_rating + bindparam("delta")),
+        params=[
+            {"question_id": question_id, "delta": deltas[question_id]}
+            for question_id in sorted(deltas)
+        ],
+    )
+    QUESTION_RATINGS_WRITTEN.inc(len(deltas))
+
+    catalog = await content_catalog.questions(session)
+    crossed = False
+    for question_id, delta in deltas.items():
+        written = question_ratings.applied(question_id, catalog.version) + delta
+        entry = catalog.by_id.get(question_id)
+        if entry is not None and (entry.elo_rating + written) // RATING_BAND_WIDTH != (
+            entry.elo_rating // RATING_BAND_WIDTH
+        ):
+            crossed = True
+    # Only once committed: a rolled-back flush restores the deltas to the buffer instead.
+    await on_commit(session, partial(question_ratings.mark_written, catalog.version, deltas))
+    if crossed:
+        await bump_content_version(session, QUESTIONS)
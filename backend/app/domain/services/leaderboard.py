@@ -2,13 +2,76 @@ from __future__ import annotations
 
 from datetime import datetime
 import uuid
+from collections import defaultdict
+from collections.abc import Sequence
+from functools import partial
 from typing import List
 
-from sqlalchemy import desc, select
+from sqlalchemy import and_, desc, func, or_
+from sqlmodel import select
 from sqlmodel.ext.asyncio.session import AsyncSession
 
-from app.domain.models import LeaderboardScope, LeaderboardSnapshot, User
-from app.domain.schemas.leaderboard import LeaderboardEntry
+from app.domain.models import ClassroomMembership, LeaderboardScope, LeaderboardSnapshot, User
+from app.domain.schemas.leaderboard import (
+    LeaderboardEntry,
+    LeaderboardSnapshotRead,
+    LeaderboardStanding,
+)
+from app.infrastructure.cache.decorators import cached, invalidate_tag
+from app.infrastructure.cache.leaderboard import (
+    Profile,
+    Standing,
+    board_key,
+    leaderboard_store,
+)
+from app.infrastructure.db.unit_of_work import on_commit
+
+GLOBAL_BOARD = board_key(LeaderboardScope.global_scope.value)
+
+
+def _reference_uuid(scope: LeaderboardScope, reference_id: str | None) -> uuid.UUID | None:
+    if reference_id and scope in {LeaderboardScope.organization, LeaderboardScope.classroom}:
+        return uuid.UUID(reference_id)
+    return None
+
+
+def _scoped(query, scope: LeaderboardScope, reference_uuid: uuid.UUID | None):
+    if reference_uuid is None:
+        return query
+    if scope == LeaderboardScope.organization:
+        return query.where(User.organization_id == reference_uuid)
+    return query.join(ClassroomMembership, ClassroomMembership.user_id == User.id).where(
+        ClassroomMembership.classroom_id == reference_uuid
+    )
+
+
+def _board(scope: LeaderboardScope, reference_uuid: uuid.UUID | None) -> str | None:
+    """Sorted set serving ``scope``; friends lists are not kept in Redis."""
+
+    if scope == LeaderboardScope.friends:
+        return None
+    if reference_uuid is None:
+        return GLOBAL_BOARD
+    return board_key(scope.value, reference_uuid)
+
+
+def _profile(display_name: str, streak: int, preferences: dict) -> Profile:
+    return Profile(display_name=display_name, streak=streak, avatar=preferences.get("avatar"))
+
+
+def profile_of(user: User) -> Profile:
+    return _profile(user.display_name, user.streak, user.preferences)
+
+
+def _entry(user: User, rank: int) -> LeaderboardEntry:
+    return LeaderboardEntry(
+        user_id=str(user.id),
+        display_name=user.display_name,
+        xp=user.xp,
+        streak=user.streak,
+        rank=rank,
+        avatar=user.preferences.get("avatar"),
+    )
 
 
 async def build_leaderboard(
@@ -17,30 +80,16 @@ async def build_leaderboard(
     reference_id: str | None = None,
     limit: int = 20,
 ) -> LeaderboardSnapshot:
-    query = select(User)
-    reference_uuid = None
-    if reference_id and scope in {LeaderboardScope.organization, LeaderboardScope.classroom}:
-        reference_uuid = uuid.UUID(reference_id)
-    if scope == LeaderboardScope.organization and reference_uuid:
-        query = query.where(User.organization_id == reference_uuid)
-
-    query = query.order_by(desc(User.xp)).limit(limit)
+    reference_uuid = _reference_uuid(scope, reference_id)
+    query = _scoped(select(User), scope, reference_uuid)
+    query = query.order_by(desc(User.xp), desc(User.id)).limit(limit)
 
     result = await session.exec(query)
     users = result.all()
 
-    entries: List[LeaderboardEntry] = []
-    for index, user in enumerate(users, start=1):
-        entries.append(
-            LeaderboardEntry(
-                user_id=str(user.id),
-                display_name=user.display_name,
-                xp=user.xp,
-                streak=user.streak,
-                rank=index,
-                avatar=user.preferences.get("avatar"),
-            )
-        )
+    entries: List[LeaderboardEntry] = [
+        _entry(user, rank) for rank, user in enumerate(users, start=1)
+    ]
 
     snapshot = LeaderboardSnapshot(
         scope=scope,
@@ -49,14 +98,20 @@ async def build_leaderboard(
         data={"entries": [entry.model_dump() for entry in entries]},
     )
     session.add(snapshot)
-    await session.commit()
-    await session.refresh(snapshot)
+    await session.flush()
+    await on_commit(session, partial(invalidate_tag, "leaderboard"))
     return snapshot
 
 
+@cached(
+    key="leaderboard:latest:{scope}:{reference_id}",
+    ttl=30,
+    tags=["leaderboard"],
+    model=LeaderboardSnapshotRead,
+)
 async def latest_snapshot(
     session: AsyncSession, scope: LeaderboardScope, reference_id: str | None = None
-) -> LeaderboardSnapshot | None:
+) -> LeaderboardSnapshotRead | None:
     query = (
         select(LeaderboardSnapshot)
         .where(LeaderboardSnapshot.scope == scope)
@@ -66,3 +121,163 @@ async def latest_snapshot(
         query = query.where(LeaderboardSnapshot.reference_id == uuid.UUID(reference_id))
     result = await session.exec(query)
     return result.first()
+
+
+async def _boards_of(session: AsyncSession, user: User) -> list[str]:
+    boards = [GLOBAL_BOARD]
+    if user.organization_id:
+        boards.append(board_key(LeaderboardScope.organization.value, user.organization_id))
+    result = await session.exec(
+        select(ClassroomMembership.classroom_id).where(ClassroomMembership.user_id == user.id)
+    )
+    boards.extend(
+        board_key(LeaderboardScope.classroom.value, classroom_id)
+        for classroom_id in result.all()
+    )
+    return boards
+
+
+async def record_xp(session: AsyncSession, user: User, delta: int) -> None:
+    """Move the user up every board they are on once the XP grant commits."""
+
+    if not leaderboard_store.enabled or not delta:
+        return
+    boards = await _boards_of(session, user)
+    await on_commit(
+        session, partial(leaderboard_store.add_xp, user.id, delta, boards, profile_of(user))
+    )
+
+
+async def join_classroom_board(
+    session: AsyncSession, user: User, classroom_id: uuid.UUID
+) -> None:
+    if not leaderboard_store.enabled:
+        return
+    result = await session.exec(select(User.xp).where(User.id == user.id))
+    xp = result.first() or 0
+    key = board_key(LeaderboardScope.classroom.value, classroom_id)
+    await on_commit(session, partial(leaderboard_store.place, user.id, key, xp, profile_of(user)))
+
+
+async def refresh_profile(session: AsyncSession, user: User) -> None:
+    if leaderboard_store.enabled:
+        await on_commit(session, partial(leaderboard_store.set_profile, user.id, profile_of(user)))
+
+
+async def _entries(session: AsyncSession, standings: Sequence[Standing]) -> List[LeaderboardEntry]:
+    missing = [standing.user_id for standing in standings if standing.profile is None]
+    profiles: dict[uuid.UUID, Profile] = {}
+    if missing:
+        result = await session.exec(select(User).where(User.id.in_(missing)))
+        profiles = {user.id: profile_of(user) for user in result.all()}
+    entries: List[LeaderboardEntry] = []
+    for standing in standings:
+        profile = standing.profile or profiles.get(standing.user_id)
+        if profile is None:
+            # Deleted since the last reconciliation.
+            continue
+        entries.append(
+            LeaderboardEntry(
+                user_id=str(standing.user_id),
+                display_name=profile.display_name,
+                xp=standing.xp,
+                streak=profile.streak,
+                rank=standing.rank,
+                avatar=profile.avatar,
+            )
+        )
+    return entries
+
+
+async def top_entries(
+    session: AsyncSession,
+    scope: LeaderboardScope,
+    reference_id: str | None = None,
+    limit: int = 20,
+) -> List[LeaderboardEntry] | None:
+    """Live top ``limit`` from the sorted sets; ``None`` when they cannot serve it."""
+
+    key = _board(scope, _reference_uuid(scope, reference_id))
+    if key is None:
+        return None
+    standings = await leaderboard_store.top(key, limit)
+    if standings is None:
+        return None
+    return await _entries(session, standings)
+
+
+async def standing(
+    session: AsyncSession,
+    user: User,
+    scope: LeaderboardScope,
+    reference_id: str | None = None,
+    radius: int = 2,
+) -> LeaderboardStanding:
+    """The user's rank in ``scope`` with up to ``radius`` neighbours on each side."""
+
+    reference_uuid = _reference_uuid(scope, reference_id)
+    if scope == LeaderboardScope.organization and reference_uuid is None:
+        reference_uuid = user.organization_id
+    key = _board(scope, reference_uuid)
+    found = await leaderboard_store.around(key, user.id, radius) if key else None
+    if found is not None:
+        rank, standings = found
+        entries = await _entries(session, standings)
+        return LeaderboardStanding(scope=scope, rank=rank, entries=entries)
+
+    result = await session.exec(
+        _scoped(select(User.xp), scope, reference_uuid).where(User.id == user.id)
+    )
+    xp = result.first()
+    if xp is None:
+        return LeaderboardStanding(scope=scope, rank=None, entries=[])
+    result = await session.exec(
+        _scoped(select(func.count()).select_from(User), scope, reference_uuid).where(
+            or_(User.xp > xp, and_(User.xp == xp, User.id > user.id))
+        )
+    )
+    ahead = result.one()
+    start = max(0, ahead - radius)
+    result = await session.exec(
+        _scoped(select(User), scope, reference_uuid)
+        .order_by(desc(User.xp), desc(User.id))
+        .offset(start)
+        .limit(ahead - start + radius + 1)
+    )
+    entries = [_entry(row, rank) for rank, row in enumerate(result.all(), start=start + 1)]
+    return LeaderboardStanding(scope=scope, rank=ahead + 1, entries=entries)
+
+
+async def reconcile_leaderboards(session: AsyncSession) -> int:
+    """Rebuild every sorted set and the profiles hash from the users table."""
+
+    result = await session.exec(
+        select(
+            User.id,
+            User.xp,
+            User.organization_id,
+            User.display_name,
+            User.streak,
+            User.preferences,
+        )
+    )
+    boards: dict[str, dict[str, int]] = defaultdict(dict)
+    profiles: dict[str, str] = {}
+    xp: dict[uuid.UUID, int] = {}
+    for user_id, user_xp, organization_id, display_name, streak, preferences in result.all():
+        member = str(user_id)
+        xp[user_id] = user_xp
+        boards[GLOBAL_BOARD][member] = user_xp
+        if organization_id:
+            organization = board_key(LeaderboardScope.organization.value, organization_id)
+            boards[organization][member] = user_xp
+        profiles[member] = _profile(display_name, streak, preferences).dump()
+    result = await session.exec(
+        select(ClassroomMembership.classroom_id, ClassroomMembership.user_id)
+    )
+    for classroom_id, user_id in result.all():
+        if user_id in xp:
+            classroom = board_key(LeaderboardScope.classroom.value, classroom_id)
+            boards[classroom][str(user_id)] = xp[user_id]
+    await leaderboard_store.rebuild(boards, profiles)
+    return len(xp)
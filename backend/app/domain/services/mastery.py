@@ -0,0 +1,382 @@
+from __future__ import annotations
+
+import time
+import uuid
+from collections.abc import AsyncIterator, Iterable, Mapping, Sequence
+from dataclasses import dataclass
+from datetime import date
+from functools import partial
+from typing import Any
+
+import numpy as np
+from prometheus_client import Counter, Gauge
+from sqlalchemy import Float, bindparam, update
+from sqlalchemy.ext.asyncio import AsyncEngine
+from sqlmodel import select
+from sqlmodel.ext.asyncio.session import AsyncSession
+
+from app.core.config import settings
+from app.core.logging import get_logger
+from app.domain.models import (
+    AnatomySystem,
+    QuizAttempt,
+    QuizQuestion,
+    QuizSession,
+    UserSystemProgress,
+)
+from app.domain.services.calibration import DenseIndex
+from app.domain.services.catalog import content_catalog
+from app.domain.services.progress import insert_missing_progress, summary_cache_key
+from app.infrastructure.cache.decorators import invalidate_keys
+from app.infrastructure.db.unit_of_work import on_commit
+
+logger = get_logger(__name__)
+
+SYSTEMS = tuple(AnatomySystem)
+_SYSTEM_CODES = {system.value: code for code, system in enumerate(SYSTEMS)}
+
+# (a, b, c, d): mastery -> (a * mastery + b) / (c * mastery + d)
+Transform = tuple[float, float, float, float]
+IDENTITY: Transform = (1.0, 0.0, 0.0, 1.0)
+MasteryKey = tuple[uuid.UUID, AnatomySystem]
+
+MASTERY_PENDING = Gauge(
+    "mastery_updates_pending",
+    "(user, system) pairs with mastery updates waiting to be written by this worker",
+)
+MASTERY_WRITTEN = Counter(
+    "mastery_updates_total",
+    "user_system_progress rows updated by the coalescing mastery flush",
+)
+MASTERY_RECOMPUTE_THROUGHPUT = Gauge(
+    "mastery_recompute_rows_per_second",
+    "Attempts replayed per second by the last mastery recompute",
+)
+
+
+@dataclass(frozen=True, slots=True)
+class BktParameters:
+    p_init: float
+    p_transit: float
+    p_slip: float
+    p_guess: float
+
+    @classmethod
+    def from_settings(cls) -> BktParameters:
+        return cls(
+            p_init=settings.bkt_p_init,
+            p_transit=settings.bkt_p_transit,
+            p_slip=settings.bkt_p_slip,
+            p_guess=settings.bkt_p_guess,
+        )
+
+
+def step(params: BktParameters, mastery: Any, correct: Any) -> Any:
+    """One Bayesian Knowledge Tracing update; works on scalars and arrays alike."""
+
+    known = np.where(correct, mastery * (1 - params.p_slip), mastery * params.p_slip)
+    unknown = np.where(
+        correct, (1 - mastery) * params.p_guess, (1 - mastery) * (1 - params.p_guess)
+    )
+    posterior = known / (known + unknown)
+    return posterior + (1 - posterior) * params.p_transit
+
+
+def _normalise(transform: Transform) -> Transform:
+    scale = max(abs(value) for value in transform)
+    return tuple(value / scale for value in transform)  # type: ignore[return-value]
+
+
+def observation(params: BktParameters, is_correct: bool) -> Transform:
+    """``step`` for one answer as a linear-fractional map of the prior mastery."""
+
+    slip, guess, transit = params.p_slip, params.p_guess, params.p_transit
+    if is_correct:
+        a, b, c, d = 1 - slip, 0.0, 1 - slip - guess, guess
+    else:
+        a, b, c, d = slip, 0.0, slip + guess - 1, 1 - guess
+    # Learning afterwards is mastery -> (1 - transit) * mastery + transit.
+    return _normalise(((1 - transit) * a + transit * c, (1 - transit) * b + transit * d, c, d))
+
+
+def compose(later: Transform, earlier: Transform) -> Transform:
+    a1, b1, c1, d1 = later
+    a2, b2, c2, d2 = earlier
+    return _normalise(
+        (a1 * a2 + b1 * c2, a1 * b2 + b1 * d2, c1 * a2 + d1 * c2, c1 * b2 + d1 * d2)
+    )
+
+
+def apply(transform: Transform, mastery: float) -> float:
+    a, b, c, d = transform
+    return (a * mastery + b) / (c * mastery + d)
+
+
+def _system(value: str | None) -> AnatomySystem | None:
+    try:
+        return AnatomySystem(value) if value else None
+    except ValueError:
+        return None
+
+
+class MasteryBuffer:
+    """Per-worker mastery updates not yet written, one transform per (user, system).
+
+    Every answer maps the stored mastery through a linear-fractional
+    function and those compose, so any run of answers folds into four
+    numbers. The flush applies them with one relative UPDATE per row,
+    whatever value the row holds by then.
+    """
+
+    def __init__(self) -> None:
+        self._pending: dict[MasteryKey, tuple[Transform, date]] = {}
+
+    def __len__(self) -> int:
+        return len(self._pending)
+
+    def pending(self, key: MasteryKey) -> Transform:
+        entry = self._pending.get(key)
+        return entry[0] if entry else IDENTITY
+
+    def _fold(self, key: MasteryKey, later: Transform, earlier: Transform, day: date) -> None:
+        current = self._pending.get(key)
+        self._pending[key] = (compose(later, earlier), max(day, current[1]) if current else day)
+
+    async def merge(self, changes: Mapping[MasteryKey, tuple[Transform, date]]) -> None:
+        for key, (transform, day) in changes.items():
+            self._fold(key, transform, self.pending(key), day)
+        MASTERY_PENDING.set(len(self._pending))
+
+    def take(self) -> dict[MasteryKey, tuple[Transform, date]]:
+        taken, self._pending = self._pending, {}
+        MASTERY_PENDING.set(0)
+        return taken
+
+    async def restore(self, taken: Mapping[MasteryKey, tuple[Transform, date]]) -> None:
+        """Put back changes that failed to write, ahead of anything merged since."""
+
+        for key, (transform, day) in taken.items():
+            self._fold(key, self.pending(key), transform, day)
+        MASTERY_PENDING.set(len(self._pending))
+
+
+mastery_updates = MasteryBuffer()
+
+
+async def trace_attempts(
+    session: AsyncSession,
+    user_id: uuid.UUID,
+    system: str | None,
+    attempts: Sequence[QuizAttempt],
+) -> None:
+    """Fold ``attempts`` into the user's mastery of each question's system.
+
+    The changes join :data:`mastery_updates` once the caller's transaction
+    commits. Questions the catalog does not know count for the session's
+    system.
+    """
+
+    if not attempts:
+        return
+    catalog = await content_catalog.questions(session)
+    params = BktParameters.from_settings()
+    today = date.today()
+    changes: dict[MasteryKey, tuple[Transform, date]] = {}
+    for attempt in sorted(attempts, key=lambda attempt: attempt.created_at):
+        entry = catalog.by_id.get(attempt.question_id)
+        question_system = _system(entry.anatomy_system if entry else system)
+        if question_system is None:
+            continue
+        key = (user_id, question_system)
+        earlier = changes.get(key, (IDENTITY, today))[0]
+        changes[key] = (compose(observation(params, attempt.is_correct), earlier), today)
+    if changes:
+        await on_commit(session, partial(mastery_updates.merge, changes))
+
+
+async def _ensure_rows(session: AsyncSession, keys: Sequence[MasteryKey], p_init: float) -> None:
+    users = sorted({user_id for user_id, _ in keys})
+    existing: set[MasteryKey] = set()
+    for start in range(0, len(users), 500):
+        result = await session.exec(
+            select(UserSystemProgress.user_id, UserSystemProgress.system).where(
+                UserSystemProgress.user_id.in_(users[start : start + 500])
+            )
+        )
+        existing.update((user_id, system) for user_id, system in result.all())
+    await insert_missing_progress(session, [key for key in keys if key not in existing], p_init)
+
+
+def _key_order(key: MasteryKey) -> tuple[str, str]:
+    return str(key[0]), key[1].value
+
+
+async def write_mastery(
+    session: AsyncSession, changes: Mapping[MasteryKey, tuple[Transform, date]]
+) -> None:
+    """Apply buffered transforms in key order, so concurrent flushes cannot deadlock."""
+
+    if not changes:
+        return
+    keys = sorted(changes, key=_key_order)
+    await _ensure_rows(session, keys, settings.bkt_p_init)
+    table = UserSystemProgress.__table__
+    mastery = table.c.completion_rate
+    a, b, c, d = (bindparam(name, type_=Float) for name in "abcd")
+    await session.exec(
+        update(table)
+        .where(table.c.user_id == bindparam("key_user"), table.c.system == bindparam("key_system"))
+        .values(
+            completion_rate=(a * mastery + b) / (c * mastery + d),
+            last_interaction=bindparam("day"),
+        ),
+        params=[
+            dict(
+                zip("abcd", changes[key][0], strict=True),
+                key_user=key[0],
+                key_system=key[1],
+                day=changes[key][1],
+            )
+            for key in keys
+        ],
+    )
+    MASTERY_WRITTEN.inc(len(keys))
+    summary_keys = sorted({summary_cache_key(user_id) for user_id, _ in keys})
+    await on_commit(session, partial(invalidate_keys, *summary_keys))
+
+
+@dataclass(frozen=True, slots=True)
+class RecomputeReport:
+    rows: int
+    pairs: int
+    seconds: float
+
+    @property
+    def rows_per_second(self) -> float:
+        return self.rows / self.seconds if self.seconds > 0 else 0.0
+
+
+class MasteryTracer:
+    """Replays attempts in time order for every (user, system) pair at once."""
+
+    def __init__(self, params: BktParameters) -> None:
+        self.params = params
+        self.users = DenseIndex()
+        self.rows = 0
+        self._mastery = np.zeros(0)
+        self._seen = np.zeros(0, dtype=np.bool_)
+
+    def observe(self, users: np.ndarray, systems: np.ndarray, correct: np.ndarray) -> None:
+        """Apply one chunk; ``systems`` holds indexes into :data:`SYSTEMS`, ``-1`` to skip."""
+
+        keep = systems >= 0
+        if not keep.any():
+            return
+        user = self.users.lookup(users[keep], grow=True)
+        pair = user * len(SYSTEMS) + systems[keep]
+        answers = correct[keep]
+        size = len(self.users) * len(SYSTEMS)
+        if self._mastery.size < size:
+            grow = size - self._mastery.size
+            self._mastery = np.pad(self._mastery, (0, grow), constant_values=self.params.p_init)
+            self._seen = np.pad(self._seen, (0, grow))
+
+        # A pair can answer several times in one chunk: round k applies the
+        # k-th answer of every pair, so each round touches a pair at most once.
+        order = np.argsort(pair, kind="stable")
+        grouped = pair[order]
+        starts = np.flatnonzero(np.r_[True, grouped[1:] != grouped[:-1]])
+        rank = np.arange(grouped.size) - np.repeat(starts, np.diff(np.r_[starts, grouped.size]))
+        by_round = order[np.argsort(rank, kind="stable")]
+        offset = 0
+        for count in np.bincount(rank):
+            rows = by_round[offset : offset + count]
+            offset += count
+            self._mastery[pair[rows]] = step(self.params, self._mastery[pair[rows]], answers[rows])
+        self._seen[pair] = True
+        self.rows += answers.size
+
+    def results(self) -> Iterable[tuple[MasteryKey, float]]:
+        users = self.users.keys()
+        for index in np.flatnonzero(self._seen).tolist():
+            user, code = divmod(index, len(SYSTEMS))
+            yield (users[user], SYSTEMS[code]), float(self._mastery[index])
+
+
+def _columns(rows: Sequence[Any]) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+    count = len(rows)
+    return (
+        np.fromiter((row[0].bytes for row in rows), dtype="S16", count=count),
+        np.fromiter((_SYSTEM_CODES.get(row[1], -1) for row in rows), dtype=np.int64, count=count),
+        np.fromiter((row[2] for row in rows), dtype=np.bool_, count=count),
+    )
+
+
+async def _stream_history(
+    source: AsyncEngine, chunk_rows: int
+) -> AsyncIterator[tuple[np.ndarray, np.ndarray, np.ndarray]]:
+    statement = (
+        select(QuizSession.user_id, QuizQuestion.anatomy_system, QuizAttempt.is_correct)
+        .join(QuizSession, QuizSession.id == QuizAttempt.session_id)
+        .join(QuizQuestion, QuizQuestion.id == QuizAttempt.question_id)
+        .order_by(QuizAttempt.created_at)
+        .execution_options(yield_per=chunk_rows)
+    )
+    async with source.connect() as conn:
+        result = await conn.stream(statement)
+        async for rows in result.partitions():
+            yield _columns(rows)
+
+
+async def recompute_mastery(
+    source: AsyncEngine,
+    session: AsyncSession,
+    params: BktParameters | None = None,
+    chunk_rows: int | None = None,
+) -> RecomputeReport:
+    """Rebuild every user's mastery from the whole attempt history.
+
+    Meant for after a change of BKT parameters. Pairs without attempts go
+    back to ``p_init``. Answers graded while it runs may be counted twice,
+    so run it off-peak. The caller commits ``session``.
+    """
+
+    params = params or BktParameters.from_settings()
+    chunk_rows = chunk_rows or settings.question_calibration_chunk_rows
+    started = time.perf_counter()
+    tracer = MasteryTracer(params)
+    async for columns in _stream_history(source, chunk_rows):
+        tracer.observe(*columns)
+    results = list(tracer.results())
+
+    table = UserSystemProgress.__table__
+    await session.exec(update(table).values(completion_rate=params.p_init))
+    keys = sorted((key for key, _ in results), key=_key_order)
+    await _ensure_rows(session, keys, params.p_init)
+    statement = (
+        update(table)
+        .where(table.c.user_id == bindparam("key_user"), table.c.system == bindparam("key_system"))
+        .values(completion_rate=bindparam("mastery", type_=Float))
+    )
+    for start in range(0, len(results), chunk_rows):
+        await session.exec(
+            statement,
+            params=[
+                {"key_user": user_id, "key_system": system, "mastery": mastery}
+                for (user_id, system), mastery in results[start : start + chunk_rows]
+            ],
+        )
+    await session.flush()
+
+    report = RecomputeReport(
+        rows=tracer.rows, pairs=len(results), seconds=time.perf_counter() - started
+    )
+    MASTERY_RECOMPUTE_THROUGHPUT.set(report.rows_per_second)
+    logger.info(
+        "mastery_recompute_finished",
+        rows=report.rows,
+        pairs=report.pairs,
+        seconds=round(report.seconds, 2),
+        rows_per_second=round(report.rows_per_second),
+    )
+    return report
@@ -2,6 +2,7 @@ from __future__ import annotations
 
 import uuid
 from datetime import datetime, timedelta
+from functools import partial
 from typing import List
 
 from sqlalchemy.orm import selectinload
@@ -9,6 +10,10 @@ from sqlmodel import select
 from sqlmodel.ext.asyncio.session import AsyncSession
 
 from app.domain.models import Mission, MissionFrequency, MissionProgress, MissionProgressStatus, User
+from app.domain.services import users as user_service
+from app.domain.services.catalog import MISSIONS, bump_content_version, content_catalog
+from app.infrastructure.cache.decorators import invalidate_keys
+from app.infrastructure.db.unit_of_work import on_commit
 
 RESET_DELTA = {
     MissionFrequency.daily: timedelta(days=1),
@@ -16,7 +21,13 @@ RESET_DELTA = {
 }
 
 
-async def get_active_missions(session: AsyncSession, user: User) -> List[MissionProgress]:
+def summary_cache_key(user_id: uuid.UUID) -> str:
+    return f"summary:{user_id}:missions"
+
+
+async def list_missions(session: AsyncSession, user: User) -> List[MissionProgress]:
+    """Read-only view of the user's missions; expired ones are not reset."""
+
     result = await session.exec(
         select(MissionProgress)
         .where(MissionProgress.user_id == user.id)
@@ -24,16 +35,29 @@ async def get_active_missions(session: AsyncSession, user: User) -> List[Mission
         .join(Mission)
         .order_by(Mission.title)
     )
-    missions = result.all()
+    return result.all()
+
 
+def has_expired(missions: List[MissionProgress]) -> bool:
     now = datetime.utcnow()
+    return any(progress.expires_at and progress.expires_at < now for progress in missions)
+
+
+async def get_active_missions(session: AsyncSession, user: User) -> List[MissionProgress]:
+    missions = await list_missions(session, user)
+
+    now = datetime.utcnow()
+    reset = False
     for progress in missions:
         if progress.expires_at and progress.expires_at < now:
             progress.progress = 0
             progress.status = MissionProgressStatus.pending
             progress.expires_at = now + RESET_DELTA[progress.mission.frequency]
             session.add(progress)
-    await session.commit()
+            reset = True
+    if reset:
+        await session.flush()
+        await on_commit(session, partial(invalidate_keys, summary_cache_key(user.id)))
     return missions
 
 
@@ -71,15 +95,15 @@ async def seed_default_missions(session: AsyncSession, user: User) -> List[Missi
 
     mission_progresses: List[MissionProgress] = []
     now = datetime.utcnow()
+    catalog = await content_catalog.missions(session)
+    created = False
     for mission_data in defaults:
-        existing_mission = await session.exec(
-            select(Mission).where(Mission.title == mission_data["title"])
-        )
-        mission = existing_mission.first()
+        mission = catalog.by_title.get(mission_data["title"])
         if not mission:
             mission = Mission(**mission_data)
             session.add(mission)
             await session.flush()
+            created = True
         progress = MissionProgress(
             mission_id=mission.id,
             user_id=user.id,
@@ -87,9 +111,10 @@ async def seed_default_missions(session: AsyncSession, user: User) -> List[Missi
         )
         session.add(progress)
         mission_progresses.append(progress)
-    await session.commit()
-    for progress in mission_progresses:
-        await session.refresh(progress)
+    await session.flush()
+    if created:
+        await bump_content_version(session, MISSIONS)
+    await on_commit(session, partial(invalidate_keys, summary_cache_key(user.id)))
     return mission_progresses
 
 
@@ -105,11 +130,14 @@ async def increment_progress(
     if not progress:
         raise ValueError("Mission not assigned to user")
 
+    was_completed = progress.status == MissionProgressStatus.completed
     progress.progress = min(progress.progress + increment, progress.mission.target)
     if progress.progress >= progress.mission.target:
         progress.status = MissionProgressStatus.completed
     progress.touch()
     session.add(progress)
-    await session.commit()
-    await session.refresh(progress)
+    await session.flush()
+    if progress.status == MissionProgressStatus.completed and not was_completed:
+        await user_service.increment_user_xp(session, user, progress.mission.xp_reward)
+    await on_commit(session, partial(invalidate_keys, summary_cache_key(user.id)))
     return progress
@@ -1,40 +1,72 @@
 from __future__ import annotations
 
-from datetime import date
+import uuid
+from collections.abc import Iterable
+from datetime import datetime
+from functools import partial
 
+from sqlalchemy.dialects import mysql, postgresql, sqlite
 from sqlmodel import select
 from sqlmodel.ext.asyncio.session import AsyncSession
 
+from app.core.config import settings
 from app.domain.models import AnatomySystem, User, UserSystemProgress
+from app.infrastructure.cache.decorators import invalidate_keys
+from app.infrastructure.db.unit_of_work import on_commit
 
 
-async def ensure_system_progress(session: AsyncSession, user: User) -> None:
-    result = await session.exec(select(UserSystemProgress).where(UserSystemProgress.user_id == user.id))
-    existing = {record.system for record in result.all()}
-    for system in AnatomySystem:
-        if system not in existing:
-            progress = UserSystemProgress(user_id=user.id, system=system, completion_rate=0.0)
-            session.add(progress)
-    await session.commit()
+def summary_cache_key(user_id: uuid.UUID) -> str:
+    return f"summary:{user_id}:systems"
+
+
+async def insert_missing_progress(
+    session: AsyncSession,
+    keys: Iterable[tuple[uuid.UUID, AnatomySystem]],
+    completion_rate: float,
+) -> None:
+    """Insert ``(user_id, system)`` rows, skipping pairs that already exist.
 
+    Relies on ``uq_user_system_progress_user_system``, so a concurrent
+    writer inserting the same pair is not an error.
+    """
 
-async def update_system_progress(
-    session: AsyncSession, user: User, system: AnatomySystem, delta: float
-) -> UserSystemProgress:
+    now = datetime.utcnow()
+    rows = [
+        {
+            "id": uuid.uuid4(),
+            "created_at": now,
+            "updated_at": now,
+            "user_id": user_id,
+            "system": system,
+            "completion_rate": completion_rate,
+        }
+        for user_id, system in keys
+    ]
+    if not rows:
+        return
+    await session.flush()  # the users being referenced may still be pending
+    table = UserSystemProgress.__table__
+    dialect = (await session.connection()).dialect.name
+    if dialect == "mysql":
+        statement = mysql.insert(table)
+        statement = statement.on_duplicate_key_update(user_id=statement.inserted.user_id)
+    else:
+        insert = postgresql.insert if dialect == "postgresql" else sqlite.insert
+        statement = insert(table).on_conflict_do_nothing(index_elements=["user_id", "system"])
+    await session.exec(statement, params=rows)
+
+
+async def ensure_system_progress(session: AsyncSession, user: User) -> None:
     result = await session.exec(
-        select(UserSystemProgress).where(
-            UserSystemProgress.user_id == user.id, UserSystemProgress.system == system
-        )
+        select(UserSystemProgress.system).where(UserSystemProgress.user_id == user.id)
+    )
+    existing = set(result.all())
+    await insert_missing_progress(
+        session,
+        [(user.id, system) for system in AnatomySystem if system not in existing],
+        settings.bkt_p_init,
     )
-    record = result.first()
-    if not record:
-        record = UserSystemProgress(user_id=user.id, system=system, completion_rate=0.0)
-    record.completion_rate = max(0.0, min(1.0, record.completion_rate + delta))
-    record.last_interaction = date.today()
-    session.add(record)
-    await session.commit()
-    await session.refresh(record)
-    return record
+    await on_commit(session, partial(invalidate_keys, summary_cache_key(user.id)))
 
 
 async def get_system_progress(session: AsyncSession, user: User) -> list[UserSystemProgress]:
@@ -0,0 +1,42 @@
+from __future__ import annotations
+
+import bisect
+import itertools
+import random
+import uuid
+from collections.abc import Hashable, Iterable, Mapping
+from typing import TypeVar
+
+Key = TypeVar("Key", bound=Hashable)
+
+
+def pack_question_ids(rows: Iterable[tuple[uuid.UUID, Key]]) -> dict[Key, bytes]:
+    """Question ids grouped by bucket key, packed 16 bytes each.
+
+    One ``bytes`` object per bucket keeps a million ids at about 16 MB.
+    """
+
+    parts: dict[Key, list[bytes]] = {}
+    for question_id, key in rows:
+        parts.setdefault(key, []).append(question_id.bytes)
+    return {key: b"".join(ids) for key, ids in parts.items()}
+
+
+def bucket_size(buckets: Mapping[Key, bytes], key: Key) -> int:
+    return len(buckets.get(key, b"")) // 16
+
+
+def sample_question_ids(
+    buckets: Mapping[Key, bytes], keys: Iterable[Key], k: int
+) -> list[uuid.UUID]:
+    """``k`` distinct ids drawn uniformly from the given buckets, in O(k log buckets)."""
+
+    matching = [buckets[key] for key in keys if key in buckets]
+    ends = list(itertools.accumulate(len(ids) // 16 for ids in matching))
+    total = ends[-1] if ends else 0
+    sampled = []
+    for position in random.sample(range(total), min(k, total)):
+        index = bisect.bisect_right(ends, position)
+        offset = (position - (ends[index - 1] if index else 0)) * 16
+        sampled.append(uuid.UUID(bytes=matching[index][offset : offset + 16]))
+    return sampled
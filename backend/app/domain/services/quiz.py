@@ -1,22 +1,37 @@
 from __future__ import annotations
 
 import uuid
+from collections.abc import Iterable, Sequence
+from datetime import UTC, datetime
+from functools import partial
 
-from sqlalchemy import func
-from sqlalchemy.orm import selectinload
+from redis.exceptions import RedisError
 from sqlmodel import select
 from sqlmodel.ext.asyncio.session import AsyncSession
 
+from app.core.config import settings
 from app.domain.models import (
     DifficultyLevel,
     QuestionType,
     QuizAttempt,
     QuizMode,
     QuizOption,
-    QuizQuestion,
     QuizSession,
     User,
 )
+from app.domain.schemas.quiz import QuizAnswer
+from app.domain.services import elo as elo_service
+from app.domain.services import mastery as mastery_service
+from app.domain.services import srs as srs_service
+from app.domain.services.catalog import QuestionCatalog, QuestionEntry, content_catalog
+from app.infrastructure.cache.quiz_state import (
+    HotAttempt,
+    QuizState,
+    QuizStateBusy,
+    quiz_state_store,
+)
+from app.infrastructure.db.unit_of_work import on_commit, on_rollback
+from app.infrastructure.db.write_behind import attempt_write_behind
 
 
 async def create_session(
@@ -26,37 +41,116 @@ async def create_session(
     system_filter: str | None = None,
     difficulty: DifficultyLevel | None = None,
     limit: int = 10,
-) -> tuple[QuizSession, list[QuizQuestion]]:
+) -> tuple[QuizSession, list[QuestionEntry]]:
+    catalog = await content_catalog.questions(session)
+    if mode == QuizMode.srs and settings.feature_flag_srs:
+        questions = await _review_questions(
+            session, user, catalog, system_filter, difficulty, limit
+        )
+    else:
+        questions = catalog.sample_near(system_filter, difficulty, user.elo_rating, limit)
+    if not questions:
+        raise ValueError("No questions available for the selected filters")
+
     quiz_session = QuizSession(user_id=user.id, mode=mode, system=system_filter)
     session.add(quiz_session)
     await session.flush()
+    await quiz_state_store.open(
+        quiz_session.id,
+        user.id,
+        system_filter,
+        {
+            question.id: (
+                next((option.id for option in question.options if option.is_correct), None),
+                frozenset(option.id for option in question.options),
+            )
+            for question in questions
+        },
+    )
+    return quiz_session, questions
 
-    query = select(QuizQuestion).options(selectinload(QuizQuestion.options))
-    if system_filter:
-        query = query.where(QuizQuestion.anatomy_system == system_filter)
-    if difficulty:
-        query = query.where(QuizQuestion.difficulty == difficulty)
-    query = query.order_by(func.random()).limit(limit)
-
-    result = await session.exec(query)
-    questions = result.all()
 
-    if not questions:
-        raise ValueError("No questions available for the selected filters")
+async def _review_questions(
+    session: AsyncSession,
+    user: User,
+    catalog: QuestionCatalog,
+    system_filter: str | None,
+    difficulty: DifficultyLevel | None,
+    limit: int,
+) -> list[QuestionEntry]:
+    """Due reviews first, most overdue first; new questions fill the remaining slots."""
 
-    quiz_session.touch()
-    session.add(quiz_session)
-    await session.commit()
-    await session.refresh(quiz_session)
-    return quiz_session, questions
+    filtered = system_filter is not None or difficulty is not None
+    due_ids = await srs_service.due_question_ids(
+        session, user.id, datetime.utcnow(), limit * 4 if filtered else limit
+    )
+    questions = [
+        entry
+        for entry in (catalog.by_id.get(question_id) for question_id in due_ids)
+        if entry is not None
+        and (system_filter is None or entry.anatomy_system == system_filter)
+        and (difficulty is None or entry.difficulty == difficulty)
+    ][:limit]
+    if len(questions) < limit:
+        chosen = {entry.id for entry in questions}
+        extra = catalog.sample_near(system_filter, difficulty, user.elo_rating, limit)
+        questions += [entry for entry in extra if entry.id not in chosen][: limit - len(questions)]
+    return questions
 
 
 async def get_session(session: AsyncSession, session_id: uuid.UUID) -> QuizSession | None:
     result = await session.exec(select(QuizSession).where(QuizSession.id == session_id))
-    quiz_session = result.first()
-    if quiz_session:
-        await session.refresh(quiz_session)
-    return quiz_session
+    return result.first()
+
+
+async def answer(
+    session: AsyncSession,
+    user: User,
+    session_id: uuid.UUID,
+    question_id: uuid.UUID,
+    option_id: uuid.UUID,
+) -> tuple[QuizAttempt | HotAttempt, str | None] | None:
+    """Grade one answer; returns the attempt and the session's system, or ``None``.
+
+    Open sessions are graded against their answer key in the state store and
+    the attempt stays there until the session is completed or expires. A
+    session without hot state (Redis off or down, expired) is loaded and the
+    attempt is written straight away.
+    """
+
+    state = await quiz_state_store.get(session_id)
+    if state is not None:
+        if state.user_id != user.id:
+            return None
+        attempt = await record_answer(state, question_id, option_id)
+        if attempt is not None:
+            return attempt, state.system
+
+    quiz_session = await get_session(session, session_id)
+    if not quiz_session or quiz_session.user_id != user.id:
+        return None
+    attempt = await submit_answer(session, quiz_session, question_id, option_id)
+    return attempt, quiz_session.system
+
+
+async def record_answer(
+    state: QuizState, question_id: uuid.UUID, option_id: uuid.UUID
+) -> HotAttempt | None:
+    """Keep the attempt in hot state; ``None`` when the session was closed meanwhile."""
+
+    is_correct = state.grade(question_id, option_id)
+    if is_correct is None:
+        raise ValueError("Invalid option for question")
+    attempt = HotAttempt(
+        id=uuid.uuid4(),
+        question_id=question_id,
+        selected_option_id=option_id,
+        is_correct=is_correct,
+        answered_at=datetime.utcnow(),
+    )
+    if not await quiz_state_store.record(state, attempt):
+        return None
+    return attempt
 
 
 async def submit_answer(
@@ -65,37 +159,188 @@ async def submit_answer(
     question_id: uuid.UUID,
     option_id: uuid.UUID,
 ) -> QuizAttempt:
-    result = await session.exec(
-        select(QuizOption).where(QuizOption.id == option_id, QuizOption.question_id == question_id)
-    )
-    option = result.first()
-    if not option:
+    key = await _answer_key(session, quiz_session.id, [question_id])
+    is_correct = key.get(question_id, {}).get(option_id)
+    if is_correct is None:
         raise ValueError("Invalid option for question")
 
     attempt = QuizAttempt(
         session_id=quiz_session.id,
         question_id=question_id,
         selected_option_id=option_id,
-        is_correct=option.is_correct,
+        is_correct=is_correct,
     )
-    session.add(attempt)
+    await _record_attempts(session, quiz_session, [attempt])
+    return attempt
+
 
-    if option.is_correct:
-        quiz_session.score += 1
+async def _record_attempts(
+    session: AsyncSession, quiz_session: QuizSession, attempts: Sequence[QuizAttempt]
+) -> None:
+    """Queue the attempt rows, add them to the score, then feed SRS, Elo and mastery."""
+
+    await attempt_write_behind.add(session, attempts)
+    quiz_session.score += sum(attempt.is_correct for attempt in attempts)
     quiz_session.touch()
     session.add(quiz_session)
+    await srs_service.record_reviews(
+        session,
+        quiz_session.user_id,
+        (
+            srs_service.Review(attempt.question_id, attempt.is_correct, attempt.created_at)
+            for attempt in attempts
+        ),
+    )
+    await elo_service.rate_attempts(session, quiz_session.user_id, attempts)
+    await mastery_service.trace_attempts(
+        session, quiz_session.user_id, quiz_session.system, attempts
+    )
+    await session.flush()
 
-    await session.commit()
-    await session.refresh(attempt)
-    await session.refresh(quiz_session)
-    return attempt
+
+async def _answer_key(
+    session: AsyncSession, session_id: uuid.UUID, question_ids: Iterable[uuid.UUID]
+) -> dict[uuid.UUID, dict[uuid.UUID, bool]]:
+    """``{question_id: {option_id: is_correct}}`` for the given questions.
+
+    Read from the session's hot state when it is open, else from the catalog.
+    Questions the catalog does not know yet (written by another worker since
+    the last reload) are read in one query.
+    """
+
+    state = await quiz_state_store.get(session_id)
+    catalog = await content_catalog.questions(session)
+    key: dict[uuid.UUID, dict[uuid.UUID, bool]] = {}
+    missing = []
+    for question_id in question_ids:
+        served = state.key.get(question_id) if state is not None else None
+        entry = catalog.by_id.get(question_id)
+        if served is not None:
+            correct, options = served
+            key[question_id] = {option_id: option_id == correct for option_id in options}
+        elif entry is None:
+            missing.append(question_id)
+        else:
+            key[question_id] = {option.id: option.is_correct for option in entry.options}
+    if missing:
+        result = await session.exec(select(QuizOption).where(QuizOption.question_id.in_(missing)))
+        for option in result.all():
+            key.setdefault(option.question_id, {})[option.id] = option.is_correct
+    return key
+
+
+def _as_utc(moment: datetime) -> datetime:
+    if moment.tzinfo is not None:
+        moment = moment.astimezone(UTC).replace(tzinfo=None)
+    return moment
+
+
+async def submit_answers(
+    session: AsyncSession, quiz_session: QuizSession, answers: Sequence[QuizAnswer]
+) -> list[QuizAttempt]:
+    """Grade a whole batch against one answer key and queue the attempts as one bulk insert.
+
+    Every answer is checked before anything is written, so a single bad
+    option rejects the batch. Client timestamps keep their order but are
+    clamped between the session start and now, since device clocks drift.
+    """
+
+    key = await _answer_key(session, quiz_session.id, {answer.question_id for answer in answers})
+    now = datetime.utcnow()
+    attempts = []
+    for answer in answers:
+        is_correct = key.get(answer.question_id, {}).get(answer.option_id)
+        if is_correct is None:
+            raise ValueError("Invalid option for question")
+        answered_at = min(max(_as_utc(answer.answered_at), quiz_session.created_at), now)
+        attempts.append(
+            QuizAttempt(
+                session_id=quiz_session.id,
+                question_id=answer.question_id,
+                selected_option_id=answer.option_id,
+                is_correct=is_correct,
+                created_at=answered_at,
+                updated_at=now,
+            )
+        )
+
+    await _record_attempts(session, quiz_session, attempts)
+    return attempts
+
+
+async def persist_attempts(
+    session: AsyncSession, quiz_session: QuizSession, attempts: Sequence[HotAttempt]
+) -> None:
+    """Record attempts drained from the state store, as one batch."""
+
+    if not attempts:
+        return
+    await _record_attempts(
+        session,
+        quiz_session,
+        [
+            QuizAttempt(
+                id=attempt.id,
+                session_id=quiz_session.id,
+                question_id=attempt.question_id,
+                selected_option_id=attempt.selected_option_id,
+                is_correct=attempt.is_correct,
+                created_at=attempt.answered_at,
+                updated_at=attempt.answered_at,
+            )
+            for attempt in attempts
+        ],
+    )
+
+
+async def flush_sessions(session: AsyncSession, session_ids: Iterable[uuid.UUID]) -> int:
+    """Persist the hot state of claimed sessions that expired or are being shut down.
+
+    The hot state is dropped once ``session`` commits; on failure the caller
+    releases the claims so the next run retries them.
+    """
+
+    flushed = 0
+    for session_id in session_ids:
+        attempts = await quiz_state_store.drain(session_id)
+        quiz_session = await get_session(session, session_id)
+        if quiz_session is not None:
+            await persist_attempts(session, quiz_session, attempts)
+            flushed += 1
+        await on_commit(session, partial(quiz_state_store.close, session_id))
+    return flushed
+
+
+async def _claim_hot_attempts(session: AsyncSession, session_id: uuid.UUID) -> list[HotAttempt]:
+    """Claim and drain an open session; its claim is released if ``session`` rolls back.
+
+    Raises :class:`QuizStateBusy` when another worker is persisting the
+    session or Redis fails, so the session is never completed while its
+    attempts are still in hot state.
+    """
+
+    try:
+        if not await quiz_state_store.claim(session_id):
+            raise QuizStateBusy(quiz_state_store.retry_after)
+    except RedisError as exc:
+        raise QuizStateBusy(quiz_state_store.retry_after) from exc
+    try:
+        attempts = await quiz_state_store.drain(session_id)
+    except RedisError as exc:
+        await quiz_state_store.release(session_id)
+        raise QuizStateBusy(quiz_state_store.retry_after) from exc
+    await on_rollback(session, partial(quiz_state_store.release, session_id))
+    return attempts
 
 
 async def complete_session(session: AsyncSession, quiz_session: QuizSession, duration_seconds: int) -> QuizSession:
+    attempts = await _claim_hot_attempts(session, quiz_session.id)
+    await persist_attempts(session, quiz_session, attempts)
+    # Queued after the attempts' journal write, so the hot copy outlives it.
+    await on_commit(session, partial(quiz_state_store.close, quiz_session.id))
     quiz_session.duration_seconds = duration_seconds
     quiz_session.completed = True
     quiz_session.touch()
     session.add(quiz_session)
-    await session.commit()
-    await session.refresh(quiz_session)
+    await session.flush()
     return quiz_session
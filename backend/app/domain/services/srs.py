@@ -0,0 +1,92 @@
+from __future__ import annotations
+
+import uuid
+from collections.abc import Iterable
+from dataclasses import dataclass
+from datetime import datetime, timedelta
+
+from sqlmodel import select
+from sqlmodel.ext.asyncio.session import AsyncSession
+
+from app.core.config import settings
+from app.domain.models import ReviewState
+
+MIN_EASE = 1.3
+RELEARN_DELAY = timedelta(minutes=10)
+
+
+@dataclass(frozen=True, slots=True)
+class Review:
+    question_id: uuid.UUID
+    is_correct: bool
+    answered_at: datetime
+
+
+def schedule(state: ReviewState, is_correct: bool, now: datetime) -> None:
+    """Apply one SM-2 review to ``state``.
+
+    Answers are right or wrong, so they map to SM-2 quality 4 and 1. A wrong
+    answer resets the repetition count and brings the question back after
+    ``RELEARN_DELAY`` instead of a full day.
+    """
+
+    quality = 4 if is_correct else 1
+    state.ease = max(MIN_EASE, state.ease + 0.1 - (5 - quality) * (0.08 + (5 - quality) * 0.02))
+    if is_correct:
+        state.repetitions += 1
+        if state.repetitions == 1:
+            state.interval_days = 1.0
+        elif state.repetitions == 2:
+            state.interval_days = 6.0
+        else:
+            state.interval_days = round(state.interval_days * state.ease, 2)
+        state.due_at = now + timedelta(days=state.interval_days)
+    else:
+        state.repetitions = 0
+        state.lapses += 1
+        state.interval_days = 0.0
+        state.due_at = now + RELEARN_DELAY
+    state.last_reviewed_at = now
+    state.touch()
+
+
+async def due_question_ids(
+    session: AsyncSession, user_id: uuid.UUID, now: datetime, limit: int
+) -> list[uuid.UUID]:
+    """Most overdue questions first; one range scan of ``ix_review_states_user_due``."""
+
+    result = await session.exec(
+        select(ReviewState.question_id)
+        .where(ReviewState.user_id == user_id, ReviewState.due_at <= now)
+        .order_by(ReviewState.due_at)
+        .limit(limit)
+    )
+    return list(result.all())
+
+
+async def record_reviews(
+    session: AsyncSession, user_id: uuid.UUID, reviews: Iterable[Review]
+) -> None:
+    """Update the schedule of every reviewed question with one read and one flush."""
+
+    if not settings.feature_flag_srs:
+        return
+    reviews = sorted(reviews, key=lambda review: review.answered_at)
+    if not reviews:
+        return
+    result = await session.exec(
+        select(ReviewState).where(
+            ReviewState.user_id == user_id,
+            ReviewState.question_id.in_({review.question_id for review in reviews}),
+        )
+    )
+    states = {state.question_id: state for state in result.all()}
+    for review in reviews:
+        state = states.get(review.question_id)
+        if state is None:
+            state = states[review.question_id] = ReviewState(
+                user_id=user_id, question_id=review.question_id
+            )
+        schedule(state, review.is_correct, review.answered_at)
+    session.add_all(states.values())
+    await session.flush()
@@ -0,0 +1,78 @@
+from __future__ import annotations
+
+from dataclasses import dataclass
+from typing import Any
+
+from redis.exceptions import RedisError
+from sqlmodel.ext.asyncio.session import AsyncSession
+
+from app.core.logging import get_logger
+from app.domain.models import MissionProgress, User
+from app.domain.services import missions as mission_service
+from app.domain.services import progress as progress_service
+from app.infrastructure.cache.redis import get_many
+
+logger = get_logger(__name__)
+
+# Mission resets happen on read, so keep that entry short-lived.
+MISSIONS_TTL_SECONDS = 60
+SYSTEMS_TTL_SECONDS = 300
+
+
+@dataclass(frozen=True)
+class SummaryState:
+    missions: list[dict[str, Any]]
+    systems: dict[str, float]
+
+
+def _mission_entry(progress: MissionProgress) -> dict[str, Any]:
+    return {
+        "mission_id": str(progress.mission_id),
+        "title": progress.mission.title,
+        "progress": progress.progress,
+        "target": progress.mission.target,
+        "xp_reward": progress.mission.xp_reward,
+        "expires_at": progress.expires_at.isoformat() if progress.expires_at else None,
+        "status": progress.status.value,
+        "frequency": progress.mission.frequency.value,
+    }
+
+
+async def get_summary_state(
+    session: AsyncSession, read_session: AsyncSession, user: User
+) -> SummaryState:
+    """Mission and system progress for the dashboard/profile summaries.
+
+    Both pieces are read from the cache in one round trip; whatever is missing
+    is loaded through ``read_session`` and written back in one pipeline.
+    Expired missions are reset through the primary ``session``.
+    """
+
+    missions_key = mission_service.summary_cache_key(user.id)
+    systems_key = progress_service.summary_cache_key(user.id)
+
+    async def load(keys: list[str]) -> dict[str, Any]:
+        loaded: dict[str, Any] = {}
+        if missions_key in keys:
+            missions = await mission_service.list_missions(read_session, user)
+            if mission_service.has_expired(missions):
+                missions = await mission_service.get_active_missions(session, user)
+            loaded[missions_key] = [_mission_entry(progress) for progress in missions]
+        if systems_key in keys:
+            records = await progress_service.get_system_progress(read_session, user)
+            loaded[systems_key] = {
+                record.system.value: record.completion_rate for record in records
+            }
+        return loaded
+
+    keys = [missions_key, systems_key]
+    try:
+        state = await get_many(
+            keys,
+            loader=load,
+            ttl_seconds={missions_key: MISSIONS_TTL_SECONDS, systems_key: SYSTEMS_TTL_SECONDS},
+        )
+    except RedisError as exc:
+        logger.warning("summary_cache_unavailable", error=str(exc))
+        state = await load(keys)
+    return SummaryState(missions=state[missions_key], systems=state[systems_key])
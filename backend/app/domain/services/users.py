@@ -1,15 +1,22 @@
 from __future__ import annotations
 
 import uuid
+from functools import partial
 from typing import Optional
 
+from sqlalchemy import update
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm.attributes import set_committed_value
 from sqlmodel import select
 from sqlmodel.ext.asyncio.session import AsyncSession
 
 from app.core.logging import audit_logger
-from app.core.security import get_password_hash, verify_password
+from app.core.security import hash_password_async, verify_password_async
 from app.domain.models import User, UserRole
 from app.domain.schemas.user import UserCreate, UserUpdate
+from app.domain.services import leaderboard as leaderboard_service
+from app.infrastructure.cache.principal import principal_cache
+from app.infrastructure.db.unit_of_work import on_commit
 
 
 async def get_user_by_email(session: AsyncSession, email: str) -> Optional[User]:
@@ -31,14 +38,19 @@ async def create_user(session: AsyncSession, payload: UserCreate, role: UserRole
 
     user = User(
         email=payload.email,
-        hashed_password=get_password_hash(payload.password),
+        hashed_password=await hash_password_async(payload.password),
         display_name=payload.display_name,
         profile_type=payload.profile_type,
         role=role or default_role,
+        preferences={},
     )
-    session.add(user)
-    await session.commit()
-    await session.refresh(user)
+    # A concurrent registration can pass the check above; the savepoint keeps
+    # the request's transaction usable so the duplicate becomes a clean error.
+    try:
+        async with session.begin_nested():
+            session.add(user)
+    except IntegrityError as exc:
+        raise ValueError("Email already registered") from exc
     audit_logger.log("user_created", str(user.id), {"email": payload.email})
     return user
 
@@ -47,12 +59,17 @@ async def authenticate_user(session: AsyncSession, email: str, password: str) ->
     user = await get_user_by_email(session, email)
     if not user:
         return None
-    if not verify_password(password, user.hashed_password):
+    if not await verify_password_async(password, user.hashed_password):
         return None
     return user
 
 
 async def update_user(session: AsyncSession, user: User, payload: UserUpdate) -> User:
+    # ``user`` may be a cached principal; lock and re-read the row so the
+    # preferences merge cannot drop keys written by another request.
+    user = (
+        await session.get(User, user.id, with_for_update=True, populate_existing=True)
+    ) or user
     if payload.display_name is not None:
         user.display_name = payload.display_name
     if payload.preferences is not None:
@@ -61,17 +78,39 @@ async def update_user(session: AsyncSession, user: User, payload: UserUpdate) ->
         user.energy = payload.energy
     user.touch()
     session.add(user)
-    await session.commit()
-    await session.refresh(user)
+    await session.flush()
+    await on_commit(session, partial(principal_cache.invalidate, user.id))
+    if payload.display_name is not None or payload.preferences is not None:
+        await leaderboard_service.refresh_profile(session, user)
     audit_logger.log("user_updated", str(user.id), {"fields": payload.model_dump(exclude_none=True)})
     return user
 
 
 async def increment_user_xp(session: AsyncSession, user: User, xp: int) -> User:
-    user.xp += xp
+    """Add ``xp`` in the database; ``user`` may be a cached principal."""
+
+    await session.exec(
+        update(User)
+        .where(User.id == user.id)
+        .values(xp=User.xp + xp)
+        .execution_options(synchronize_session=False)
+    )
+    set_committed_value(user, "xp", user.xp + xp)
+    await leaderboard_service.record_xp(session, user, xp)
+    await on_commit(session, partial(principal_cache.invalidate, user.id))
+    return user
+
+
+async def change_user_role(session: AsyncSession, user: User, role: UserRole) -> User:
+    previous_role = user.role
+    user.role = role
+    user.touch()
     session.add(user)
-    await session.commit()
-    await session.refresh(user)
+    await session.flush()
+    await on_commit(session, partial(principal_cache.invalidate, user.id))
+    audit_logger.log(
+        "user_role_changed", str(user.id), {"from": previous_role.value, "to": role.value}
+    )
     return user
 
 
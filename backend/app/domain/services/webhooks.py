@@ -24,8 +24,7 @@ async def create_subscription(
         event=payload.event,
     )
     session.add(subscription)
-    await session.commit()
-    await session.refresh(subscription)
+    await session.flush()
     return subscription
 
 
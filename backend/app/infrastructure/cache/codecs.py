@@ -0,0 +1,89 @@
+from __future__ import annotations
+
+import json
+import zlib
+from typing import Any, Protocol
+
+import msgpack
+
+# Encoded values start with MAGIC, the header version, the codec id and a
+# flags byte. 0xC1 is never emitted by msgpack and cannot start UTF-8 JSON,
+# so values written before codecs existed (bare JSON text) are still readable.
+MAGIC = 0xC1
+HEADER_VERSION = 1
+HEADER_SIZE = 4
+FLAG_ZLIB = 0x01
+
+
+class Codec(Protocol):
+    id: int
+    name: str
+
+    def dumps(self, value: Any) -> bytes: ...
+
+    def loads(self, data: bytes) -> Any: ...
+
+
+class JsonCodec:
+    id = 1
+    name = "json"
+
+    def dumps(self, value: Any) -> bytes:
+        return json.dumps(value, separators=(",", ":")).encode()
+
+    def loads(self, data: bytes) -> Any:
+        return json.loads(data)
+
+
+class MsgpackCodec:
+    id = 2
+    name = "msgpack"
+
+    def dumps(self, value: Any) -> bytes:
+        return msgpack.packb(value, use_bin_type=True)
+
+    def loads(self, data: bytes) -> Any:
+        return msgpack.unpackb(data, raw=False)
+
+
+CODECS: dict[str, Codec] = {codec.name: codec for codec in (JsonCodec(), MsgpackCodec())}
+_CODECS_BY_ID: dict[int, Codec] = {codec.id: codec for codec in CODECS.values()}
+
+
+class CodecError(ValueError):
+    pass
+
+
+def encode(value: Any, codec: Codec, compression_threshold: int = 0, level: int = 6) -> bytes:
+    """Serialize ``value`` with ``codec`` and prepend the header.
+
+    Payloads larger than ``compression_threshold`` bytes are zlib-compressed
+    (0 disables compression).
+    """
+
+    payload = codec.dumps(value)
+    flags = 0
+    if compression_threshold and len(payload) > compression_threshold:
+        payload = zlib.compress(payload, level)
+        flags |= FLAG_ZLIB
+    return bytes((MAGIC, HEADER_VERSION, codec.id, flags)) + payload
+
+
+def decode(data: bytes) -> Any:
+    if not data or data[0] != MAGIC:
+        try:
+            return json.loads(data)
+        except ValueError as exc:
+            raise CodecError("Corrupt legacy cache value") from exc
+    if len(data) < HEADER_SIZE or data[1] != HEADER_VERSION:
+        raise CodecError("Unsupported cache header")
+    codec = _CODECS_BY_ID.get(data[2])
+    if codec is None:
+        raise CodecError(f"Unknown cache codec {data[2]}")
+    payload = data[HEADER_SIZE:]
+    try:
+        if data[3] & FLAG_ZLIB:
+            payload = zlib.decompress(payload)
+        return codec.loads(payload)
+    except (zlib.error, ValueError) as exc:
+        raise CodecError(f"Corrupt {codec.name} cache value") from exc
@@ -0,0 +1,209 @@
+from __future__ import annotations
+
+import asyncio
+import enum
+import functools
+import inspect
+import random
+import time
+from collections.abc import Awaitable, Callable, Sequence
+from typing import Any, TypeVar
+
+from prometheus_client import Counter
+from pydantic import BaseModel
+from redis.exceptions import LockError, RedisError
+
+from app.core.config import settings
+from app.core.logging import get_logger
+
+from .redis import delete_many, get_cached, get_client, invalidate, set_cached
+
+logger = get_logger(__name__)
+
+T = TypeVar("T")
+
+CACHE_LOOKUPS = Counter(
+    "read_through_cache_lookups_total",
+    "Read-through cache lookups by result",
+    labelnames=("name", "result"),
+)
+
+_inflight: dict[str, asyncio.Future[Any]] = {}
+
+
+def _cache_key(key: str) -> str:
+    return f"cache:{key}"
+
+
+def _tag_key(tag: str) -> str:
+    return f"cache:tag:{tag}"
+
+
+def _render_key(template: str, arguments: dict[str, Any]) -> str:
+    values = {
+        name: value.value if isinstance(value, enum.Enum) else value
+        for name, value in arguments.items()
+    }
+    return template.format(**values)
+
+
+def _jittered(ttl: int) -> int:
+    return max(1, int(ttl * (1 + random.uniform(0, settings.cache_ttl_jitter))))
+
+
+def _dump(value: Any) -> Any:
+    if isinstance(value, list):
+        return [_dump(item) for item in value]
+    if isinstance(value, BaseModel):
+        return value.model_dump(mode="json")
+    return value
+
+
+def _load(model: type[BaseModel] | None, data: Any) -> Any:
+    if model is None:
+        return data
+    if isinstance(data, list):
+        return [model.model_validate(item) for item in data]
+    return model.model_validate(data)
+
+
+async def _store(redis_key: str, value: Any, ttl: int, tags: Sequence[str]) -> None:
+    await set_cached(redis_key, _dump(value), ttl_seconds=_jittered(ttl))
+    if tags:
+        client = await get_client()
+        async with client.pipeline(transaction=False) as pipe:
+            for tag in tags:
+                pipe.sadd(_tag_key(tag), redis_key)
+                pipe.expire(_tag_key(tag), ttl * 2)
+            await pipe.execute()
+
+
+async def _load_cluster_once(
+    redis_key: str,
+    loader: Callable[[], Awaitable[Any]],
+    model: type[BaseModel] | None,
+    ttl: int,
+    tags: Sequence[str],
+) -> Any:
+    """Run ``loader`` on one worker in the cluster; the others wait for its result."""
+
+    client = await get_client()
+    lock = client.lock(f"{redis_key}:lock", timeout=settings.cache_lock_timeout_seconds)
+    if await lock.acquire(blocking=False):
+        try:
+            value = await loader()
+            if value is not None:
+                try:
+                    await _store(redis_key, value, ttl, tags)
+                except RedisError as exc:
+                    logger.warning("cache_store_failed", key=redis_key, error=str(exc))
+            return value
+        finally:
+            try:
+                await lock.release()
+            except LockError:
+                logger.warning("cache_lock_expired", key=redis_key)
+
+    deadline = time.monotonic() + settings.cache_lock_timeout_seconds
+    while time.monotonic() < deadline:
+        await asyncio.sleep(0.05)
+        data = await get_cached(redis_key)
+        if data is not None:
+            return _load(model, data)
+    return await loader()
+
+
+async def _single_flight(key: str, factory: Callable[[], Awaitable[T]]) -> T:
+    """Share one in-flight load per key among concurrent callers of this worker."""
+
+    existing = _inflight.get(key)
+    if existing is not None:
+        return await asyncio.shield(existing)
+
+    future = asyncio.ensure_future(factory())
+    _inflight[key] = future
+    try:
+        return await asyncio.shield(future)
+    finally:
+        if future.done():
+            _inflight.pop(key, None)
+        else:
+            future.add_done_callback(lambda _: _inflight.pop(key, None))
+
+
+def cached(
+    key: str,
+    ttl: int,
+    tags: Sequence[str] = (),
+    model: type[BaseModel] | None = None,
+) -> Callable[[Callable[..., Awaitable[Any]]], Callable[..., Awaitable[Any]]]:
+    """Read-through two-level (in-process + Redis) cache for async service functions.
+
+    ``key`` is a ``str.format`` template over the function's arguments (enums
+    are rendered by value). Results are converted to ``model`` before being
+    stored, so hits and misses return the same type. ``None`` is never cached.
+    Invalidate with :func:`invalidate_tag` from the functions that write the
+    underlying data.
+    """
+
+    def decorator(func: Callable[..., Awaitable[Any]]) -> Callable[..., Awaitable[Any]]:
+        signature = inspect.signature(func)
+        name = func.__qualname__
+
+        @functools.wraps(func)
+        async def wrapper(*args: Any, **kwargs: Any) -> Any:
+            bound = signature.bind(*args, **kwargs)
+            bound.apply_defaults()
+            redis_key = _cache_key(_render_key(key, bound.arguments))
+
+            async def loader() -> Any:
+                value = await func(*args, **kwargs)
+                if value is None:
+                    return value
+                return _load(model, value)
+
+            try:
+                data = await get_cached(redis_key)
+            except RedisError as exc:
+                CACHE_LOOKUPS.labels(name=name, result="error").inc()
+                logger.warning("cache_unavailable", key=redis_key, error=str(exc))
+                return await loader()
+
+            if data is not None:
+                CACHE_LOOKUPS.labels(name=name, result="hit").inc()
+                return _load(model, data)
+
+            CACHE_LOOKUPS.labels(name=name, result="miss").inc()
+
+            async def fill() -> Any:
+                try:
+                    return await _load_cluster_once(redis_key, loader, model, ttl, tags)
+                except RedisError as exc:
+                    logger.warning("cache_unavailable", key=redis_key, error=str(exc))
+                    return await loader()
+
+            return await _single_flight(redis_key, fill)
+
+        return wrapper
+
+    return decorator
+
+
+async def invalidate_tag(tag: str) -> None:
+    """Drop every cached entry registered under ``tag``, on every worker."""
+
+    try:
+        client = await get_client()
+        keys = await client.smembers(_tag_key(tag))
+        await invalidate(*keys, _tag_key(tag))
+    except RedisError as exc:
+        logger.warning("cache_invalidation_failed", tag=tag, error=str(exc))
+
+
+async def invalidate_keys(*keys: str) -> None:
+    """Drop ``keys`` on every worker; Redis failures are logged and ignored."""
+
+    try:
+        await delete_many(keys)
+    except RedisError as exc:
+        logger.warning("cache_invalidation_failed", keys=list(keys), error=str(exc))
@@ -0,0 +1,246 @@
+from __future__ import annotations
+
+import json
+import time
+import uuid
+from collections.abc import Mapping, Sequence
+from dataclasses import dataclass
+
+from prometheus_client import Counter
+from redis.exceptions import RedisError
+
+from app.core.config import settings
+from app.core.logging import get_logger
+
+from .redis import get_client
+
+logger = get_logger(__name__)
+
+LEADERBOARD_OPERATIONS = Counter(
+    "leaderboard_operations_total",
+    "Sorted-set leaderboard operations",
+    labelnames=("operation", "result"),
+)
+
+BOARD_PREFIX = "leaderboard:board:"
+PROFILES_KEY = "leaderboard:profiles"
+BUILT_KEY = "leaderboard:built"
+REBUILD_SUFFIX = ":rebuild"
+REBUILD_CHUNK = 1000
+
+
+def board_key(scope: str, reference_id: uuid.UUID | None = None) -> str:
+    if reference_id is None:
+        return f"{BOARD_PREFIX}{scope}"
+    return f"{BOARD_PREFIX}{scope}:{reference_id}"
+
+
+@dataclass(frozen=True, slots=True)
+class Profile:
+    """Display fields shown next to a leaderboard score."""
+
+    display_name: str
+    streak: int
+    avatar: str | None
+
+    def dump(self) -> str:
+        return json.dumps([self.display_name, self.streak, self.avatar], separators=(",", ":"))
+
+    @classmethod
+    def load(cls, data: str) -> Profile:
+        display_name, streak, avatar = json.loads(data)
+        return cls(display_name=display_name, streak=streak, avatar=avatar)
+
+
+@dataclass(frozen=True, slots=True)
+class Standing:
+    user_id: uuid.UUID
+    xp: int
+    rank: int
+    profile: Profile | None
+
+
+class LeaderboardStore:
+    """XP leaderboards kept as Redis sorted sets, one per scope.
+
+    Scores move with ``ZINCRBY`` as XP is granted, so reads never sort the
+    users table. Reads return ``None`` until :meth:`rebuild` has populated
+    the boards, or while Redis is unavailable; callers then use SQL. Ties
+    rank by member in reverse order, like ``ORDER BY xp DESC, id DESC``.
+    """
+
+    def __init__(self, enabled: bool = False) -> None:
+        self.enabled = enabled
+
+    async def add_xp(
+        self, user_id: uuid.UUID, delta: int, boards: Sequence[str], profile: Profile
+    ) -> None:
+        if not self.enabled:
+            return
+        member = str(user_id)
+        try:
+            client = await get_client()
+            async with client.pipeline(transaction=False) as pipe:
+                for key in boards:
+                    pipe.zincrby(key, delta, member)
+                pipe.hset(PROFILES_KEY, member, profile.dump())
+                await pipe.execute()
+        except RedisError as exc:
+            logger.warning("leaderboard_redis_unavailable", error=str(exc))
+            LEADERBOARD_OPERATIONS.labels(operation="add_xp", result="error").inc()
+            return
+        LEADERBOARD_OPERATIONS.labels(operation="add_xp", result="ok").inc()
+
+    async def place(self, user_id: uuid.UUID, key: str, xp: int, profile: Profile) -> None:
+        """Put a user on a board they just joined with their full score."""
+
+        if not self.enabled:
+            return
+        member = str(user_id)
+        try:
+            client = await get_client()
+            async with client.pipeline(transaction=False) as pipe:
+                pipe.zadd(key, {member: xp})
+                pipe.hset(PROFILES_KEY, member, profile.dump())
+                await pipe.execute()
+        except RedisError as exc:
+            logger.warning("leaderboard_redis_unavailable", error=str(exc))
+
+    async def set_profile(self, user_id: uuid.UUID, profile: Profile) -> None:
+        if not self.enabled:
+            return
+        try:
+            client = await get_client()
+            await client.hset(PROFILES_KEY, str(user_id), profile.dump())
+        except RedisError as exc:
+            logger.warning("leaderboard_redis_unavailable", error=str(exc))
+
+    async def is_built(self) -> bool:
+        if not self.enabled:
+            return False
+        try:
+            client = await get_client()
+            return bool(await client.exists(BUILT_KEY))
+        except RedisError as exc:
+            logger.warning("leaderboard_redis_unavailable", error=str(exc))
+            return False
+
+    async def top(self, key: str, limit: int) -> list[Standing] | None:
+        if not self.enabled:
+            return None
+        try:
+            client = await get_client()
+            async with client.pipeline(transaction=False) as pipe:
+                pipe.exists(BUILT_KEY)
+                pipe.zrevrange(key, 0, limit - 1, withscores=True)
+                built, members = await pipe.execute()
+            standings = await self._standings(client, members, first_rank=1) if built else None
+        except RedisError as exc:
+            logger.warning("leaderboard_redis_unavailable", error=str(exc))
+            standings = None
+        LEADERBOARD_OPERATIONS.labels(
+            operation="top", result="miss" if standings is None else "hit"
+        ).inc()
+        return standings
+
+    async def around(
+        self, key: str, user_id: uuid.UUID, radius: int
+    ) -> tuple[int | None, list[Standing]] | None:
+        """The user's rank and up to ``radius`` neighbours on each side.
+
+        The rank is ``None`` when the user is not on the board.
+        """
+
+        if not self.enabled:
+            return None
+        try:
+            client = await get_client()
+            async with client.pipeline(transaction=False) as pipe:
+                pipe.exists(BUILT_KEY)
+                pipe.zrevrank(key, str(user_id))
+                built, index = await pipe.execute()
+            if not built:
+                result = None
+            elif index is None:
+                result = (None, [])
+            else:
+                start = max(0, index - radius)
+                members = await client.zrevrange(key, start, index + radius, withscores=True)
+                result = (index + 1, await self._standings(client, members, first_rank=start + 1))
+        except RedisError as exc:
+            logger.warning("leaderboard_redis_unavailable", error=str(exc))
+            result = None
+        LEADERBOARD_OPERATIONS.labels(
+            operation="around", result="miss" if result is None else "hit"
+        ).inc()
+        return result
+
+    @staticmethod
+    async def _standings(client, members, first_rank: int) -> list[Standing]:
+        if not members:
+            return []
+        profiles = await client.hmget(PROFILES_KEY, [member for member, _ in members])
+        return [
+            Standing(
+                user_id=uuid.UUID(member),
+                xp=int(score),
+                rank=first_rank + offset,
+                profile=Profile.load(data) if data else None,
+            )
+            for offset, ((member, score), data) in enumerate(zip(members, profiles, strict=True))
+        ]
+
+    async def rebuild(
+        self, boards: Mapping[str, Mapping[str, int]], profiles: Mapping[str, str]
+    ) -> None:
+        """Replace every board and the profiles hash with the given contents.
+
+        Each key is filled under a temporary name and renamed over the old
+        one, so readers never see a half-built board. Boards that are no
+        longer listed (emptied classrooms, say) are dropped. Increments that
+        land on a board between the database read and its rename are lost
+        until the next rebuild.
+        """
+
+        if not self.enabled:
+            return
+        try:
+            client = await get_client()
+            stale = set()
+            async for key in client.scan_iter(match=f"{BOARD_PREFIX}*"):
+                if not key.endswith(REBUILD_SUFFIX) and key not in boards:
+                    stale.add(key)
+            for key, scores in boards.items():
+                await self._swap(client, key, scores, sorted_set=True)
+            await self._swap(client, PROFILES_KEY, profiles, sorted_set=False)
+            async with client.pipeline(transaction=False) as pipe:
+                for key in stale:
+                    pipe.delete(key)
+                pipe.set(BUILT_KEY, time.time())
+                await pipe.execute()
+        except RedisError as exc:
+            logger.warning("leaderboard_redis_unavailable", error=str(exc))
+            LEADERBOARD_OPERATIONS.labels(operation="rebuild", result="error").inc()
+            raise
+        LEADERBOARD_OPERATIONS.labels(operation="rebuild", result="ok").inc()
+
+    @staticmethod
+    async def _swap(client, key: str, values: Mapping[str, object], sorted_set: bool) -> None:
+        temporary = f"{key}{REBUILD_SUFFIX}"
+        items = list(values.items())
+        async with client.pipeline(transaction=False) as pipe:
+            pipe.delete(temporary)
+            for start in range(0, len(items), REBUILD_CHUNK):
+                chunk = dict(items[start : start + REBUILD_CHUNK])
+                if sorted_set:
+                    pipe.zadd(temporary, chunk)
+                else:
+                    pipe.hset(temporary, mapping=chunk)
+            if items:
+                pipe.rename(temporary, key)
+            else:
+                pipe.delete(key)
+            await pipe.execute()
+
+
+leaderboard_store = LeaderboardStore(enabled=settings.leaderboard_redis_enabled)
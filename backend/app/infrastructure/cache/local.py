@@ -0,0 +1,86 @@
+from __future__ import annotations
+
+import time
+from collections import OrderedDict
+from typing import Any
+
+from prometheus_client import Counter, Gauge
+
+LOCAL_CACHE_EVICTIONS = Counter(
+    "cache_l1_evictions_total",
+    "Entries dropped from the in-process cache",
+    labelnames=("reason",),
+)
+LOCAL_CACHE_BYTES = Gauge(
+    "cache_l1_bytes",
+    "Approximate serialized size of entries held in the in-process cache",
+)
+LOCAL_CACHE_ENTRIES = Gauge(
+    "cache_l1_entries",
+    "Entries held in the in-process cache",
+)
+
+
+class LocalCache:
+    """Per-worker LRU bounded by the serialized size of its entries.
+
+    Values are kept decoded so hits skip deserialization; callers must treat
+    them as read-only. ``size`` is the length in bytes of the serialized form
+    and only drives the memory budget.
+    """
+
+    def __init__(self, max_bytes: int, ttl_seconds: float) -> None:
+        self.max_bytes = max_bytes
+        self.ttl_seconds = ttl_seconds
+        self._entries: OrderedDict[str, tuple[float, int, Any]] = OrderedDict()
+        self._bytes = 0
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    @property
+    def size_bytes(self) -> int:
+        return self._bytes
+
+    def _drop(self, key: str, reason: str) -> None:
+        _, size, _ = self._entries.pop(key)
+        self._bytes -= size
+        LOCAL_CACHE_EVICTIONS.labels(reason=reason).inc()
+
+    def _report(self) -> None:
+        LOCAL_CACHE_BYTES.set(self._bytes)
+        LOCAL_CACHE_ENTRIES.set(len(self._entries))
+
+    def get(self, key: str) -> Any | None:
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+        if entry[0] < time.monotonic():
+            self._drop(key, "expired")
+            self._report()
+            return None
+        self._entries.move_to_end(key)
+        return entry[2]
+
+    def set(self, key: str, value: Any, size: int, ttl_seconds: float | None = None) -> None:
+        if size > self.max_bytes:
+            return
+        if key in self._entries:
+            self._bytes -= self._entries.pop(key)[1]
+        ttl = self.ttl_seconds if ttl_seconds is None else min(ttl_seconds, self.ttl_seconds)
+        self._entries[key] = (time.monotonic() + ttl, size, value)
+        self._bytes += size
+        while self._bytes > self.max_bytes:
+            self._drop(next(iter(self._entries)), "size")
+        self._report()
+
+    def delete(self, *keys: str) -> None:
+        for key in keys:
+            if key in self._entries:
+                self._drop(key, "invalidated")
+        self._report()
+
+    def clear(self) -> None:
+        self._entries.clear()
+        self._bytes = 0
+        self._report()
@@ -0,0 +1,151 @@
+from __future__ import annotations
+
+import time
+import uuid
+from collections import OrderedDict
+from typing import Any
+
+from prometheus_client import Counter, Gauge
+from redis.exceptions import RedisError
+from sqlalchemy.orm import make_transient_to_detached
+
+from app.core.config import settings
+from app.core.logging import get_logger
+from app.domain.models import User
+
+from .redis import get_client, get_json, set_json
+
+logger = get_logger(__name__)
+
+PRINCIPAL_CACHE_LOOKUPS = Counter(
+    "principal_cache_lookups_total",
+    "Authenticated principal cache lookups",
+    labelnames=("tier", "result"),
+)
+PRINCIPAL_CACHE_SIZE = Gauge(
+    "principal_cache_entries",
+    "Principals currently held in the in-process cache",
+)
+
+
+def _key(user_id: uuid.UUID) -> str:
+    return f"principal:{user_id}"
+
+
+def _snapshot(user: User) -> dict[str, Any]:
+    # Password hashes never leave the database: not in process memory, not in Redis.
+    return user.model_dump(mode="json", exclude={"hashed_password"})
+
+
+def _restore(data: dict[str, Any]) -> User:
+    """Build a fresh detached ``User`` so each request gets its own instance.
+
+    The instance looks as if it had just been loaded and expunged, so services
+    that modify it and ``session.add`` it issue an UPDATE, not an INSERT.
+    Snapshots carry no ``hashed_password``; the attribute is left unloaded, so
+    it is read from the database if an attached instance ever needs it and is
+    never written back.
+    """
+
+    user = User.model_validate({**data, "hashed_password": ""})
+    make_transient_to_detached(user)
+    user.__dict__.pop("hashed_password", None)
+    return user
+
+
+class PrincipalCache:
+    """Per-worker TTL + LRU cache of users resolved from access tokens.
+
+    An optional Redis tier lets workers share entries. Local entries live for a
+    short TTL because invalidations only reach the worker that did the write
+    and the shared tier.
+    """
+
+    def __init__(
+        self,
+        max_entries: int,
+        ttl_seconds: float,
+        redis_enabled: bool = False,
+        redis_ttl_seconds: int = 300,
+    ) -> None:
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self.redis_enabled = redis_enabled
+        self.redis_ttl_seconds = redis_ttl_seconds
+        self._entries: OrderedDict[uuid.UUID, tuple[float, dict[str, Any]]] = OrderedDict()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def _get_local(self, user_id: uuid.UUID) -> dict[str, Any] | None:
+        entry = self._entries.get(user_id)
+        if entry is None:
+            return None
+        expires_at, data = entry
+        if expires_at < time.monotonic():
+            del self._entries[user_id]
+            PRINCIPAL_CACHE_SIZE.set(len(self._entries))
+            return None
+        self._entries.move_to_end(user_id)
+        return data
+
+    def _set_local(self, user_id: uuid.UUID, data: dict[str, Any]) -> None:
+        self._entries[user_id] = (time.monotonic() + self.ttl_seconds, data)
+        self._entries.move_to_end(user_id)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+        PRINCIPAL_CACHE_SIZE.set(len(self._entries))
+
+    async def get(self, user_id: uuid.UUID) -> User | None:
+        data = self._get_local(user_id)
+        if data is not None:
+            PRINCIPAL_CACHE_LOOKUPS.labels(tier="local", result="hit").inc()
+            return _restore(data)
+        PRINCIPAL_CACHE_LOOKUPS.labels(tier="local", result="miss").inc()
+
+        if not self.redis_enabled:
+            return None
+        try:
+            data = await get_json(_key(user_id))
+        except RedisError as exc:
+            logger.warning("principal_cache_redis_unavailable", error=str(exc))
+            return None
+        if data is None:
+            PRINCIPAL_CACHE_LOOKUPS.labels(tier="redis", result="miss").inc()
+            return None
+        PRINCIPAL_CACHE_LOOKUPS.labels(tier="redis", result="hit").inc()
+        self._set_local(user_id, data)
+        return _restore(data)
+
+    async def set(self, user: User) -> None:
+        data = _snapshot(user)
+        self._set_local(user.id, data)
+        if not self.redis_enabled:
+            return
+        try:
+            await set_json(_key(user.id), data, ttl_seconds=self.redis_ttl_seconds)
+        except RedisError as exc:
+            logger.warning("principal_cache_redis_unavailable", error=str(exc))
+
+    async def invalidate(self, user_id: uuid.UUID) -> None:
+        if self._entries.pop(user_id, None) is not None:
+            PRINCIPAL_CACHE_SIZE.set(len(self._entries))
+        if not self.redis_enabled:
+            return
+        try:
+            client = await get_client()
+            await client.delete(_key(user_id))
+        except RedisError as exc:
+            logger.warning("principal_cache_redis_unavailable", error=str(exc))
+
+    def clear(self) -> None:
+        self._entries.clear()
+        PRINCIPAL_CACHE_SIZE.set(0)
+
+
+principal_cache = PrincipalCache(
+    max_entries=settings.principal_cache_max_entries,
+    ttl_seconds=settings.principal_cache_ttl_seconds,
+    redis_enabled=settings.principal_cache_redis_enabled,
+    redis_ttl_seconds=settings.principal_cache_redis_ttl_seconds,
+)
@@ -0,0 +1,363 @@
+from __future__ import annotations
+
+import json
+import time
+import uuid
+from collections.abc import Mapping
+from dataclasses import dataclass
+from datetime import datetime
+
+from prometheus_client import Counter, Gauge
+from redis.exceptions import RedisError
+
+from app.core.config import settings
+from app.core.logging import get_logger
+
+from .redis import get_client
+
+logger = get_logger(__name__)
+
+QUIZ_STATE_OPERATIONS = Counter(
+    "quiz_state_operations_total",
+    "Hot quiz session state operations",
+    labelnames=("operation", "result"),
+)
+QUIZ_STATE_CACHED = Gauge(
+    "quiz_state_cached_sessions",
+    "Answer keys of open quiz sessions cached in this worker",
+)
+
+ACTIVE_KEY = "quiz-state:active"
+
+# question id -> (correct option id, every option id served for it)
+AnswerKey = Mapping[uuid.UUID, tuple[uuid.UUID | None, frozenset[uuid.UUID]]]
+
+
+def _key(session_id: uuid.UUID) -> str:
+    return f"quiz-state:{session_id}"
+
+
+def _attempts_key(session_id: uuid.UUID) -> str:
+    return f"quiz-state:{session_id}:attempts"
+
+
+def _claim_key(session_id: uuid.UUID) -> str:
+    return f"quiz-state:{session_id}:claim"
+
+
+class QuizStateBusy(Exception):
+    """Raised when a session's hot state cannot be taken over right now."""
+
+    def __init__(self, retry_after: int) -> None:
+        super().__init__("Quiz session is being saved")
+        self.retry_after = retry_after
+
+
+@dataclass(frozen=True, slots=True)
+class HotAttempt:
+    id: uuid.UUID
+    question_id: uuid.UUID
+    selected_option_id: uuid.UUID
+    is_correct: bool
+    answered_at: datetime
+
+    def dump(self) -> str:
+        return json.dumps(
+            {
+                "id": str(self.id),
+                "question_id": str(self.question_id),
+                "selected_option_id": str(self.selected_option_id),
+                "is_correct": self.is_correct,
+                "answered_at": self.answered_at.isoformat(),
+            }
+        )
+
+    @classmethod
+    def load(cls, data: str) -> HotAttempt:
+        raw = json.loads(data)
+        return cls(
+            id=uuid.UUID(raw["id"]),
+            question_id=uuid.UUID(raw["question_id"]),
+            selected_option_id=uuid.UUID(raw["selected_option_id"]),
+            is_correct=raw["is_correct"],
+            answered_at=datetime.fromisoformat(raw["answered_at"]),
+        )
+
+
+@dataclass(slots=True)
+class QuizState:
+    """Answer key of one open quiz session.
+
+    The state and the session's not-yet-persisted attempts live in Redis, so
+    any worker can take the next answer; the copy held by a worker is only a
+    cache of the immutable key.
+    """
+
+    session_id: uuid.UUID
+    user_id: uuid.UUID
+    system: str | None
+    key: AnswerKey
+    expires_at: float
+
+    def grade(self, question_id: uuid.UUID, option_id: uuid.UUID) -> bool | None:
+        """``None`` when the option was not served for the question."""
+
+        entry = self.key.get(question_id)
+        if entry is None or option_id not in entry[1]:
+            return None
+        return entry[0] == option_id
+
+    def dump(self) -> str:
+        return json.dumps(
+            {
+                "user_id": str(self.user_id),
+                "system": self.system,
+                "expires_at": self.expires_at,
+                "key": {
+                    str(question_id): [
+                        str(correct) if correct else None,
+                        [str(option_id) for option_id in options],
+                    ]
+                    for question_id, (correct, options) in self.key.items()
+                },
+            }
+        )
+
+    @classmethod
+    def load(cls, session_id: uuid.UUID, data: str) -> QuizState:
+        raw = json.loads(data)
+        return cls(
+            session_id=session_id,
+            user_id=uuid.UUID(raw["user_id"]),
+            system=raw["system"],
+            expires_at=raw["expires_at"],
+            key={
+                uuid.UUID(question_id): (
+                    uuid.UUID(correct) if correct else None,
+                    frozenset(uuid.UUID(option_id) for option_id in options),
+                )
+                for question_id, (correct, options) in raw["key"].items()
+            },
+        )
+
+
+class QuizStateStore:
+    """Hot state of open quiz sessions in Redis, persisted on completion or expiry.
+
+    Persisting a session goes ``claim`` -> ``drain`` -> ``close`` once the
+    attempts are committed, or ``release`` if that fails. A claim is a key set
+    with ``NX`` for ``claim_seconds``, so exactly one worker persists each
+    session, and a worker that dies mid-flush leaves it to the next one once
+    the claim expires. Draining stops new answers from entering the hot state
+    but keeps the drained attempts until ``close``, so a failed or
+    interrupted flush is retried instead of losing them.
+
+    Attempts are never held only in a worker's memory: with Redis disabled
+    (or while it is down) sessions get no hot state and their answers are
+    written through the journaled attempt buffer.
+    """
+
+    def __init__(
+        self,
+        ttl_seconds: int,
+        redis_enabled: bool = False,
+        claim_seconds: int = 300,
+        retry_after: int = 5,
+    ) -> None:
+        self.ttl_seconds = ttl_seconds
+        self.redis_enabled = redis_enabled
+        self.claim_seconds = claim_seconds
+        self.retry_after = retry_after
+        self._states: dict[uuid.UUID, QuizState] = {}
+
+    def __len__(self) -> int:
+        return len(self._states)
+
+    def _set_local(self, state: QuizState) -> None:
+        self._states[state.session_id] = state
+        QUIZ_STATE_CACHED.set(len(self._states))
+
+    def _pop_local(self, session_id: uuid.UUID) -> None:
+        if self._states.pop(session_id, None) is not None:
+            QUIZ_STATE_CACHED.set(len(self._states))
+
+    async def open(
+        self, session_id: uuid.UUID, user_id: uuid.UUID, system: str | None, key: AnswerKey
+    ) -> QuizState | None:
+        """Start the hot state of a session; ``None`` when Redis is off or down."""
+
+        if not self.redis_enabled:
+            return None
+        state = QuizState(
+            session_id=session_id,
+            user_id=user_id,
+            system=system,
+            key=key,
+            expires_at=time.time() + self.ttl_seconds,
+        )
+        try:
+            client = await get_client()
+            # Redis keeps the state past expires_at so the expiry job can still read it.
+            async with client.pipeline(transaction=True) as pipe:
+                pipe.set(_key(session_id), state.dump(), ex=self.ttl_seconds * 2)
+                pipe.zadd(ACTIVE_KEY, {str(session_id): state.expires_at})
+                await pipe.execute()
+        except RedisError as exc:
+            logger.warning("quiz_state_redis_unavailable", error=str(exc))
+            QUIZ_STATE_OPERATIONS.labels(operation="open", result="error").inc()
+            return None
+        self._set_local(state)
+        QUIZ_STATE_OPERATIONS.labels(operation="open", result="ok").inc()
+        return state
+
+    async def get(self, session_id: uuid.UUID) -> QuizState | None:
+        state = self._states.get(session_id)
+        if state is not None and state.expires_at > time.time():
+            QUIZ_STATE_OPERATIONS.labels(operation="get", result="local").inc()
+            return state
+        if state is not None:
+            # Expired states wait for the flush job; answers go to the database.
+            self._pop_local(session_id)
+            QUIZ_STATE_OPERATIONS.labels(operation="get", result="miss").inc()
+            return None
+        if not self.redis_enabled:
+            QUIZ_STATE_OPERATIONS.labels(operation="get", result="miss").inc()
+            return None
+        try:
+            client = await get_client()
+            data = await client.get(_key(session_id))
+        except RedisError as exc:
+            logger.warning("quiz_state_redis_unavailable", error=str(exc))
+            data = None
+        if not data:
+            QUIZ_STATE_OPERATIONS.labels(operation="get", result="miss").inc()
+            return None
+        state = QuizState.load(session_id, data)
+        if state.expires_at <= time.time():
+            QUIZ_STATE_OPERATIONS.labels(operation="get", result="miss").inc()
+            return None
+        self._set_local(state)
+        QUIZ_STATE_OPERATIONS.labels(operation="get", result="shared").inc()
+        return state
+
+    async def record(self, state: QuizState, attempt: HotAttempt) -> bool:
+        """Append ``attempt``; ``False`` when the session was closed meanwhile."""
+
+        try:
+            client = await get_client()
+            payload = attempt.dump()
+            async with client.pipeline(transaction=True) as pipe:
+                pipe.rpush(_attempts_key(state.session_id), payload)
+                pipe.expire(_attempts_key(state.session_id), self.ttl_seconds * 2)
+                pipe.exists(_key(state.session_id))
+                _, _, open_ = await pipe.execute()
+            if not open_:
+                # Drained by another worker before our push; take back only ours,
+                # the drained attempts stay until that worker commits them.
+                await client.lrem(_attempts_key(state.session_id), -1, payload)
+        except RedisError as exc:
+            logger.warning("quiz_state_redis_unavailable", error=str(exc))
+            open_ = False
+        if not open_:
+            self._pop_local(state.session_id)
+            QUIZ_STATE_OPERATIONS.labels(operation="record", result="closed").inc()
+            return False
+        QUIZ_STATE_OPERATIONS.labels(operation="record", result="ok").inc()
+        return True
+
+    async def claim(self, session_id: uuid.UUID) -> bool:
+        """Take the session over for persisting; ``False`` when someone else has it.
+
+        Always succeeds with Redis disabled, since there is no hot state to
+        guard; Redis errors propagate.
+        """
+
+        if not self.redis_enabled:
+            return True
+        try:
+            client = await get_client()
+            claimed = await client.set(_claim_key(session_id), 1, nx=True, ex=self.claim_seconds)
+        except RedisError as exc:
+            logger.warning("quiz_state_redis_unavailable", error=str(exc))
+            raise
+        return bool(claimed)
+
+    async def claim_expired(self, limit: int = 100) -> list[uuid.UUID]:
+        """Claim sessions past their lifetime for this worker to persist."""
+
+        if not self.redis_enabled:
+            return []
+        try:
+            client = await get_client()
+            candidates = await client.zrangebyscore(ACTIVE_KEY, "-inf", time.time(), 0, limit)
+            claimed = []
+            for member in candidates:
+                session_id = uuid.UUID(member)
+                if await self.claim(session_id):
+                    claimed.append(session_id)
+        except RedisError as exc:
+            logger.warning("quiz_state_redis_unavailable", error=str(exc))
+            return []
+        return claimed
+
+    async def drain(self, session_id: uuid.UUID) -> list[HotAttempt]:
+        """Attempts of a claimed session; later answers fall back to the database."""
+
+        self._pop_local(session_id)
+        if not self.redis_enabled:
+            return []
+        try:
+            client = await get_client()
+            async with client.pipeline(transaction=True) as pipe:
+                pipe.lrange(_attempts_key(session_id), 0, -1)
+                pipe.delete(_key(session_id))
+                raw, _ = await pipe.execute()
+        except RedisError as exc:
+            logger.warning("quiz_state_redis_unavailable", error=str(exc))
+            raise
+        QUIZ_STATE_OPERATIONS.labels(operation="drain", result="ok").inc()
+        return [HotAttempt.load(item) for item in raw]
+
+    async def close(self, session_id: uuid.UUID) -> None:
+        """Drop the hot state of a session whose attempts are now committed."""
+
+        if not self.redis_enabled:
+            return
+        try:
+            client = await get_client()
+            async with client.pipeline(transaction=True) as pipe:
+                pipe.delete(_attempts_key(session_id), _key(session_id), _claim_key(session_id))
+                pipe.zrem(ACTIVE_KEY, str(session_id))
+                await pipe.execute()
+        except RedisError as exc:
+            logger.warning("quiz_state_redis_unavailable", error=str(exc))
+            return
+        QUIZ_STATE_OPERATIONS.labels(operation="close", result="ok").inc()
+
+    async def release(self, session_id: uuid.UUID) -> None:
+        """Hand a claimed session back after a failed persist, so it is retried."""
+
+        if not self.redis_enabled:
+            return
+        try:
+            client = await get_client()
+            async with client.pipeline(transaction=True) as pipe:
+                pipe.expire(_attempts_key(session_id), self.ttl_seconds * 2)
+                pipe.delete(_claim_key(session_id))
+                await pipe.execute()
+        except RedisError as exc:
+            # The claim still expires after claim_seconds.
+            logger.warning("quiz_state_redis_unavailable", error=str(exc))
+            return
+        QUIZ_STATE_OPERATIONS.labels(operation="release", result="ok").inc()
+
+    def clear(self) -> None:
+        self._states.clear()
+        QUIZ_STATE_CACHED.set(0)
+
+
+quiz_state_store = QuizStateStore(
+    ttl_seconds=settings.quiz_state_ttl_seconds,
+    redis_enabled=settings.quiz_state_redis_enabled,
+    claim_seconds=settings.quiz_state_claim_seconds,
+)
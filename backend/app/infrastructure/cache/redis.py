@@ -1,13 +1,65 @@
 from __future__ import annotations
 
+import asyncio
+import contextlib
 import json
+from collections.abc import Awaitable, Callable, Iterable, Mapping, Sequence
 from typing import Any, Optional
 
 import redis.asyncio as redis
+from prometheus_client import Counter
+from redis.exceptions import RedisError
 
 from app.core.config import settings
+from app.core.logging import get_logger
+
+from .codecs import CODECS, CodecError, decode, encode
+from .local import LocalCache
+
+logger = get_logger(__name__)
+
+INVALIDATION_CHANNEL = "cache-invalidations"
+
+CACHE_TIER_LOOKUPS = Counter(
+    "cache_tier_lookups_total",
+    "Two-level cache lookups by tier and result",
+    labelnames=("tier", "result"),
+)
 
 _client: Optional[redis.Redis] = None
+_binary_client: redis.Redis | None = None
+_listener: asyncio.Task[None] | None = None
+
+local_cache = LocalCache(
+    max_bytes=settings.cache_local_max_bytes,
+    ttl_seconds=settings.cache_local_ttl_seconds,
+)
+_invalidation_hooks: dict[str, list[Callable[[], None]]] = {}
+
+
+def on_invalidation(key: str, callback: Callable[[], None]) -> None:
+    """Call ``callback`` in this worker whenever ``key`` is invalidated by any worker.
+
+    For in-process state kept outside ``local_cache``. Callbacks also run
+    when the listener (re)subscribes, since messages may have been missed.
+    """
+
+    _invalidation_hooks.setdefault(key, []).append(callback)
+
+
+def _drop_local(keys: Iterable[str]) -> None:
+    keys = list(keys)
+    local_cache.delete(*keys)
+    for key in keys:
+        for callback in _invalidation_hooks.get(key, ()):
+            callback()
+
+
+def _drop_all_local() -> None:
+    local_cache.clear()
+    for callbacks in _invalidation_hooks.values():
+        for callback in callbacks:
+            callback()
 
 
 async def get_client() -> redis.Redis:
@@ -17,6 +69,15 @@ async def get_client() -> redis.Redis:
     return _client
 
 
+async def get_binary_client() -> redis.Redis:
+    """Client without response decoding, for values written by :func:`set_cached`."""
+
+    global _binary_client
+    if _binary_client is None:
+        _binary_client = redis.from_url(settings.redis_url, decode_responses=False)
+    return _binary_client
+
+
 async def set_json(key: str, value: Any, ttl_seconds: int | None = None) -> None:
     client = await get_client()
     data = json.dumps(value)
@@ -30,3 +91,172 @@ async def get_json(key: str) -> Any | None:
     client = await get_client()
     data = await client.get(key)
     return json.loads(data) if data else None
+
+
+async def get_cached(key: str) -> Any | None:
+    """Read ``key`` from the in-process cache, then from Redis.
+
+    Redis hits are kept locally for at most CACHE_LOCAL_TTL_SECONDS (or the
+    remaining Redis TTL, whichever is shorter), so a missed invalidation
+    message cannot serve stale data for long. The returned value may be
+    shared with other callers and must not be mutated.
+    """
+
+    found = await get_many([key])
+    return found.get(key)
+
+
+def _from_redis(key: str, data: bytes | None, ttl: int) -> Any | None:
+    if not data:
+        CACHE_TIER_LOOKUPS.labels(tier="l2", result="miss").inc()
+        return None
+    try:
+        value = decode(data)
+    except CodecError as exc:
+        CACHE_TIER_LOOKUPS.labels(tier="l2", result="error").inc()
+        logger.warning("cache_decode_failed", key=key, error=str(exc))
+        return None
+    CACHE_TIER_LOOKUPS.labels(tier="l2", result="hit").inc()
+    local_cache.set(key, value, len(data), ttl if ttl > 0 else None)
+    return value
+
+
+async def get_many(
+    keys: Sequence[str],
+    loader: Callable[[list[str]], Awaitable[Mapping[str, Any]]] | None = None,
+    ttl_seconds: int | Mapping[str, int] = 300,
+) -> dict[str, Any]:
+    """Fetch several keys with one MGET for everything not held locally.
+
+    Keys still missing are passed to ``loader`` in a single call; whatever it
+    returns (``None`` values excluded) is stored with :func:`set_many` and
+    merged into the result. Keys that are found nowhere are left out.
+    """
+
+    found: dict[str, Any] = {}
+    missing: list[str] = []
+    for key in dict.fromkeys(keys):
+        value = local_cache.get(key)
+        if value is None:
+            missing.append(key)
+        else:
+            found[key] = value
+    CACHE_TIER_LOOKUPS.labels(tier="l1", result="hit").inc(len(found))
+    CACHE_TIER_LOOKUPS.labels(tier="l1", result="miss").inc(len(missing))
+
+    if missing:
+        client = await get_binary_client()
+        async with client.pipeline(transaction=False) as pipe:
+            pipe.mget(missing)
+            for key in missing:
+                pipe.ttl(key)
+            values, *ttls = await pipe.execute()
+        remaining = []
+        for key, data, ttl in zip(missing, values, ttls, strict=True):
+            value = _from_redis(key, data, ttl)
+            if value is None:
+                remaining.append(key)
+            else:
+                found[key] = value
+        missing = remaining
+
+    if missing and loader is not None:
+        loaded = {
+            key: value for key, value in (await loader(missing)).items() if value is not None
+        }
+        if loaded:
+            await set_many(loaded, ttl_seconds)
+        found.update(loaded)
+    return found
+
+
+async def set_many(values: Mapping[str, Any], ttl_seconds: int | Mapping[str, int]) -> None:
+    """Store several values in one pipeline.
+
+    ``ttl_seconds`` is either one TTL for every key or a per-key mapping.
+    Encoding and invalidation semantics are the same as :func:`set_cached`.
+    """
+
+    if not values:
+        return
+    codec = CODECS[settings.cache_codec]
+    encoded: list[tuple[str, Any, bytes, int]] = []
+    for key, value in values.items():
+        ttl = ttl_seconds if isinstance(ttl_seconds, int) else ttl_seconds[key]
+        data = encode(
+            value, codec, compression_threshold=settings.cache_compression_threshold_bytes
+        )
+        encoded.append((key, value, data, ttl))
+
+    client = await get_binary_client()
+    async with client.pipeline(transaction=False) as pipe:
+        for key, _, data, ttl in encoded:
+            pipe.setex(key, ttl, data)
+        await pipe.execute()
+    for key, value, data, ttl in encoded:
+        local_cache.set(key, value, len(data), ttl)
+
+
+async def delete_many(keys: Iterable[str]) -> None:
+    await invalidate(*keys)
+
+
+async def set_cached(key: str, value: Any, ttl_seconds: int) -> None:
+    """Store ``value`` in Redis and in this worker's cache.
+
+    The value is written with CACHE_CODEC and compressed above
+    CACHE_COMPRESSION_THRESHOLD_BYTES; readers pick the codec from the stored
+    header, so the setting can change without flushing. Other workers are not
+    notified; overwrite existing keys through :func:`invalidate` first so
+    their local copies are dropped.
+    """
+
+    await set_many({key: value}, ttl_seconds)
+
+
+async def invalidate(*keys: str) -> None:
+    """Delete ``keys`` from Redis and from the local cache of every worker."""
+
+    if not keys:
+        return
+    _drop_local(keys)
+    client = await get_client()
+    async with client.pipeline(transaction=False) as pipe:
+        pipe.delete(*keys)
+        pipe.publish(INVALIDATION_CHANNEL, json.dumps(list(keys)))
+        await pipe.execute()
+
+
+async def _listen_for_invalidations() -> None:
+    while True:
+        try:
+            client = await get_client()
+            async with client.pubsub() as pubsub:
+                await pubsub.subscribe(INVALIDATION_CHANNEL)
+                # Anything cached before the subscription may have missed a message.
+                _drop_all_local()
+                async for message in pubsub.listen():
+                    if message.get("type") != "message":
+                        continue
+                    _drop_local(json.loads(message["data"]))
+        except asyncio.CancelledError:
+            raise
+        except (RedisError, ValueError, TypeError) as exc:
+            logger.warning("cache_invalidation_listener_error", error=str(exc))
+            local_cache.clear()
+            await asyncio.sleep(5)
+
+
+def start_invalidation_listener() -> None:
+    global _listener
+    if _listener is None or _listener.done():
+        _listener = asyncio.get_running_loop().create_task(_listen_for_invalidations())
+
+
+async def stop_invalidation_listener() -> None:
+    global _listener
+    if _listener is not None:
+        _listener.cancel()
+        with contextlib.suppress(asyncio.CancelledError):
+            await _listener
+        _listener = None
@@ -0,0 +1,148 @@
+from __future__ import annotations
+
+import asyncio
+import contextlib
+import json
+import time
+from collections.abc import Mapping
+from typing import Any
+
+from prometheus_client import Counter, Gauge
+from redis.exceptions import RedisError
+
+from app.core.config import settings
+from app.core.logging import get_logger
+
+from .redis import get_client
+
+logger = get_logger(__name__)
+
+CHANNEL = "token-revocations"
+JTI_PREFIX = "revoked:jti:"
+FAMILY_PREFIX = "revoked:fam:"
+
+REVOKED_ENTRIES = Gauge(
+    "token_revocations_local_entries",
+    "Revoked token ids and families mirrored in this worker",
+    labelnames=("kind",),
+)
+REVOCATION_HITS = Counter(
+    "token_revocation_rejections_total",
+    "Tokens rejected because their id or family was revoked",
+)
+
+
+class RevocationList:
+    """Revoked token ids and refresh families, mirrored locally from Redis.
+
+    Redis is the source of truth (one key per revoked id, TTL equal to the
+    token's remaining lifetime). Each worker keeps a hash set fed by a snapshot
+    at startup and by pub/sub messages afterwards, so ``is_revoked`` is a dict
+    lookup on the request path. Redis failures degrade to the local view.
+    """
+
+    def __init__(self, family_ttl_seconds: int) -> None:
+        self.family_ttl_seconds = family_ttl_seconds
+        self._jtis: dict[str, float] = {}
+        self._families: dict[str, float] = {}
+        self._listener: asyncio.Task[None] | None = None
+
+    def _remember(self, kind: str, identifier: str, expires_at: float) -> None:
+        target = self._families if kind == "family" else self._jtis
+        target[identifier] = max(expires_at, target.get(identifier, 0.0))
+        REVOKED_ENTRIES.labels(kind=kind).set(len(target))
+
+    def is_family_revoked(self, family: str) -> bool:
+        return self._families.get(family, 0.0) > time.time()
+
+    def is_revoked(self, claims: Mapping[str, Any]) -> bool:
+        revoked = self._jtis.get(claims.get("jti", ""), 0.0) > time.time() or (
+            self.is_family_revoked(claims.get("fam", ""))
+        )
+        if revoked:
+            REVOCATION_HITS.inc()
+        return revoked
+
+    async def _publish(self, kind: str, identifier: str, expires_at: float) -> None:
+        client = await get_client()
+        message = json.dumps({"kind": kind, "id": identifier, "exp": expires_at})
+        await client.publish(CHANNEL, message)
+
+    async def revoke(self, jti: str, expires_at: float) -> None:
+        await self.claim(jti, expires_at)
+
+    async def claim(self, jti: str, expires_at: float) -> bool:
+        """Mark ``jti`` as used; returns ``False`` if it was already used or revoked."""
+
+        now = time.time()
+        if self._jtis.get(jti, 0.0) > now:
+            return False
+        ttl = max(1, int(expires_at - now))
+        self._remember("jti", jti, expires_at)
+        try:
+            client = await get_client()
+            claimed = await client.set(f"{JTI_PREFIX}{jti}", "1", ex=ttl, nx=True)
+            if not claimed:
+                return False
+            await self._publish("jti", jti, expires_at)
+        except RedisError as exc:
+            logger.warning("token_revocation_redis_unavailable", error=str(exc))
+        return True
+
+    async def revoke_family(self, family: str) -> None:
+        expires_at = time.time() + self.family_ttl_seconds
+        self._remember("family", family, expires_at)
+        try:
+            client = await get_client()
+            await client.set(f"{FAMILY_PREFIX}{family}", "1", ex=self.family_ttl_seconds)
+            await self._publish("family", family, expires_at)
+        except RedisError as exc:
+            logger.warning("token_revocation_redis_unavailable", error=str(exc))
+
+    async def _load_snapshot(self) -> None:
+        client = await get_client()
+        now = time.time()
+        for kind, prefix in (("jti", JTI_PREFIX), ("family", FAMILY_PREFIX)):
+            async for key in client.scan_iter(match=f"{prefix}*", count=500):
+                ttl = await client.ttl(key)
+                if ttl > 0:
+                    self._remember(kind, key.removeprefix(prefix), now + ttl)
+
+    async def _listen(self) -> None:
+        while True:
+            try:
+                client = await get_client()
+                async with client.pubsub() as pubsub:
+                    await pubsub.subscribe(CHANNEL)
+                    await self._load_snapshot()
+                    async for message in pubsub.listen():
+                        if message.get("type") != "message":
+                            continue
+                        data = json.loads(message["data"])
+                        self._remember(data["kind"], data["id"], float(data["exp"]))
+            except asyncio.CancelledError:
+                raise
+            except (RedisError, ValueError, KeyError) as exc:
+                logger.warning("token_revocation_listener_error", error=str(exc))
+                await asyncio.sleep(5)
+
+    def start(self) -> None:
+        if self._listener is None or self._listener.done():
+            self._listener = asyncio.get_running_loop().create_task(self._listen())
+
+    async def stop(self) -> None:
+        if self._listener is not None:
+            self._listener.cancel()
+            with contextlib.suppress(asyncio.CancelledError):
+                await self._listener
+            self._listener = None
+
+    def prune(self) -> None:
+        now = time.time()
+        for kind, target in (("jti", self._jtis), ("family", self._families)):
+            for identifier in [key for key, expiry in target.items() if expiry <= now]:
+                del target[identifier]
+            REVOKED_ENTRIES.labels(kind=kind).set(len(target))
+
+
+revocation_list = RevocationList(family_ttl_seconds=settings.refresh_token_expire_minutes * 60)
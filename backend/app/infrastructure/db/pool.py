@@ -0,0 +1,93 @@
+from __future__ import annotations
+
+import time
+from typing import Any
+
+from prometheus_client import Counter, Gauge, Histogram
+from sqlalchemy import exc, text
+from sqlalchemy.ext.asyncio import AsyncEngine
+from sqlalchemy.pool import AsyncAdaptedQueuePool
+
+from app.core.logging import get_logger
+
+logger = get_logger(__name__)
+
+POOL_CHECKED_OUT = Gauge(
+    "db_pool_checked_out",
+    "Connections currently checked out of the pool",
+    labelnames=("pool",),
+)
+POOL_OVERFLOW = Gauge(
+    "db_pool_overflow",
+    "Connections open beyond pool_size (negative while the pool is still filling)",
+    labelnames=("pool",),
+)
+POOL_SIZE = Gauge(
+    "db_pool_size",
+    "Configured pool_size",
+    labelnames=("pool",),
+)
+POOL_CHECKOUT_WAIT = Histogram(
+    "db_pool_checkout_wait_seconds",
+    "Time spent obtaining a connection from the pool",
+    labelnames=("pool",),
+    buckets=(0.0005, 0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30),
+)
+POOL_TIMEOUTS = Counter(
+    "db_pool_timeouts_total",
+    "Checkouts that gave up after pool_timeout",
+    labelnames=("pool",),
+)
+POOL_PROBE_FAILURES = Counter(
+    "db_pool_probe_failures_total",
+    "Background liveness probes that failed",
+    labelnames=("pool",),
+)
+
+
+class InstrumentedQueuePool(AsyncAdaptedQueuePool):
+    """``AsyncAdaptedQueuePool`` that reports checkout latency and timeouts.
+
+    The pool is labelled with its ``logging_name`` (``pool_logging_name`` on
+    the engine), which survives ``dispose()``/``recreate()``.
+    """
+
+    @property
+    def metrics_name(self) -> str:
+        return self._orig_logging_name or "default"
+
+    def connect(self) -> Any:
+        start = time.perf_counter()
+        try:
+            return super().connect()
+        except exc.TimeoutError:
+            POOL_TIMEOUTS.labels(pool=self.metrics_name).inc()
+            raise
+        finally:
+            POOL_CHECKOUT_WAIT.labels(pool=self.metrics_name).observe(time.perf_counter() - start)
+
+
+def instrument_engine(engine: AsyncEngine, name: str) -> None:
+    """Export pool occupancy gauges for ``engine``; evaluated at scrape time."""
+
+    if not isinstance(engine.pool, InstrumentedQueuePool):
+        return
+    POOL_CHECKED_OUT.labels(pool=name).set_function(lambda: engine.pool.checkedout())
+    POOL_OVERFLOW.labels(pool=name).set_function(lambda: engine.pool.overflow())
+    POOL_SIZE.labels(pool=name).set_function(lambda: engine.pool.size())
+
+
+async def probe_engine(engine: AsyncEngine, name: str) -> None:
+    """Ping the database through the pool.
+
+    Used instead of ``pool_pre_ping`` on every checkout: when the server has
+    dropped connections, the disconnect seen here makes SQLAlchemy invalidate
+    the whole pool, so requests get fresh connections instead of dead ones.
+    """
+
+    try:
+        async with engine.connect() as conn:
+            await conn.execute(text("SELECT 1"))
+    except (exc.SQLAlchemyError, OSError) as error:
+        POOL_PROBE_FAILURES.labels(pool=name).inc()
+        logger.warning("db_pool_probe_failed", pool=name, error=str(error))
@@ -0,0 +1,193 @@
+from __future__ import annotations
+
+import itertools
+import time
+from collections.abc import Sequence
+
+from prometheus_client import Counter, Gauge
+from redis.exceptions import RedisError
+from sqlalchemy import text
+from sqlalchemy.engine import make_url
+from sqlalchemy.exc import SQLAlchemyError
+from sqlalchemy.ext.asyncio import (
+    AsyncConnection,
+    AsyncEngine,
+    async_sessionmaker,
+    create_async_engine,
+)
+from sqlmodel.ext.asyncio.session import AsyncSession
+
+from app.core.config import settings
+from app.core.logging import get_logger
+from app.infrastructure.cache.redis import get_client
+from app.infrastructure.observability.slow_queries import slow_query_log
+
+from .pool import instrument_engine
+from .session import _build_engine_kwargs
+
+logger = get_logger(__name__)
+
+READ_ROUTING = Counter(
+    "db_read_routing_total",
+    "Read sessions by target database and reason",
+    labelnames=("target", "reason"),
+)
+REPLICA_HEALTHY = Gauge(
+    "db_replica_healthy",
+    "Whether a read replica is currently eligible for reads",
+    labelnames=("replica",),
+)
+REPLICA_LAG = Gauge(
+    "db_replica_lag_seconds",
+    "Replication lag reported by a read replica",
+    labelnames=("replica",),
+)
+
+
+async def _replication_lag(conn: AsyncConnection) -> float | None:
+    """Seconds behind the primary, or ``None`` when the backend does not say."""
+
+    backend = conn.dialect.name
+    if backend == "mysql":
+        for statement, column in (
+            ("SHOW REPLICA STATUS", "Seconds_Behind_Source"),
+            ("SHOW SLAVE STATUS", "Seconds_Behind_Master"),
+        ):
+            try:
+                row = (await conn.execute(text(statement))).mappings().first()
+            except SQLAlchemyError:
+                continue
+            if row is None:
+                return None
+            lag = row.get(column)
+            # NULL means replication is stopped; treat it as unbounded lag.
+            return float(lag) if lag is not None else float("inf")
+        return None
+    if backend == "postgresql":
+        lag = (
+            await conn.execute(
+                text("SELECT EXTRACT(EPOCH FROM now() - pg_last_xact_replay_timestamp())")
+            )
+        ).scalar()
+        return float(lag) if lag is not None else None
+    await conn.execute(text("SELECT 1"))
+    return None
+
+
+class _Replica:
+    def __init__(self, url: str) -> None:
+        sa_url = make_url(url)
+        self.name = f"{sa_url.host or 'local'}:{sa_url.port or ''}/{sa_url.database or ''}"
+        self.engine: AsyncEngine = create_async_engine(
+            url, **_build_engine_kwargs(url, name=f"replica:{self.name}")
+        )
+        instrument_engine(self.engine, f"replica:{self.name}")
+        slow_query_log.register_engine(self.engine)
+        self.sessions = async_sessionmaker(self.engine, expire_on_commit=False, class_=AsyncSession)
+        self.healthy = True
+        REPLICA_HEALTHY.labels(replica=self.name).set(1)
+
+    def mark(self, healthy: bool, reason: str) -> None:
+        if healthy != self.healthy:
+            logger.warning(
+                "db_replica_state_changed", replica=self.name, healthy=healthy, reason=reason
+            )
+        self.healthy = healthy
+        REPLICA_HEALTHY.labels(replica=self.name).set(int(healthy))
+
+
+class ReplicaSet:
+    """Read replicas chosen round-robin among those passing health checks.
+
+    ``check`` (run by the scheduler) takes a replica out of rotation when it
+    is unreachable or lags more than ``max_lag_seconds``; a failure seen
+    while serving a request does the same until the next successful check.
+    """
+
+    def __init__(self, urls: Sequence[str], max_lag_seconds: float) -> None:
+        self.max_lag_seconds = max_lag_seconds
+        self.replicas = [_Replica(url) for url in urls]
+        self._cursor = itertools.cycle(range(len(self.replicas))) if self.replicas else None
+
+    @property
+    def enabled(self) -> bool:
+        return bool(self.replicas)
+
+    def pick(self) -> _Replica | None:
+        if self._cursor is None:
+            return None
+        for _ in range(len(self.replicas)):
+            replica = self.replicas[next(self._cursor)]
+            if replica.healthy:
+                return replica
+        return None
+
+    async def check(self) -> None:
+        for replica in self.replicas:
+            try:
+                async with replica.engine.connect() as conn:
+                    lag = await _replication_lag(conn)
+            except (SQLAlchemyError, OSError) as exc:
+                replica.mark(False, f"unreachable: {exc}")
+                continue
+            if lag is not None:
+                REPLICA_LAG.labels(replica=replica.name).set(lag)
+                if lag > self.max_lag_seconds:
+                    replica.mark(False, f"lagging {lag:.1f}s")
+                    continue
+            replica.mark(True, "ok")
+
+    async def dispose(self) -> None:
+        for replica in self.replicas:
+            await replica.engine.dispose()
+
+
+class ReadYourWrites:
+    """Routes a user's reads to the primary for a short window after they write.
+
+    The worker that handled the write knows immediately; other workers learn
+    through a Redis key with the same TTL. Without Redis only the local view
+    is used, so a Redis outage does not move every read to the primary.
+    """
+
+    def __init__(self, window_seconds: float, max_entries: int = 10000) -> None:
+        self.window_seconds = window_seconds
+        self.max_entries = max_entries
+        self._until: dict[str, float] = {}
+
+    @staticmethod
+    def _key(subject: str) -> str:
+        return f"rw-sticky:{subject}"
+
+    def mark_local(self, subject: str) -> None:
+        now = time.monotonic()
+        if len(self._until) >= self.max_entries:
+            self._until = {key: until for key, until in self._until.items() if until > now}
+        self._until[subject] = now + self.window_seconds
+
+    async def publish(self, subject: str) -> None:
+        try:
+            client = await get_client()
+            await client.set(self._key(subject), "1", px=int(self.window_seconds * 1000))
+        except RedisError as exc:
+            logger.warning("read_your_writes_publish_failed", error=str(exc))
+
+    def is_sticky_locally(self, subject: str) -> bool:
+        return self._until.get(subject, 0.0) > time.monotonic()
+
+    async def is_sticky(self, subject: str) -> bool:
+        if self.is_sticky_locally(subject):
+            return True
+        try:
+            client = await get_client()
+            return bool(await client.exists(self._key(subject)))
+        except RedisError as exc:
+            logger.warning("read_your_writes_unavailable", error=str(exc))
+            return False
+
+
+replica_set = ReplicaSet(
+    settings.async_read_database_urls,
+    max_lag_seconds=settings.read_replica_max_lag_seconds,
+)
+read_your_writes = ReadYourWrites(window_seconds=settings.read_replica_sticky_seconds)
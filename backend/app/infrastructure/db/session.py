@@ -3,38 +3,54 @@ from __future__ import annotations
 from collections.abc import AsyncGenerator
 from typing import Any
 
-from sqlmodel import SQLModel
+from sqlmodel import Session, SQLModel
 from sqlmodel.ext.asyncio.session import AsyncSession
+from sqlalchemy import event
 from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
 from sqlalchemy.engine import make_url
 from sqlalchemy.pool import NullPool
 
 from app.core.config import settings
 from app.core.logging import get_logger
+from app.infrastructure.observability.slow_queries import slow_query_log
+
+from .pool import InstrumentedQueuePool, instrument_engine
 
 logger = get_logger(__name__)
 
 
-def _build_engine_kwargs(url: str) -> dict[str, Any]:
+def _pool_kwargs(name: str) -> dict[str, Any]:
+    return {
+        "poolclass": InstrumentedQueuePool,
+        "pool_logging_name": name,
+        "pool_size": settings.db_pool_size,
+        "max_overflow": settings.db_max_overflow,
+        "pool_timeout": settings.db_pool_timeout_seconds,
+        "pool_recycle": settings.db_pool_recycle_seconds,
+        "pool_pre_ping": settings.db_pool_pre_ping,
+    }
+
+
+def _build_engine_kwargs(url: str, name: str = "primary") -> dict[str, Any]:
     sa_url = make_url(url)
     kwargs: dict[str, Any] = {"echo": False, "future": True}
     connect_args: dict[str, Any] = {}
 
     if sa_url.get_backend_name() == "postgresql":
-        kwargs["pool_pre_ping"] = True
+        kwargs.update(_pool_kwargs(name))
         hostname = sa_url.host or ""
         sslmode = sa_url.query.get("sslmode")
 
         if hostname.endswith("neon.tech"):
-            kwargs["poolclass"] = NullPool
+            # Neon pools server-side; keep no client-side pool at all.
+            kwargs = {"echo": False, "future": True, "poolclass": NullPool}
             connect_args["ssl"] = True
 
         if isinstance(sslmode, str) and sslmode.lower() == "require":
             connect_args.setdefault("ssl", True)
 
     elif sa_url.get_backend_name() == "mysql":
-        kwargs["pool_pre_ping"] = True
-        kwargs.setdefault("pool_recycle", 3600)
+        kwargs.update(_pool_kwargs(name))
         if "charset" not in sa_url.query:
             connect_args.setdefault("charset", "utf8mb4")
 
@@ -44,8 +60,39 @@ def _build_engine_kwargs(url: str) -> dict[str, Any]:
     return kwargs
 
 
+class PrimarySession(Session):
+    """Sync session behind primary ``AsyncSession``s; records committed writes.
+
+    ``info["wrote"]`` is set once a flush has been committed, which lets the
+    request layer send the author's next reads to the primary.
+    """
+
+
+@event.listens_for(PrimarySession, "after_flush")
+def _flag_pending_write(session: Session, flush_context: Any) -> None:
+    session.info["pending_write"] = True
+
+
+@event.listens_for(PrimarySession, "after_commit")
+def _flag_committed_write(session: Session) -> None:
+    if session.info.pop("pending_write", False):
+        session.info["wrote"] = True
+        callback = session.info.get("on_write")
+        if callback is not None:
+            callback()
+
+
+@event.listens_for(PrimarySession, "after_rollback")
+def _clear_pending_write(session: Session) -> None:
+    session.info.pop("pending_write", None)
+
+
 engine = create_async_engine(settings.async_database_url, **_build_engine_kwargs(settings.async_database_url))
-AsyncSessionLocal = async_sessionmaker(engine, expire_on_commit=False, class_=AsyncSession)
+instrument_engine(engine, "primary")
+slow_query_log.register_engine(engine)
+AsyncSessionLocal = async_sessionmaker(
+    engine, expire_on_commit=False, class_=AsyncSession, sync_session_class=PrimarySession
+)
 
 
 async def get_session() -> AsyncGenerator[AsyncSession, None]:
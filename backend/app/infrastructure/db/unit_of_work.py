@@ -0,0 +1,80 @@
+from __future__ import annotations
+
+from collections.abc import AsyncIterator, Awaitable, Callable
+from contextlib import asynccontextmanager
+
+from sqlmodel.ext.asyncio.session import AsyncSession
+
+from app.core.logging import get_logger
+
+logger = get_logger(__name__)
+
+AfterCommit = Callable[[], Awaitable[None]]
+
+
+@asynccontextmanager
+async def unit_of_work(session: AsyncSession) -> AsyncIterator[AsyncSession]:
+    """Commit ``session`` once when the block exits cleanly, roll back otherwise.
+
+    Services running inside a unit of work only ``flush``; the owner of the
+    session (the request dependency, a job or a script) commits. Work queued
+    with :func:`on_commit` runs after that commit, so cache invalidations can
+    never be overtaken by a reader repopulating the cache with the old rows;
+    work queued with :func:`on_rollback` runs only if the block fails.
+    """
+
+    info = session.sync_session.info
+    info["unit_of_work"] = True
+    callbacks: list[AfterCommit] = info.setdefault("after_commit", [])
+    rollback_callbacks: list[AfterCommit] = info.setdefault("after_rollback", [])
+    try:
+        yield session
+        if session.in_transaction() or session.new or session.dirty or session.deleted:
+            await session.commit()
+    except BaseException:
+        callbacks.clear()
+        await session.rollback()
+        await _run(rollback_callbacks, "after_rollback_callback_failed")
+        raise
+    finally:
+        info.pop("unit_of_work", None)
+
+    rollback_callbacks.clear()
+    # The data is committed; never fail the request here.
+    await _run(callbacks, "after_commit_callback_failed")
+
+
+async def _run(callbacks: list[AfterCommit], event: str) -> None:
+    pending = list(callbacks)
+    callbacks.clear()
+    for callback in pending:
+        try:
+            await callback()
+        except Exception as exc:
+            logger.warning(event, error=str(exc))
+
+
+async def on_commit(session: AsyncSession, callback: AfterCommit) -> None:
+    """Run ``callback`` after the surrounding unit of work commits.
+
+    Outside a unit of work the caller owns the transaction, so the callback
+    runs straight away.
+    """
+
+    info = session.sync_session.info
+    if info.get("unit_of_work"):
+        info["after_commit"].append(callback)
+    else:
+        await callback()
+
+
+async def on_rollback(session: AsyncSession, callback: AfterCommit) -> None:
+    """Run ``callback`` if the surrounding unit of work rolls back instead.
+
+    Outside a unit of work nobody reports the outcome, so the callback is
+    dropped.
+    """
+
+    info = session.sync_session.info
+    if info.get("unit_of_work"):
+        info["after_rollback"].append(callback)
@@ -0,0 +1,378 @@
+from __future__ import annotations
+
+import asyncio
+import contextlib
+import fcntl
+import json
+import os
+import time
+import uuid
+from collections.abc import Iterable, Sequence
+from datetime import datetime
+from functools import partial
+from pathlib import Path
+from typing import IO, Any
+
+from prometheus_client import Counter, Gauge, Histogram
+from sqlalchemy import select
+from sqlalchemy.exc import DBAPIError, OperationalError, SQLAlchemyError
+from sqlmodel.ext.asyncio.session import AsyncSession
+
+from app.core.config import settings
+from app.core.logging import get_logger
+from app.domain.models import QuizAttempt
+from app.infrastructure.db.session import engine
+from app.infrastructure.db.unit_of_work import on_commit
+
+logger = get_logger(__name__)
+
+WRITE_BEHIND_PENDING = Gauge(
+    "quiz_attempt_buffer_pending",
+    "Quiz attempts acknowledged but not yet inserted",
+)
+WRITE_BEHIND_FLUSHES = Counter(
+    "quiz_attempt_buffer_flushes_total",
+    "Bulk inserts of buffered quiz attempts",
+    labelnames=("trigger", "result"),
+)
+WRITE_BEHIND_BATCH = Histogram(
+    "quiz_attempt_buffer_batch_rows",
+    "Rows written per bulk insert",
+    buckets=(1, 10, 50, 100, 250, 500, 1000, 2500, 5000),
+)
+WRITE_BEHIND_REJECTED = Counter(
+    "quiz_attempt_buffer_rejected_total",
+    "Answers refused because the attempt buffer was full",
+)
+WRITE_BEHIND_JOURNAL_ERRORS = Counter(
+    "quiz_attempt_journal_errors_total",
+    "Journal writes that failed, leaving buffered attempts only in memory",
+)
+WRITE_BEHIND_DEAD_LETTERS = Counter(
+    "quiz_attempt_buffer_dead_letters_total",
+    "Buffered attempts the database refused, moved to the rejected file",
+)
+WRITE_BEHIND_STALLS = Counter(
+    "quiz_attempt_buffer_backpressure_total",
+    "Writes that had to wait for a flush before entering the buffer",
+)
+
+_COLUMNS = (
+    "id",
+    "created_at",
+    "updated_at",
+    "session_id",
+    "question_id",
+    "selected_option_id",
+    "is_correct",
+)
+
+
+class AttemptBufferFull(Exception):
+    """Raised when the attempt buffer cannot take more rows until the database catches up."""
+
+    def __init__(self, retry_after: int) -> None:
+        super().__init__("Quiz attempt buffer is full")
+        self.retry_after = retry_after
+
+
+def _transient(exc: SQLAlchemyError) -> bool:
+    """Whether retrying the same rows later can succeed (database down, lost connection)."""
+
+    return isinstance(exc, OperationalError) or (
+        isinstance(exc, DBAPIError) and exc.connection_invalidated
+    )
+
+
+def _row(attempt: QuizAttempt) -> dict[str, Any]:
+    return {column: getattr(attempt, column) for column in _COLUMNS}
+
+
+def _dump(row: dict[str, Any]) -> str:
+    return json.dumps(
+        {
+            key: value.isoformat()
+            if isinstance(value, datetime)
+            else str(value)
+            if isinstance(value, uuid.UUID)
+            else value
+            for key, value in row.items()
+        }
+    )
+
+
+def _load(line: str) -> dict[str, Any]:
+    raw = json.loads(line)
+    return {
+        "id": uuid.UUID(raw["id"]),
+        "created_at": datetime.fromisoformat(raw["created_at"]),
+        "updated_at": datetime.fromisoformat(raw["updated_at"]),
+        "session_id": uuid.UUID(raw["session_id"]),
+        "question_id": uuid.UUID(raw["question_id"]),
+        "selected_option_id": uuid.UUID(raw["selected_option_id"])
+        if raw["selected_option_id"]
+        else None,
+        "is_correct": raw["is_correct"],
+    }
+
+
+class _Segment:
+    """One journal file, locked for as long as this process may still need it."""
+
+    def __init__(self, path: Path) -> None:
+        self.path = path
+        self.handle: IO[str] = path.open("a", encoding="utf-8")
+        fcntl.flock(self.handle, fcntl.LOCK_EX | fcntl.LOCK_NB)
+
+    def append(self, lines: Iterable[str], fsync: bool) -> None:
+        self.handle.writelines(f"{line}\n" for line in lines)
+        self.handle.flush()
+        if fsync:
+            os.fsync(self.handle.fileno())
+
+    def discard(self) -> None:
+        self.path.unlink(missing_ok=True)
+        self.handle.close()
+
+    def release(self) -> None:
+        self.handle.close()
+
+
+class AttemptWriteBehind:
+    """Bounded write-behind buffer for ``QuizAttempt`` rows.
+
+    Rows are appended to a journal and the in-memory queue once the request's
+    transaction commits, and are inserted in bulk when ``flush_size`` rows are
+    waiting or every ``flush_interval`` seconds. Each flush rotates the
+    journal, and the rotated segment is deleted only after the insert
+    commits. Segments left by a crashed worker are replayed on startup;
+    rows that had already been inserted are skipped by id.
+
+    A batch that fails with a transient error is retried whole on the next
+    flush. Any other error retries it row by row, and rows the database
+    still refuses (a missing session, a duplicate id) are logged and moved
+    to ``rejected-<pid>.jsonl`` in the journal directory, so one bad row
+    cannot block the buffer.
+
+    When ``max_pending`` rows are waiting, writers first wait for a flush
+    and are refused with :class:`AttemptBufferFull` if the database is still
+    behind.
+    """
+
+    def __init__(
+        self,
+        journal_dir: str | None,
+        flush_size: int,
+        flush_interval: float,
+        max_pending: int,
+        fsync: bool = False,
+        retry_after: int = 5,
+    ) -> None:
+        self.journal_dir = Path(journal_dir) if journal_dir else None
+        self.flush_size = flush_size
+        self.flush_interval = flush_interval
+        self.max_pending = max_pending
+        self.fsync = fsync
+        self.retry_after = retry_after
+        self._pending: list[dict[str, Any]] = []
+        self._segment: _Segment | None = None
+        self._retained: list[_Segment] = []
+        self._lock = asyncio.Lock()
+        self._wake = asyncio.Event()
+        self._task: asyncio.Task[None] | None = None
+
+    def __len__(self) -> int:
+        return len(self._pending)
+
+    def _journal(self, lines: list[str]) -> None:
+        if self.journal_dir is None:
+            return
+        if self._segment is None:
+            self.journal_dir.mkdir(parents=True, exist_ok=True)
+            self._segment = _Segment(
+                self.journal_dir / f"attempts-{os.getpid()}-{time.time_ns()}.jsonl"
+            )
+        self._segment.append(lines, self.fsync)
+
+    def _append(self, rows: list[dict[str, Any]]) -> None:
+        try:
+            self._journal([_dump(row) for row in rows])
+        except OSError as exc:
+            # Still insert them; only the crash protection is lost.
+            WRITE_BEHIND_JOURNAL_ERRORS.inc()
+            logger.error("quiz_attempt_journal_failed", rows=len(rows), error=str(exc))
+        self._pending.extend(rows)
+        WRITE_BEHIND_PENDING.set(len(self._pending))
+        if len(self._pending) >= self.flush_size:
+            self._wake.set()
+
+    async def reserve(self, count: int) -> None:
+        """Make room for ``count`` rows, waiting for a flush when the buffer is full."""
+
+        if len(self._pending) + count <= self.max_pending:
+            return
+        WRITE_BEHIND_STALLS.inc()
+        await self.flush(trigger="backpressure")
+        if len(self._pending) + count > self.max_pending:
+            WRITE_BEHIND_REJECTED.inc()
+            raise AttemptBufferFull(self.retry_after)
+
+    async def add(self, session: AsyncSession, attempts: Sequence[QuizAttempt]) -> None:
+        """Queue ``attempts`` for insertion once ``session`` commits.
+
+        The rows are journaled before the response is sent, so an answer the
+        client saw acknowledged survives a crash of this worker.
+        """
+
+        if not attempts:
+            return
+        await self.reserve(len(attempts))
+        rows = [_row(attempt) for attempt in attempts]
+        await on_commit(session, partial(self._commit, rows))
+
+    async def _commit(self, rows: list[dict[str, Any]]) -> None:
+        self._append(rows)
+
+    async def flush(self, trigger: str = "manual") -> int:
+        async with self._lock:
+            if not self._pending:
+                return 0
+            rows, self._pending = self._pending, []
+            segment, self._segment = self._segment, None
+            if segment is not None:
+                self._retained.append(segment)
+            written, left = await self._write(rows)
+            if left:
+                self._pending[:0] = left
+                WRITE_BEHIND_PENDING.set(len(self._pending))
+                WRITE_BEHIND_FLUSHES.labels(trigger=trigger, result="error").inc()
+                return 0
+            for retained in self._retained:
+                retained.discard()
+            self._retained.clear()
+            WRITE_BEHIND_PENDING.set(len(self._pending))
+            WRITE_BEHIND_FLUSHES.labels(trigger=trigger, result="ok").inc()
+            WRITE_BEHIND_BATCH.observe(written)
+            return written
+
+    async def _write(self, rows: list[dict[str, Any]]) -> tuple[int, list[dict[str, Any]]]:
+        """Insert ``rows``; returns how many were written and the rows to retry later.
+
+        Rows the database refuses for themselves are dead-lettered instead
+        of retried.
+        """
+
+        try:
+            await self._insert(rows)
+            return len(rows), []
+        except SQLAlchemyError as exc:
+            if _transient(exc):
+                logger.error("quiz_attempt_flush_failed", rows=len(rows), error=str(exc))
+                return 0, rows
+            logger.warning("quiz_attempt_batch_refused", rows=len(rows), error=str(exc))
+        written = 0
+        for index, row in enumerate(rows):
+            try:
+                await self._insert([row])
+            except SQLAlchemyError as exc:
+                if _transient(exc):
+                    logger.error("quiz_attempt_flush_failed", rows=len(rows), error=str(exc))
+                    return written, rows[index:]
+                self._dead_letter(row, exc)
+                continue
+            written += 1
+        return written, []
+
+    def _dead_letter(self, row: dict[str, Any], exc: SQLAlchemyError) -> None:
+        WRITE_BEHIND_DEAD_LETTERS.inc()
+        error = str(exc.orig) if isinstance(exc, DBAPIError) else str(exc)
+        logger.error(
+            "quiz_attempt_dead_lettered",
+            attempt_id=str(row["id"]),
+            session_id=str(row["session_id"]),
+            error=error,
+        )
+        if self.journal_dir is None:
+            return
+        try:
+            self.journal_dir.mkdir(parents=True, exist_ok=True)
+            path = self.journal_dir / f"rejected-{os.getpid()}.jsonl"
+            with path.open("a", encoding="utf-8") as handle:
+                handle.write(f"{_dump(row | {'error': error})}\n")
+        except OSError as os_exc:
+            WRITE_BEHIND_JOURNAL_ERRORS.inc()
+            logger.error("quiz_attempt_dead_letter_failed", error=str(os_exc))
+
+    async def _insert(self, rows: list[dict[str, Any]]) -> None:
+        async with engine.begin() as conn:
+            await conn.execute(QuizAttempt.__table__.insert(), rows)
+
+    async def replay(self) -> int:
+        """Insert rows journaled by workers that died before flushing them."""
+
+        if self.journal_dir is None or not self.journal_dir.exists():
+            return 0
+        replayed = 0
+        for path in sorted(self.journal_dir.glob("attempts-*.jsonl")):
+            try:
+                segment = _Segment(path)
+            except BlockingIOError:
+                continue  # a live worker still owns it
+            rows = [_load(line) for line in path.read_text(encoding="utf-8").splitlines() if line]
+            async with engine.connect() as conn:
+                existing = set()
+                for start in range(0, len(rows), 500):
+                    ids = [row["id"] for row in rows[start : start + 500]]
+                    result = await conn.execute(
+                        select(QuizAttempt.__table__.c.id).where(
+                            QuizAttempt.__table__.c.id.in_(ids)
+                        )
+                    )
+                    existing.update(result.scalars())
+            missing = [row for row in rows if row["id"] not in existing]
+            written, left = await self._write(missing) if missing else (0, [])
+            replayed += written
+            if left:
+                # Kept for the next start; rows written now are skipped then.
+                segment.release()
+                break
+            segment.discard()
+        if replayed:
+            logger.warning("quiz_attempt_journal_replayed", rows=replayed)
+        return replayed
+
+    async def _run(self) -> None:
+        while True:
+            try:
+                await asyncio.wait_for(self._wake.wait(), timeout=self.flush_interval)
+                trigger = "size"
+            except TimeoutError:
+                trigger = "interval"
+            self._wake.clear()
+            await self.flush(trigger=trigger)
+
+    async def start(self) -> None:
+        try:
+            await self.replay()
+        except SQLAlchemyError as exc:
+            # Journals stay on disk for the next start.
+            logger.error("quiz_attempt_journal_replay_failed", error=str(exc))
+        if self._task is None:
+            self._task = asyncio.create_task(self._run())
+
+    async def stop(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            with contextlib.suppress(asyncio.CancelledError):
+                await self._task
+            self._task = None
+        await self.flush(trigger="shutdown")
+
+
+attempt_write_behind = AttemptWriteBehind(
+    journal_dir=settings.quiz_attempt_journal_dir,
+    flush_size=settings.quiz_attempt_flush_size,
+    flush_interval=settings.quiz_attempt_flush_seconds,
+    max_pending=settings.quiz_attempt_buffer_max,
+    fsync=settings.quiz_attempt_journal_fsync,
+)
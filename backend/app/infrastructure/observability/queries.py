@@ -0,0 +1,183 @@
+from __future__ import annotations
+
+import re
+import time
+from collections import Counter
+from collections.abc import Iterator, MutableMapping
+from contextlib import contextmanager
+from contextvars import ContextVar
+from dataclasses import dataclass, field
+from typing import Any
+
+from opentelemetry import trace
+from prometheus_client import Counter as PromCounter
+from prometheus_client import Histogram
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+from starlette.types import ASGIApp, Receive, Scope, Send
+
+from app.core.config import settings
+from app.core.logging import get_logger
+
+from .slow_queries import slow_query_log
+
+logger = get_logger(__name__)
+
+QUERIES_PER_REQUEST = Histogram(
+    "sql_queries_per_request",
+    "SQL statements issued while serving one request",
+    labelnames=("route",),
+    buckets=(0, 1, 2, 3, 5, 8, 13, 21, 34, 55, 89),
+)
+N_PLUS_ONE_WARNINGS = PromCounter(
+    "sql_n_plus_one_warnings_total",
+    "Requests where one statement shape repeated beyond SQL_N_PLUS_ONE_THRESHOLD",
+    labelnames=("route",),
+)
+
+# Runs of bind placeholders ("?, ?, ?" from expanded IN lists) collapse to one
+# so that the same query with a different list length has the same shape.
+_PLACEHOLDER_RUN = re.compile(r"(\?|%s|\$\d+|:\w+)(\s*,\s*(\?|%s|\$\d+|:\w+))+")
+_WHITESPACE = re.compile(r"\s+")
+
+
+def statement_shape(statement: str) -> str:
+    return _PLACEHOLDER_RUN.sub("?", _WHITESPACE.sub(" ", statement).strip())
+
+
+@dataclass
+class QueryStats:
+    """Statements and database time observed in one scope (usually a request).
+
+    Scopes nest: a statement recorded in an inner scope also counts for every
+    enclosing one, which is what lets tests wrap requests in
+    :func:`assert_max_queries`.
+    """
+
+    label: str = ""
+    count: int = 0
+    duration: float = 0.0
+    shapes: Counter[str] = field(default_factory=Counter)
+    parent: QueryStats | None = None
+    warned: set[str] = field(default_factory=set)
+
+    def record(self, shape: str, elapsed: float) -> None:
+        stats: QueryStats | None = self
+        while stats is not None:
+            stats.count += 1
+            stats.duration += elapsed
+            stats.shapes[shape] += 1
+            stats = stats.parent
+
+        if self.shapes[shape] > settings.sql_n_plus_one_threshold and shape not in self.warned:
+            self.warned.add(shape)
+            logger.warning(
+                "sql_n_plus_one_suspected",
+                path=self.label,
+                repeats=self.shapes[shape],
+                statement=shape[:300],
+            )
+
+
+_current: ContextVar[QueryStats | None] = ContextVar("sql_query_stats", default=None)
+
+
+@contextmanager
+def track_queries(label: str = "") -> Iterator[QueryStats]:
+    stats = QueryStats(label=label, parent=_current.get())
+    token = _current.set(stats)
+    try:
+        yield stats
+    finally:
+        _current.reset(token)
+
+
+@contextmanager
+def assert_max_queries(limit: int) -> Iterator[QueryStats]:
+    """Fail when the wrapped block issues more than ``limit`` SQL statements.
+
+    Works around in-process requests (``httpx.ASGITransport``) because the
+    request scope nests inside this one::
+
+        with assert_max_queries(12):
+            await client.post("/v1/auth/register", json=payload)
+    """
+
+    with track_queries("assert_max_queries") as stats:
+        yield stats
+    if stats.count > limit:
+        breakdown = "\n".join(
+            f"  {count}x {shape[:200]}" for shape, count in stats.shapes.most_common()
+        )
+        raise AssertionError(f"Expected at most {limit} queries, got {stats.count}:\n{breakdown}")
+
+
+@event.listens_for(Engine, "before_cursor_execute")
+def _before_cursor_execute(conn: Any, cursor: Any, statement: str, *args: Any) -> None:
+    conn.info.setdefault("query_started_at", []).append(time.perf_counter())
+
+
+@event.listens_for(Engine, "after_cursor_execute")
+def _after_cursor_execute(
+    conn: Any, cursor: Any, statement: str, parameters: Any, *args: Any
+) -> None:
+    started = conn.info.get("query_started_at")
+    if not started:
+        return
+    elapsed = time.perf_counter() - started.pop()
+    stats = _current.get()
+    if stats is None and elapsed * 1000 < slow_query_log.threshold_ms:
+        return
+    shape = statement_shape(statement)
+    if stats is not None:
+        stats.record(shape, elapsed)
+    slow_query_log.observe(conn, statement, parameters, shape, elapsed)
+
+
+@event.listens_for(Engine, "handle_error")
+def _discard_failed_timing(context: Any) -> None:
+    started = context.connection.info.get("query_started_at") if context.connection else None
+    if started:
+        started.pop()
+
+
+def add_query_stats(
+    logger: Any, method_name: str, event_dict: MutableMapping[str, Any]
+) -> MutableMapping[str, Any]:
+    """structlog processor adding the current request's SQL totals to each line."""
+
+    stats = _current.get()
+    if stats is not None and stats.count:
+        event_dict.setdefault("db_queries", stats.count)
+        event_dict.setdefault("db_time_ms", round(stats.duration * 1000, 2))
+    return event_dict
+
+
+class QueryStatsMiddleware:
+    """Tracks SQL statements per HTTP request.
+
+    Totals go to every log line emitted during the request (see
+    :func:`add_query_stats`), to the active trace span and to the
+    ``sql_queries_per_request`` histogram.
+    """
+
+    def __init__(self, app: ASGIApp) -> None:
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        with track_queries(scope.get("path", "")) as stats:
+            try:
+                await self.app(scope, receive, send)
+            finally:
+                route = getattr(scope.get("route"), "path", "unmatched")
+                QUERIES_PER_REQUEST.labels(route=route).observe(stats.count)
+                if stats.warned:
+                    N_PLUS_ONE_WARNINGS.labels(route=route).inc()
+                span = trace.get_current_span()
+                if span.is_recording():
+                    span.set_attribute("db.statement_count", stats.count)
+                    span.set_attribute("db.duration_ms", round(stats.duration * 1000, 2))
@@ -0,0 +1,228 @@
+from __future__ import annotations
+
+import asyncio
+import datetime as dt
+import random
+import re
+import sys
+import uuid
+import weakref
+from collections.abc import Iterator, Mapping, Sequence
+from dataclasses import dataclass
+from types import FrameType
+from typing import Any
+
+import greenlet
+from prometheus_client import Counter
+from sqlalchemy.exc import SQLAlchemyError
+from sqlalchemy.ext.asyncio import AsyncEngine
+
+from app.core.config import settings
+from app.core.logging import get_logger
+
+logger = get_logger(__name__)
+
+SLOW_STATEMENTS = Counter(
+    "sql_slow_statements_total",
+    "Statements slower than SQL_SLOW_QUERY_MS",
+)
+EXPLAINS = Counter(
+    "sql_slow_statement_explains_total",
+    "Sampled EXPLAIN captures for slow statements",
+    labelnames=("result",),
+)
+
+_SENSITIVE_KEY = re.compile(r"password|secret|token|email|hash", re.IGNORECASE)
+_EXPLAIN_PREFIX = {"sqlite": "EXPLAIN QUERY PLAN "}
+
+
+def redact_parameters(parameters: Any) -> Any:
+    """Bind parameters safe to log: numbers, dates and ids stay, text does not.
+
+    Strings are replaced by their length so that a ``LIKE '%term%'`` stays
+    recognisable without logging e-mails, password hashes or tokens; values
+    bound under a sensitive name are dropped whatever their type.
+    """
+
+    if isinstance(parameters, Mapping):
+        return {
+            key: "<redacted>" if _SENSITIVE_KEY.search(str(key)) else _redact_value(value)
+            for key, value in parameters.items()
+        }
+    if isinstance(parameters, Sequence) and not isinstance(parameters, (str, bytes)):
+        return [redact_parameters(value) for value in parameters]
+    return _redact_value(parameters)
+
+
+def _redact_value(value: Any) -> Any:
+    if value is None or isinstance(value, (bool, int, float)):
+        return value
+    if isinstance(value, (uuid.UUID, dt.date, dt.time, dt.timedelta)):
+        return str(value)
+    if isinstance(value, (str, bytes)):
+        return f"<{type(value).__name__}:{len(value)}>"
+    if isinstance(value, (Mapping, list, tuple)):
+        return redact_parameters(value)
+    return f"<{type(value).__name__}>"
+
+
+def _frames() -> Iterator[FrameType]:
+    frame: FrameType | None = sys._getframe(1)
+    while frame is not None:
+        yield frame
+        frame = frame.f_back
+    # Async sessions run the driver call in a child greenlet; the awaiting
+    # service coroutine is on the parent greenlet's (suspended) stack.
+    parent = greenlet.getcurrent().parent
+    frame = parent.gr_frame if parent is not None else None
+    while frame is not None:
+        yield frame
+        frame = frame.f_back
+
+
+def calling_function() -> str | None:
+    """First ``app.domain.services`` function on the stack, else the first app frame."""
+
+    fallback: str | None = None
+    for frame in _frames():
+        module = frame.f_globals.get("__name__", "")
+        if module.startswith("app.domain.services."):
+            return f"{module}.{frame.f_code.co_name}"
+        if fallback is None and module.startswith("app.") and not module.startswith(
+            ("app.infrastructure.", "app.core.")
+        ):
+            fallback = f"{module}.{frame.f_code.co_name}"
+    return fallback
+
+
+@dataclass
+class SlowStatement:
+    shape: str
+    count: int = 0
+    total_ms: float = 0.0
+    max_ms: float = 0.0
+    caller: str | None = None
+    last_seen: dt.datetime | None = None
+    explain: list[str] | None = None
+
+    @property
+    def mean_ms(self) -> float:
+        return self.total_ms / self.count if self.count else 0.0
+
+
+class SlowQueryLog:
+    """Aggregates statements slower than ``threshold_ms`` by shape.
+
+    Each slow statement is logged with redacted parameters and the service
+    function that issued it. A sampled fraction of slow SELECTs is EXPLAINed
+    in a background task on a separate pooled connection, so the request that
+    hit the slow path never waits for the plan. At most ``max_shapes`` shapes
+    are kept; the one with the least accumulated time makes room.
+    """
+
+    def __init__(
+        self,
+        threshold_ms: float,
+        explain_sample_rate: float,
+        max_shapes: int = 500,
+    ) -> None:
+        self.threshold_ms = threshold_ms
+        self.explain_sample_rate = explain_sample_rate
+        self.max_shapes = max_shapes
+        self._shapes: dict[str, SlowStatement] = {}
+        self._engines: weakref.WeakKeyDictionary[Any, AsyncEngine] = weakref.WeakKeyDictionary()
+        self._explaining: set[str] = set()
+        self._tasks: set[asyncio.Task[None]] = set()
+
+    def register_engine(self, engine: AsyncEngine) -> None:
+        """Allow EXPLAIN captures for statements run through ``engine``."""
+
+        self._engines[engine.sync_engine] = engine
+
+    def observe(
+        self,
+        conn: Any,
+        statement: str,
+        parameters: Any,
+        shape: str,
+        elapsed: float,
+    ) -> None:
+        duration_ms = elapsed * 1000
+        if self.threshold_ms <= 0 or duration_ms < self.threshold_ms:
+            return
+        if statement.lstrip()[:7].upper() == "EXPLAIN":
+            return
+
+        caller = calling_function()
+        SLOW_STATEMENTS.inc()
+        logger.warning(
+            "sql_slow_statement",
+            statement=shape[:1000],
+            parameters=redact_parameters(parameters),
+            duration_ms=round(duration_ms, 2),
+            caller=caller,
+        )
+
+        entry = self._shapes.get(shape)
+        if entry is None:
+            if len(self._shapes) >= self.max_shapes:
+                coldest = min(self._shapes.values(), key=lambda item: item.total_ms)
+                del self._shapes[coldest.shape]
+            entry = self._shapes[shape] = SlowStatement(shape=shape)
+        entry.count += 1
+        entry.total_ms += duration_ms
+        entry.max_ms = max(entry.max_ms, duration_ms)
+        entry.caller = caller or entry.caller
+        entry.last_seen = dt.datetime.now(dt.UTC)
+
+        if (
+            statement.lstrip()[:6].upper() == "SELECT"
+            and shape not in self._explaining
+            and random.random() < self.explain_sample_rate
+        ):
+            self._schedule_explain(conn, statement, parameters, entry)
+
+    def _schedule_explain(
+        self, conn: Any, statement: str, parameters: Any, entry: SlowStatement
+    ) -> None:
+        engine = self._engines.get(conn.engine)
+        if engine is None:
+            return
+        try:
+            loop = asyncio.get_running_loop()
+        except RuntimeError:
+            return
+        self._explaining.add(entry.shape)
+        task = loop.create_task(self._explain(engine, statement, parameters, entry))
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+
+    async def _explain(
+        self, engine: AsyncEngine, statement: str, parameters: Any, entry: SlowStatement
+    ) -> None:
+        prefix = _EXPLAIN_PREFIX.get(engine.dialect.name, "EXPLAIN ")
+        try:
+            async with engine.connect() as conn:
+                result = await conn.exec_driver_sql(prefix + statement, parameters)
+                rows = result.fetchall()
+        except (SQLAlchemyError, OSError) as exc:
+            EXPLAINS.labels(result="error").inc()
+            logger.warning("sql_explain_failed", statement=entry.shape[:300], error=str(exc))
+            return
+        finally:
+            self._explaining.discard(entry.shape)
+        EXPLAINS.labels(result="ok").inc()
+        entry.explain = [" | ".join(str(column) for column in row) for row in rows]
+        logger.info("sql_slow_statement_plan", statement=entry.shape[:300], plan=entry.explain)
+
+    def top(self, limit: int = 20) -> list[SlowStatement]:
+        return sorted(self._shapes.values(), key=lambda item: item.total_ms, reverse=True)[:limit]
+
+    def clear(self) -> None:
+        self._shapes.clear()
+
+
+slow_query_log = SlowQueryLog(
+    threshold_ms=settings.sql_slow_query_ms,
+    explain_sample_rate=settings.sql_explain_sample_rate,
+)
@@ -8,6 +8,7 @@ from app.api.error_handlers import register_error_handlers
 from app.api.v1.router import api_router
 from app.core.config import settings
 from app.core.events import on_shutdown, on_startup
+from app.infrastructure.observability.queries import QueryStatsMiddleware
 
 
 def create_app() -> FastAPI:
@@ -21,6 +22,8 @@ def create_app() -> FastAPI:
         allow_headers=["*"],
     )
 
+    app.add_middleware(QueryStatsMiddleware)
+
     app.include_router(api_router, prefix=settings.api_v1_str)
     register_error_handlers(app)
 
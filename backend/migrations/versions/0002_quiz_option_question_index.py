@@ -0,0 +1,18 @@
+"""index quiz_options.question_id"""
+
+from __future__ import annotations
+
+from alembic import op
+
+revision = "0002_quiz_option_question_index"
+down_revision = "0001_initial"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_index("ix_quiz_options_question_id", "quiz_options", ["question_id"])
+
+
+def downgrade() -> None:
+    op.drop_index("ix_quiz_options_question_id", table_name="quiz_options")
@@ -0,0 +1,34 @@
+"""content catalog versions"""
+
+from __future__ import annotations
+
+from datetime import datetime
+
+import sqlalchemy as sa
+from alembic import op
+
+revision = "0003_content_versions"
+down_revision = "0002_quiz_option_question_index"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    content_versions = op.create_table(
+        "content_versions",
+        sa.Column("name", sa.String(length=32), primary_key=True),
+        sa.Column("version", sa.Integer(), nullable=False, server_default="0"),
+        sa.Column("updated_at", sa.DateTime(), nullable=False),
+    )
+    now = datetime.utcnow()
+    op.bulk_insert(
+        content_versions,
+        [
+            {"name": name, "version": 0, "updated_at": now}
+            for name in ("campaigns", "missions", "questions", "anatomy")
+        ],
+    )
+
+
+def downgrade() -> None:
+    op.drop_table("content_versions")
@@ -0,0 +1,35 @@
+"""spaced-repetition review states"""
+
+from __future__ import annotations
+
+import sqlalchemy as sa
+from alembic import op
+
+revision = "0004_review_states"
+down_revision = "0003_content_versions"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        "review_states",
+        sa.Column("id", sa.Uuid(), primary_key=True),
+        sa.Column("created_at", sa.DateTime(), nullable=False),
+        sa.Column("updated_at", sa.DateTime(), nullable=False),
+        sa.Column("user_id", sa.Uuid(), sa.ForeignKey("users.id"), nullable=False),
+        sa.Column("question_id", sa.Uuid(), sa.ForeignKey("quiz_questions.id"), nullable=False),
+        sa.Column("interval_days", sa.Float(), nullable=False),
+        sa.Column("ease", sa.Float(), nullable=False),
+        sa.Column("repetitions", sa.Integer(), nullable=False),
+        sa.Column("lapses", sa.Integer(), nullable=False),
+        sa.Column("due_at", sa.DateTime(), nullable=False),
+        sa.Column("last_reviewed_at", sa.DateTime(), nullable=True),
+        sa.UniqueConstraint("user_id", "question_id", name="uq_review_states_user_question"),
+    )
+    op.create_index("ix_review_states_user_due", "review_states", ["user_id", "due_at"])
+
+
+def downgrade() -> None:
+    op.drop_index("ix_review_states_user_due", table_name="review_states")
+    op.drop_table("review_states")
@@ -0,0 +1,22 @@
+"""elo rating per quiz question"""
+
+from __future__ import annotations
+
+import sqlalchemy as sa
+from alembic import op
+
+revision = "0005_question_elo_rating"
+down_revision = "0004_review_states"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.add_column(
+        "quiz_questions",
+        sa.Column("elo_rating", sa.Integer(), nullable=False, server_default="1200"),
+    )
+
+
+def downgrade() -> None:
+    op.drop_column("quiz_questions", "elo_rating")
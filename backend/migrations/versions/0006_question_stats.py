@@ -0,0 +1,37 @@
+"""offline question calibration statistics"""
+
+from __future__ import annotations
+
+import sqlalchemy as sa
+from alembic import op
+
+revision = "0006_question_stats"
+down_revision = "0005_question_elo_rating"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        "question_stats",
+        sa.Column("id", sa.Uuid(), primary_key=True),
+        sa.Column("created_at", sa.DateTime(), nullable=False),
+        sa.Column("updated_at", sa.DateTime(), nullable=False),
+        sa.Column(
+            "question_id",
+            sa.Uuid(),
+            sa.ForeignKey("quiz_questions.id"),
+            nullable=False,
+            unique=True,
+        ),
+        sa.Column("attempts", sa.Integer(), nullable=False),
+        sa.Column("p_value", sa.Float(), nullable=False),
+        sa.Column("point_biserial", sa.Float(), nullable=True),
+        sa.Column("irt_difficulty", sa.Float(), nullable=True),
+        sa.Column("irt_discrimination", sa.Float(), nullable=True),
+        sa.Column("calibrated_at", sa.DateTime(), nullable=False),
+    )
+
+
+def downgrade() -> None:
+    op.drop_table("question_stats")
@@ -0,0 +1,33 @@
+"""one user_system_progress row per (user, system)"""
+
+from __future__ import annotations
+
+from alembic import op
+
+revision = "0007_user_system_progress_unique"
+down_revision = "0006_question_stats"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    # Concurrent mastery flushes could insert the same pair twice; keep one row.
+    op.execute(
+        """
+        DELETE FROM user_system_progress
+        WHERE id NOT IN (
+            SELECT id FROM (
+                SELECT MIN(id) AS id FROM user_system_progress GROUP BY user_id, system
+            ) AS keep
+        )
+        """
+    )
+    with op.batch_alter_table("user_system_progress") as batch:
+        batch.create_unique_constraint(
+            "uq_user_system_progress_user_system", ["user_id", "system"]
+        )
+
+
+def downgrade() -> None:
+    with op.batch_alter_table("user_system_progress") as batch:
+        batch.drop_constraint("uq_user_system_progress_user_system", type_="unique")
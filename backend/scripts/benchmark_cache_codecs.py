@@ -0,0 +1,129 @@
+"""Compare cache codecs on payloads shaped like the ones the API caches.
+
+Usage: python scripts/benchmark_cache_codecs.py [--iterations 2000]
+"""
+
+from __future__ import annotations
+
+import argparse
+import random
+import time
+import uuid
+from collections.abc import Callable
+from datetime import UTC, datetime
+from typing import Any
+
+from app.infrastructure.cache.codecs import CODECS, decode, encode
+
+SYSTEMS = ["skeletal", "muscular", "nervous", "cardiovascular", "respiratory"]
+
+
+def leaderboard_payload(entries: int = 100) -> dict[str, Any]:
+    return {
+        "id": str(uuid.uuid4()),
+        "scope": "global",
+        "reference_id": None,
+        "generated_at": datetime.now(UTC).isoformat(),
+        "data": {
+            "entries": [
+                {
+                    "user_id": str(uuid.uuid4()),
+                    "display_name": f"Estudante {rank}",
+                    "xp": random.randint(0, 50000),
+                    "streak": random.randint(0, 60),
+                    "rank": rank,
+                    "avatar": None,
+                }
+                for rank in range(1, entries + 1)
+            ]
+        },
+    }
+
+
+def question_bank_payload(questions: int = 200) -> list[dict[str, Any]]:
+    return [
+        {
+            "id": str(uuid.uuid4()),
+            "prompt": f"Qual estrutura anatomica corresponde ao item {index}?",
+            "anatomy_system": random.choice(SYSTEMS),
+            "type": "multiple_choice",
+            "difficulty": random.choice(["easy", "medium", "hard"]),
+            "media_url": None,
+            "options": [
+                {"id": str(uuid.uuid4()), "label": f"Opcao {option}", "is_correct": option == 0}
+                for option in range(4)
+            ],
+        }
+        for index in range(questions)
+    ]
+
+
+def campaigns_payload(campaigns: int = 5) -> list[dict[str, Any]]:
+    now = datetime.now(UTC).isoformat()
+    return [
+        {
+            "id": str(uuid.uuid4()),
+            "title": f"Campanha {index}",
+            "description": "Sequencia completa sobre ossos do quadril, coxa, perna e pe.",
+            "anatomy_system": random.choice(SYSTEMS),
+            "recommended_level": 1,
+            "created_at": now,
+            "updated_at": now,
+            "lessons": [
+                {
+                    "id": str(uuid.uuid4()),
+                    "order": order,
+                    "title": f"Licao {order}",
+                    "content_url": f"https://example.com/licoes/{index}/{order}",
+                    "duration_minutes": 15,
+                    "xp_reward": 120,
+                }
+                for order in range(1, 6)
+            ],
+        }
+        for index in range(campaigns)
+    ]
+
+
+def _timeit(func: Callable[[], Any], iterations: int) -> float:
+    start = time.perf_counter()
+    for _ in range(iterations):
+        func()
+    return (time.perf_counter() - start) / iterations * 1_000_000
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--iterations", type=int, default=2000)
+    args = parser.parse_args()
+
+    random.seed(42)
+    payloads = {
+        "leaderboard(100)": leaderboard_payload(),
+        "question_bank(200)": question_bank_payload(),
+        "campaigns(5)": campaigns_payload(),
+    }
+    variants = [
+        (f"{name}{'+zlib' if threshold else ''}", codec, threshold)
+        for name, codec in CODECS.items()
+        for threshold in (0, 1024)
+    ]
+
+    print(f"{'payload':<20} {'codec':<14} {'bytes':>8} {'encode us':>10} {'decode us':>10}")
+    for payload_name, payload in payloads.items():
+        for label, codec, threshold in variants:
+            data = encode(payload, codec, compression_threshold=threshold)
+            assert decode(data) == payload
+            encode_us = _timeit(
+                lambda: encode(payload, codec, compression_threshold=threshold),  # noqa: B023
+                args.iterations,
+            )
+            decode_us = _timeit(lambda: decode(data), args.iterations)  # noqa: B023
+            print(
+                f"{payload_name:<20} {label:<14} {len(data):>8} "
+                f"{encode_us:>10.1f} {decode_us:>10.1f}"
+            )
+
+
+if __name__ == "__main__":
+    main()
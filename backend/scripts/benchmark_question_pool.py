@@ -0,0 +1,138 @@
+"""Compare ORDER BY random() question sampling with the catalog's packed id index.
+
+Fills a scratch SQLite database (or --database-url, which must point at a
+disposable database) with N questions of 4 options each, then times both ways
+of drawing a quiz ids: the old ``ORDER BY random() LIMIT k`` query and a
+sample from the packed index followed by one keyed query.
+
+Usage: python scripts/benchmark_question_pool.py [--sizes 10000 100000 1000000]
+"""
+
+from __future__ import annotations
+
+import argparse
+import random
+import tempfile
+import time
+import uuid
+from collections.abc import Callable
+from pathlib import Path
+from typing import Any
+
+from sqlalchemy import create_engine, func
+from sqlalchemy.orm import joinedload, selectinload
+from sqlmodel import Session, SQLModel, select
+
+from app.domain.models import DifficultyLevel, QuestionType, QuizOption, QuizQuestion
+from app.domain.services.question_pool import pack_question_ids, sample_question_ids
+
+SYSTEMS = ["skeletal", "muscular", "nervous", "cardiovascular", "respiratory"]
+BATCH = 20_000
+
+
+def populate(engine: Any, size: int) -> None:
+    SQLModel.metadata.drop_all(engine, tables=[QuizOption.__table__, QuizQuestion.__table__])
+    SQLModel.metadata.create_all(engine, tables=[QuizQuestion.__table__, QuizOption.__table__])
+    with engine.begin() as conn:
+        for start in range(0, size, BATCH):
+            questions = []
+            options = []
+            for index in range(start, min(start + BATCH, size)):
+                question_id = uuid.uuid4()
+                questions.append(
+                    {
+                        "id": question_id,
+                        "prompt": f"Qual estrutura corresponde ao item {index}?",
+                        "anatomy_system": random.choice(SYSTEMS),
+                        "type": QuestionType.multiple_choice,
+                        "difficulty": random.choice(list(DifficultyLevel)),
+                    }
+                )
+                options.extend(
+                    {
+                        "id": uuid.uuid4(),
+                        "question_id": question_id,
+                        "label": f"Opcao {option}",
+                        "is_correct": option == 0,
+                    }
+                    for option in range(4)
+                )
+            conn.execute(QuizQuestion.__table__.insert(), questions)
+            conn.execute(QuizOption.__table__.insert(), options)
+
+
+def order_by_random(session: Session, system: str, k: int) -> list[QuizQuestion]:
+    query = (
+        select(QuizQuestion)
+        .options(selectinload(QuizQuestion.options))
+        .where(QuizQuestion.anatomy_system == system)
+        .order_by(func.random())
+        .limit(k)
+    )
+    return list(session.exec(query).all())
+
+
+def pooled(session: Session, buckets: Any, system: str, k: int) -> list[QuizQuestion]:
+    ids = sample_question_ids(buckets, [key for key in buckets if key[0] == system], k)
+    query = (
+        select(QuizQuestion)
+        .where(QuizQuestion.id.in_(ids))
+        .options(joinedload(QuizQuestion.options))
+    )
+    return list(session.exec(query).unique().all())
+
+
+def _timeit(func: Callable[[], Any], iterations: int) -> float:
+    start = time.perf_counter()
+    for _ in range(iterations):
+        func()
+    return (time.perf_counter() - start) / iterations * 1000
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--sizes", type=int, nargs="+", default=[10_000, 100_000, 1_000_000])
+    parser.add_argument("--k", type=int, default=10)
+    parser.add_argument("--iterations", type=int, default=20)
+    parser.add_argument("--database-url", default=None)
+    args = parser.parse_args()
+
+    random.seed(42)
+    scratch = tempfile.TemporaryDirectory()
+    url = args.database_url or f"sqlite:///{Path(scratch.name) / 'questions.db'}"
+    engine = create_engine(url)
+
+    print(
+        f"{'questions':>10} {'random ms':>10} {'pool ms':>8} "
+        f"{'build ms':>9} {'index MB':>9}"
+    )
+    for size in args.sizes:
+        populate(engine, size)
+        with Session(engine) as session:
+            start = time.perf_counter()
+            rows = session.exec(
+                select(QuizQuestion.id, QuizQuestion.anatomy_system, QuizQuestion.difficulty)
+            ).all()
+            buckets = pack_question_ids(
+                (question_id, (system, difficulty)) for question_id, system, difficulty in rows
+            )
+            build_ms = (time.perf_counter() - start) * 1000
+            index_mb = sum(len(ids) for ids in buckets.values()) / 1_048_576
+
+            assert len(pooled(session, buckets, "nervous", args.k)) == args.k
+            random_ms = _timeit(
+                lambda: order_by_random(session, "nervous", args.k), args.iterations
+            )
+            session.expunge_all()
+            pool_ms = _timeit(
+                lambda: pooled(session, buckets, "nervous", args.k),  # noqa: B023
+                args.iterations,
+            )
+        print(f"{size:>10} {random_ms:>10.2f} {pool_ms:>8.2f} {build_ms:>9.0f} {index_mb:>9.1f}")
+
+    engine.dispose()
+    scratch.cleanup()
+
+
+if __name__ == "__main__":
+    main()
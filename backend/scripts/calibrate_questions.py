@@ -0,0 +1,22 @@
+from __future__ import annotations
+
+import asyncio
+
+from app.core.config import settings
+from app.domain.services.calibration import calibrate_questions
+from app.infrastructure.db.session import AsyncSessionLocal, engine
+from app.infrastructure.db.unit_of_work import unit_of_work
+
+
+async def main() -> None:
+    print("Using database:", settings.sync_database_url_with_driver)
+    async with AsyncSessionLocal() as session, unit_of_work(session):
+        report = await calibrate_questions(engine, session)
+    print(
+        f"Calibrated {report.questions} questions from {report.rows} attempts "
+        f"in {report.seconds:.1f}s ({report.rows_per_second:,.0f} rows/s over two passes)"
+    )
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
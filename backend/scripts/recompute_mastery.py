@@ -0,0 +1,22 @@
+from __future__ import annotations
+
+import asyncio
+
+from app.core.config import settings
+from app.domain.services.mastery import recompute_mastery
+from app.infrastructure.db.session import AsyncSessionLocal, engine
+from app.infrastructure.db.unit_of_work import unit_of_work
+
+
+async def main() -> None:
+    print("Using database:", settings.sync_database_url_with_driver)
+    async with AsyncSessionLocal() as session, unit_of_work(session):
+        report = await recompute_mastery(engine, session)
+    print(
+        f"Rebuilt mastery of {report.pairs} (user, system) pairs from {report.rows} attempts "
+        f"in {report.seconds:.1f}s ({report.rows_per_second:,.0f} rows/s)"
+    )
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -12,6 +12,9 @@ from app.domain.services import progress as progress_service
 from app.domain.services import users as user_service
 from app.domain.schemas.user import UserCreate
 from app.infrastructure.db.session import AsyncSessionLocal, init_models
+from app.domain.services import catalog
+from app.domain.services.catalog import bump_content_version
+from app.infrastructure.db.unit_of_work import unit_of_work
 
 CAMPAIGNS = [
     {
@@ -199,9 +202,11 @@ async def main() -> None:
     print("Using database:", settings.sync_database_url_with_driver)
     await init_models()
 
-    async with AsyncSessionLocal() as session:
+    async with AsyncSessionLocal() as session, unit_of_work(session):
         await seed_campaigns(session)
         await seed_quiz_questions(session)
+        await bump_content_version(session, catalog.CAMPAIGNS)
+        await bump_content_version(session, catalog.QUESTIONS)
         await seed_users(session)
 
     print("Seed completed.")
@@ -2,8 +2,10 @@ from __future__ import annotations
 
 import asyncio
 import os
+import tempfile
 from collections.abc import AsyncGenerator, Generator
 
+import fakeredis
 import pytest
 from httpx import ASGITransport, AsyncClient
 from sqlalchemy.ext.asyncio import create_async_engine
@@ -26,10 +28,14 @@ os.environ.setdefault("RATE_LIMIT_PER_MINUTE", "1000")
 os.environ.setdefault("DEFAULT_PAGE_SIZE", "20")
 os.environ.setdefault("MAX_PAGE_SIZE", "100")
 os.environ.setdefault("LOG_LEVEL", "INFO")
+os.environ.setdefault("QUIZ_ATTEMPT_JOURNAL_DIR", tempfile.mkdtemp(prefix="quiz-attempts-"))
 
-from app.api.common.rate_limit import rate_limiter
-from app.api.dependencies import get_db_session
+from app.api.common.rate_limit import auth_rate_limiter
+from app.api.dependencies import get_db_session, get_read_session
 from app.core import config
+from app.domain.services.catalog import content_catalog
+from app.infrastructure.cache import quiz_state
+from app.infrastructure.db.unit_of_work import unit_of_work
 from app.main import create_app
 
 config.get_settings.cache_clear()
@@ -49,21 +55,43 @@ def event_loop() -> Generator[asyncio.AbstractEventLoop, None, None]:
 async def prepare_database() -> AsyncGenerator[None, None]:
     async with engine.begin() as conn:
         await conn.run_sync(SQLModel.metadata.create_all)
+    async with AsyncSessionLocal() as session:
+        await content_catalog.refresh(session, preload=True)
     yield
     async with engine.begin() as conn:
         await conn.run_sync(SQLModel.metadata.drop_all)
 
 
+@pytest.fixture(autouse=True)
+def quiz_state_redis(monkeypatch) -> fakeredis.FakeAsyncRedis:
+    """Hot quiz state lives in Redis; every test gets a fresh fake one."""
+
+    client = fakeredis.FakeAsyncRedis(decode_responses=True)
+
+    async def get_client() -> fakeredis.FakeAsyncRedis:
+        return client
+
+    monkeypatch.setattr(quiz_state, "get_client", get_client)
+    quiz_state.quiz_state_store.clear()
+    return client
+
+
 async def override_get_session() -> AsyncGenerator[AsyncSession, None]:
     async with AsyncSessionLocal() as session:
         yield session
 
 
+async def override_get_db_session() -> AsyncGenerator[AsyncSession, None]:
+    async with AsyncSessionLocal() as session, unit_of_work(session):
+        yield session
+
+
 @pytest.fixture()
 async def client(prepare_database) -> AsyncGenerator[AsyncClient, None]:  # type: ignore[override]
     app = create_app()
-    app.dependency_overrides[get_db_session] = override_get_session
-    app.dependency_overrides[rate_limiter] = lambda: None
+    app.dependency_overrides[get_db_session] = override_get_db_session
+    app.dependency_overrides[get_read_session] = override_get_session
+    app.dependency_overrides[auth_rate_limiter] = lambda: None
 
     transport = ASGITransport(app=app)
     async with AsyncClient(transport=transport, base_url="http://test") as async_client:
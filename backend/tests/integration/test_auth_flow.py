@@ -1,7 +1,13 @@
 from __future__ import annotations
 
+import uuid
+
 import pytest
 
+from app.core.security import create_access_token
+from app.infrastructure.cache.principal import principal_cache
+from app.infrastructure.observability.queries import assert_max_queries
+
 
 @pytest.mark.asyncio
 async def test_register_and_login_flow(client):
@@ -11,7 +17,8 @@ async def test_register_and_login_flow(client):
         "display_name": "Estudante",
         "profile_type": "student",
     }
-    response = await client.post("/v1/auth/register", json=register_payload)
+    with assert_max_queries(16):
+        response = await client.post("/v1/auth/register", json=register_payload)
     assert response.status_code == 201
     user_data = response.json()
     assert user_data["email"] == "student@example.com"
@@ -29,8 +36,115 @@ async def test_register_and_login_flow(client):
     assert me_response.status_code == 200
     assert me_response.json()["display_name"] == "Estudante"
 
-    dashboard_response = await client.get("/v1/dashboard/summary", headers=headers)
+    with assert_max_queries(4):
+        dashboard_response = await client.get("/v1/dashboard/summary", headers=headers)
     assert dashboard_response.status_code == 200
     summary = dashboard_response.json()
     assert summary["xp"] == 0
     assert isinstance(summary["missions"], list)
+
+
+@pytest.mark.asyncio
+async def test_profile_update_is_visible_through_principal_cache(client):
+    await client.post(
+        "/v1/auth/register",
+        json={
+            "email": "cached@example.com",
+            "password": "StrongPass123",
+            "display_name": "Antes",
+            "profile_type": "student",
+        },
+    )
+    login_response = await client.post(
+        "/v1/auth/login",
+        json={"email": "cached@example.com", "password": "StrongPass123"},
+    )
+    headers = {"Authorization": f"Bearer {login_response.json()['access_token']}"}
+
+    assert (await client.get("/v1/users/me", headers=headers)).json()["display_name"] == "Antes"
+
+    update_response = await client.patch(
+        "/v1/users/me", json={"display_name": "Depois"}, headers=headers
+    )
+    assert update_response.status_code == 200
+
+    me_response = await client.get("/v1/users/me", headers=headers)
+    assert me_response.json()["display_name"] == "Depois"
+
+
+@pytest.mark.asyncio
+async def test_preference_update_merges_with_row_not_stale_principal(client):
+    await client.post(
+        "/v1/auth/register",
+        json={
+            "email": "prefs@example.com",
+            "password": "StrongPass123",
+            "display_name": "Prefs",
+            "profile_type": "student",
+        },
+    )
+    login_response = await client.post(
+        "/v1/auth/login",
+        json={"email": "prefs@example.com", "password": "StrongPass123"},
+    )
+    headers = {"Authorization": f"Bearer {login_response.json()['access_token']}"}
+    user_id = uuid.UUID((await client.get("/v1/users/me", headers=headers)).json()["id"])
+    stale = await principal_cache.get(user_id)
+
+    await client.post("/v1/users/me/preferences", json={"dark_mode": True}, headers=headers)
+    # Another worker still holds the principal from before the first update.
+    await principal_cache.set(stale)
+    response = await client.post(
+        "/v1/users/me/preferences", json={"language": "pt-BR"}, headers=headers
+    )
+
+    assert response.json()["preferences"] == {"dark_mode": True, "language": "pt-BR"}
+
+
+@pytest.mark.asyncio
+async def test_refresh_rotation_detects_reuse_and_logout_revokes(client):
+    await client.post(
+        "/v1/auth/register",
+        json={
+            "email": "rotation@example.com",
+            "password": "StrongPass123",
+            "display_name": "Rotation",
+            "profile_type": "student",
+        },
+    )
+    tokens = (
+        await client.post(
+            "/v1/auth/login",
+            json={"email": "rotation@example.com", "password": "StrongPass123"},
+        )
+    ).json()
+
+    old_refresh = {"refresh_token": tokens["refresh_token"]}
+    rotated = await client.post("/v1/auth/refresh", json=old_refresh)
+    assert rotated.status_code == 200
+    rotated_tokens = rotated.json()
+    assert rotated_tokens["refresh_token"] != tokens["refresh_token"]
+
+    reused = await client.post("/v1/auth/refresh", json=old_refresh)
+    assert reused.status_code == 401
+    family_revoked = await client.post(
+        "/v1/auth/refresh", json={"refresh_token": rotated_tokens["refresh_token"]}
+    )
+    assert family_revoked.status_code == 401
+
+    fresh = (
+        await client.post(
+            "/v1/auth/login",
+            json={"email": "rotation@example.com", "password": "StrongPass123"},
+        )
+    ).json()
+    headers = {"Authorization": f"Bearer {fresh['access_token']}"}
+    assert (await client.post("/v1/auth/logout", headers=headers)).status_code == 204
+    assert (await client.get("/v1/users/me", headers=headers)).status_code == 401
+
+
+@pytest.mark.asyncio
+async def test_token_with_non_uuid_subject_is_unauthorized(client):
+    headers = {"Authorization": f"Bearer {create_access_token('stack-user')}"}
+    response = await client.get("/v1/users/me", headers=headers)
+    assert response.status_code == 401
@@ -36,3 +36,74 @@ async def test_mission_progress_increment(client):
     assert progress_response.status_code == 200
     progress_data = progress_response.json()
     assert progress_data["progress"] >= 1
+
+
+@pytest.mark.asyncio
+async def test_profile_summary_reflects_mission_progress(client):
+    await client.post(
+        "/v1/auth/register",
+        json={
+            "email": "summary@example.com",
+            "password": "StrongPass123",
+            "display_name": "Summary User",
+            "profile_type": "student",
+        },
+    )
+    login_response = await client.post(
+        "/v1/auth/login",
+        json={"email": "summary@example.com", "password": "StrongPass123"},
+    )
+    headers = {"Authorization": f"Bearer {login_response.json()['access_token']}"}
+
+    summary = (await client.get("/v1/users/me/summary", headers=headers)).json()
+    assert summary["daily_missions_completed"] == 0
+    assert summary["systems_progress"]
+
+    missions = (await client.get("/v1/missions/daily", headers=headers)).json()
+    daily = next(item for item in missions if item["mission"]["frequency"] == "daily")
+    await client.post(
+        f"/v1/missions/{daily['mission']['id']}/progress",
+        json={"increment": daily["mission"]["target"]},
+        headers=headers,
+    )
+
+    summary = (await client.get("/v1/users/me/summary", headers=headers)).json()
+    assert summary["daily_missions_completed"] == 1
+    dashboard = (await client.get("/v1/dashboard/summary", headers=headers)).json()
+    assert len(dashboard["missions"]) == len(missions)
+
+
+@pytest.mark.asyncio
+async def test_completed_mission_grants_xp_once_and_moves_rank(client):
+    await client.post(
+        "/v1/auth/register",
+        json={
+            "email": "reward@example.com",
+            "password": "StrongPass123",
+            "display_name": "Reward User",
+            "profile_type": "student",
+        },
+    )
+    login_response = await client.post(
+        "/v1/auth/login",
+        json={"email": "reward@example.com", "password": "StrongPass123"},
+    )
+    headers = {"Authorization": f"Bearer {login_response.json()['access_token']}"}
+
+    missions = (await client.get("/v1/missions/daily", headers=headers)).json()
+    mission = missions[0]["mission"]
+    for _ in range(2):
+        await client.post(
+            f"/v1/missions/{mission['id']}/progress",
+            json={"increment": mission["target"]},
+            headers=headers,
+        )
+
+    me = (await client.get("/v1/users/me", headers=headers)).json()
+    assert me["xp"] == mission["xp_reward"]
+
+    standing = (await client.get("/v1/leaderboard/me?radius=1", headers=headers)).json()
+    assert standing["rank"] is not None
+    mine = next(entry for entry in standing["entries"] if entry["user_id"] == me["id"])
+    assert (mine["rank"], mine["xp"]) == (standing["rank"], mission["xp_reward"])
+    assert len(standing["entries"]) <= 3
@@ -0,0 +1,345 @@
+from __future__ import annotations
+
+import uuid
+from datetime import datetime, timedelta
+
+import pytest
+from sqlalchemy import update
+from sqlalchemy.exc import OperationalError
+
+from app.core.events import flush_mastery, flush_quiz_sessions
+from app.domain.models import (
+    DifficultyLevel,
+    QuestionStats,
+    QuestionType,
+    QuizAttempt,
+    QuizOption,
+    QuizQuestion,
+    ReviewState,
+    User,
+    UserRole,
+)
+from app.domain.services import elo as elo_service
+from app.domain.services import quiz as quiz_service
+from app.domain.services.catalog import QUESTIONS, content_catalog
+from app.infrastructure.cache.principal import principal_cache
+from app.infrastructure.cache.quiz_state import ACTIVE_KEY
+from app.infrastructure.db.session import AsyncSessionLocal
+from app.infrastructure.db.write_behind import attempt_write_behind
+from app.infrastructure.observability.queries import assert_max_queries
+
+
+async def _seed_questions(system: str, count: int) -> dict[str, str]:
+    correct: dict[str, str] = {}
+    question_ids = []
+    async with AsyncSessionLocal() as session:
+        for index in range(count):
+            question = QuizQuestion(
+                prompt=f"{system} {index}",
+                anatomy_system=system,
+                type=QuestionType.multiple_choice,
+                difficulty=DifficultyLevel.easy,
+            )
+            session.add(question)
+            await session.flush()
+            question_ids.append(question.id)
+            for option in range(3):
+                session.add(
+                    QuizOption(question_id=question.id, label=f"{option}", is_correct=option == 0)
+                )
+        await session.commit()
+        result = await session.exec(
+            QuizOption.__table__.select().where(
+                QuizOption.is_correct.is_(True), QuizOption.question_id.in_(question_ids)
+            )
+        )
+        for row in result:
+            correct[str(row.question_id)] = str(row.id)
+    content_catalog.mark_stale(QUESTIONS)
+    return correct
+
+
+async def _login(client, email: str) -> dict[str, str]:
+    await client.post(
+        "/v1/auth/register",
+        json={
+            "email": email,
+            "password": "StrongPass123",
+            "display_name": "Quiz User",
+            "profile_type": "student",
+        },
+    )
+    response = await client.post(
+        "/v1/auth/login", json={"email": email, "password": "StrongPass123"}
+    )
+    return {"Authorization": f"Bearer {response.json()['access_token']}"}
+
+
+@pytest.mark.asyncio
+async def test_quiz_session_samples_from_content_catalog(client):
+    correct = await _seed_questions("lymphatic", 12)
+    headers = await _login(client, "quiz@example.com")
+
+    payload = {"mode": "sprint", "system": "lymphatic", "limit": 5}
+    await client.post("/v1/quizzes/sessions", json=payload, headers=headers)
+    with assert_max_queries(2):
+        response = await client.post("/v1/quizzes/sessions", json=payload, headers=headers)
+    assert response.status_code == 201
+    questions = response.json()["questions"]
+    assert len({question["id"] for question in questions}) == 5
+    assert all(question["id"] in correct for question in questions)
+    assert all(len(question["options"]) == 3 for question in questions)
+
+    session_id = response.json()["id"]
+    question_id = questions[0]["id"]
+    with assert_max_queries(3) as stats:
+        attempt = await client.post(
+            f"/v1/quizzes/sessions/{session_id}/attempts",
+            json={"question_id": question_id, "option_id": correct[question_id]},
+            headers=headers,
+        )
+    assert attempt.status_code == 200
+    assert attempt.json()["is_correct"] is True
+    # Graded from the session's answer key; the attempt waits in hot state.
+    assert not any("quiz_options" in shape or "quiz_attempts" in shape for shape in stats.shapes)
+
+    foreign = await client.post(
+        f"/v1/quizzes/sessions/{session_id}/attempts",
+        json={"question_id": question_id, "option_id": correct[questions[1]["id"]]},
+        headers=headers,
+    )
+    assert foreign.status_code == 400
+
+    completed = await client.post(
+        f"/v1/quizzes/sessions/{session_id}/complete",
+        params={"duration_seconds": 42},
+        headers=headers,
+    )
+    assert completed.json()["score"] == 1
+    await attempt_write_behind.flush()
+    async with AsyncSessionLocal() as session:
+        result = await session.exec(
+            QuizAttempt.__table__.select().where(QuizAttempt.session_id == uuid.UUID(session_id))
+        )
+        assert [str(row.id) for row in result] == [attempt.json()["id"]]
+
+
+@pytest.mark.asyncio
+async def test_failed_expiry_flush_keeps_answers_for_the_next_run(
+    client, monkeypatch, quiz_state_redis
+):
+    correct = await _seed_questions("integumentary", 3)
+    headers = await _login(client, "flush@example.com")
+    response = await client.post(
+        "/v1/quizzes/sessions",
+        json={"mode": "sprint", "system": "integumentary", "limit": 3},
+        headers=headers,
+    )
+    session_id = response.json()["id"]
+    question_id = response.json()["questions"][0]["id"]
+    attempt = await client.post(
+        f"/v1/quizzes/sessions/{session_id}/attempts",
+        json={"question_id": question_id, "option_id": correct[question_id]},
+        headers=headers,
+    )
+    await quiz_state_redis.zadd(ACTIVE_KEY, {session_id: 0})
+
+    async def failing_persist(*args, **kwargs):
+        raise OperationalError("INSERT", {}, Exception("database is down"))
+
+    with monkeypatch.context() as patch:
+        patch.setattr(quiz_service, "persist_attempts", failing_persist)
+        await flush_quiz_sessions()
+    await flush_quiz_sessions()
+
+    await attempt_write_behind.flush()
+    async with AsyncSessionLocal() as session:
+        result = await session.exec(
+            QuizAttempt.__table__.select().where(QuizAttempt.session_id == uuid.UUID(session_id))
+        )
+        assert [str(row.id) for row in result] == [attempt.json()["id"]]
+
+
+@pytest.mark.asyncio
+async def test_completion_waits_while_another_worker_persists_the_session(
+    client, quiz_state_redis
+):
+    correct = await _seed_questions("digestive", 2)
+    headers = await _login(client, "owner@example.com")
+    response = await client.post(
+        "/v1/quizzes/sessions",
+        json={"mode": "sprint", "system": "digestive", "limit": 2},
+        headers=headers,
+    )
+    session_id = response.json()["id"]
+    question_id = response.json()["questions"][0]["id"]
+    await client.post(
+        f"/v1/quizzes/sessions/{session_id}/attempts",
+        json={"question_id": question_id, "option_id": correct[question_id]},
+        headers=headers,
+    )
+    await quiz_state_redis.set(f"quiz-state:{session_id}:claim", 1)
+
+    busy = await client.post(
+        f"/v1/quizzes/sessions/{session_id}/complete",
+        params={"duration_seconds": 30},
+        headers=headers,
+    )
+    assert busy.status_code == 503
+    assert busy.headers["Retry-After"]
+
+    await quiz_state_redis.delete(f"quiz-state:{session_id}:claim")
+    completed = await client.post(
+        f"/v1/quizzes/sessions/{session_id}/complete",
+        params={"duration_seconds": 30},
+        headers=headers,
+    )
+    assert completed.json()["completed"] is True
+    assert completed.json()["score"] == 1
+    assert await attempt_write_behind.flush() == 1
+
+
+@pytest.mark.asyncio
+async def test_batch_answers_grade_and_score_in_one_transaction(client):
+    correct = await _seed_questions("respiratory", 20)
+    headers = await _login(client, "sprint@example.com")
+    response = await client.post(
+        "/v1/quizzes/sessions",
+        json={"mode": "sprint", "system": "respiratory", "limit": 20},
+        headers=headers,
+    )
+    session_id = response.json()["id"]
+    questions = response.json()["questions"]
+
+    answers = []
+    for index, question in enumerate(questions):
+        right = correct[question["id"]]
+        wrong = next(option["id"] for option in question["options"] if option["id"] != right)
+        answers.append(
+            {
+                "question_id": question["id"],
+                "option_id": right if index % 4 else wrong,
+                "answered_at": f"2026-01-01T00:00:{index:02d}Z",
+            }
+        )
+    with assert_max_queries(8) as stats:
+        batch = await client.post(
+            f"/v1/quizzes/sessions/{session_id}/answers",
+            json={"answers": answers},
+            headers=headers,
+        )
+    assert batch.status_code == 200
+    body = batch.json()
+    assert body["correct"] == body["score"] == 15
+    assert [attempt["question_id"] for attempt in body["attempts"]] == [
+        answer["question_id"] for answer in answers
+    ]
+    # Attempts are acknowledged from the write-behind buffer and inserted in bulk later.
+    assert not any(shape.startswith("INSERT INTO quiz_attempts") for shape in stats.shapes)
+    assert await attempt_write_behind.flush() == len(answers)
+    me = await client.get("/v1/users/me", headers=headers)
+    assert me.json()["elo_rating"] > 1200  # 15 of 20 right against 1200-rated questions
+    assert all(
+        elo_service.question_ratings.pending(uuid.UUID(answer["question_id"]))
+        for answer in answers
+    )
+    await flush_mastery()
+    summary = await client.get("/v1/dashboard/summary", headers=headers)
+    mastery = {item["system"]: item["completion_rate"] for item in summary.json()["systems"]}
+    assert mastery["respiratory"] > 0.9
+    assert mastery["skeletal"] == pytest.approx(0.1)
+
+    bad = dict(answers[0], option_id=correct[questions[-1]["id"]])
+    rejected = await client.post(
+        f"/v1/quizzes/sessions/{session_id}/answers",
+        json={"answers": [bad]},
+        headers=headers,
+    )
+    assert rejected.status_code == 400
+
+    unordered = await client.post(
+        f"/v1/quizzes/sessions/{session_id}/answers",
+        json={"answers": list(reversed(answers[:2]))},
+        headers=headers,
+    )
+    assert unordered.status_code == 422
+
+
+@pytest.mark.asyncio
+async def test_srs_session_serves_due_reviews_first(client):
+    correct = await _seed_questions("skeletal", 12)
+    headers = await _login(client, "srs@example.com")
+    me = await client.get("/v1/users/me", headers=headers)
+    user_id = uuid.UUID(me.json()["id"])
+    due = [uuid.UUID(question_id) for question_id in list(correct)[:3]]
+    async with AsyncSessionLocal() as session:
+        for index, question_id in enumerate(due):
+            session.add(
+                ReviewState(
+                    user_id=user_id,
+                    question_id=question_id,
+                    due_at=datetime.utcnow() - timedelta(days=3 - index),
+                )
+            )
+        await session.commit()
+
+    payload = {"mode": "srs", "system": "skeletal", "limit": 5}
+    await client.post("/v1/quizzes/sessions", json=dict(payload, mode="sprint"), headers=headers)
+    with assert_max_queries(3):
+        response = await client.post("/v1/quizzes/sessions", json=payload, headers=headers)
+    assert response.status_code == 201
+    served = [uuid.UUID(question["id"]) for question in response.json()["questions"]]
+    assert served[:3] == due
+    assert len(set(served)) == 5
+
+
+@pytest.mark.asyncio
+async def test_calibration_flags_leave_the_draw_and_reach_teachers(client):
+    correct = await _seed_questions("muscular", 6)
+    flagged, sound = (uuid.UUID(question_id) for question_id in list(correct)[:2])
+    async with AsyncSessionLocal() as session:
+        for question_id, point_biserial in ((flagged, -0.3), (sound, 0.4)):
+            session.add(
+                QuestionStats(
+                    question_id=question_id,
+                    attempts=250,
+                    p_value=0.5,
+                    point_biserial=point_biserial,
+                    calibrated_at=datetime.utcnow(),
+                )
+            )
+        await session.commit()
+    content_catalog.mark_stale(QUESTIONS)
+    headers = await _login(client, "calibration@example.com")
+
+    response = await client.post(
+        "/v1/quizzes/sessions",
+        json={"mode": "sprint", "system": "muscular", "limit": 6},
+        headers=headers,
+    )
+    served = {question["id"] for question in response.json()["questions"]}
+    assert served == set(correct) - {str(flagged)}
+
+    denied = await client.get("/v1/quizzes/questions/stats", headers=headers)
+    assert denied.status_code == 403
+
+    async with AsyncSessionLocal() as session:
+        result = await session.exec(
+            update(User)
+            .where(User.email == "calibration@example.com")
+            .values(role=UserRole.teacher)
+            .returning(User.id)
+        )
+        user_id = result.scalar_one()
+        await session.commit()
+    await principal_cache.invalidate(user_id)
+
+    stats = await client.get(
+        "/v1/quizzes/questions/stats", params={"system": "muscular"}, headers=headers
+    )
+    assert stats.status_code == 200
+    assert [(row["question_id"], row["point_biserial"]) for row in stats.json()] == [
+        (str(flagged), -0.3),
+        (str(sound), 0.4),
+    ]
+    assert stats.json()[0]["prompt"].startswith("muscular")
@@ -0,0 +1,44 @@
+from __future__ import annotations
+
+import json
+
+import pytest
+
+from app.infrastructure.cache.codecs import CODECS, FLAG_ZLIB, CodecError, decode, encode
+
+PAYLOAD = {
+    "entries": [
+        {"user_id": str(index), "display_name": f"Aluno {index}", "xp": index * 10, "avatar": None}
+        for index in range(50)
+    ]
+}
+
+
+@pytest.mark.parametrize("codec_name", sorted(CODECS))
+@pytest.mark.parametrize("threshold", [0, 256])
+def test_round_trip_with_header(codec_name: str, threshold: int):
+    codec = CODECS[codec_name]
+    data = encode(PAYLOAD, codec, compression_threshold=threshold)
+
+    assert data[2] == codec.id
+    assert bool(data[3] & FLAG_ZLIB) == bool(threshold)
+    assert decode(data) == PAYLOAD
+
+
+def test_compression_shrinks_large_payloads():
+    plain = encode(PAYLOAD, CODECS["msgpack"])
+    compressed = encode(PAYLOAD, CODECS["msgpack"], compression_threshold=256)
+
+    assert len(compressed) < len(plain)
+
+
+def test_decode_reads_legacy_json_values():
+    assert decode(json.dumps(PAYLOAD).encode()) == PAYLOAD
+
+
+def test_decode_rejects_unknown_codec_and_corrupt_payloads():
+    data = bytearray(encode(PAYLOAD, CODECS["json"], compression_threshold=256))
+    with pytest.raises(CodecError):
+        decode(bytes(data[:2]) + b"\x7f" + bytes(data[3:]))
+    with pytest.raises(CodecError):
+        decode(bytes(data[:4]) + b"garbage")
@@ -0,0 +1,36 @@
+from __future__ import annotations
+
+import asyncio
+
+import pytest
+
+from app.domain.models import LeaderboardScope
+from app.infrastructure.cache.decorators import _render_key, _single_flight
+
+
+def test_render_key_uses_enum_values():
+    key = _render_key(
+        "leaderboard:latest:{scope}:{reference_id}",
+        {"session": object(), "scope": LeaderboardScope.global_scope, "reference_id": None},
+    )
+    assert key == "leaderboard:latest:global:None"
+
+
+@pytest.mark.asyncio
+async def test_single_flight_runs_loader_once_for_concurrent_misses():
+    calls = 0
+
+    async def loader():
+        nonlocal calls
+        calls += 1
+        await asyncio.sleep(0.01)
+        return ["campaign"]
+
+    results = await asyncio.gather(
+        *(_single_flight("cache:campaigns:all", loader) for _ in range(10))
+    )
+
+    assert calls == 1
+    assert results == [["campaign"]] * 10
+    assert await _single_flight("cache:campaigns:all", loader) == ["campaign"]
+    assert calls == 2
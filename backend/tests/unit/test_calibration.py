@@ -0,0 +1,138 @@
+from __future__ import annotations
+
+import uuid
+from datetime import datetime, timedelta
+
+import numpy as np
+import pytest
+from sqlalchemy.ext.asyncio import create_async_engine
+from sqlmodel import SQLModel, select
+from sqlmodel.ext.asyncio.session import AsyncSession
+
+from app.domain.models import QuestionStats, QuizAttempt, QuizMode, QuizSession
+from app.domain.services.calibration import DenseIndex, ItemCalibrator, calibrate_questions
+from app.infrastructure.db.unit_of_work import unit_of_work
+
+NOW = datetime(2026, 3, 1, 9, 0, 0)
+
+
+def _simulate(
+    rng: np.random.Generator, users: int, discrimination: np.ndarray, difficulty: np.ndarray
+):
+    theta = rng.normal(size=users)
+    p = 1 / (1 + np.exp(-discrimination * (theta[:, None] - difficulty)))
+    correct = rng.random(p.shape) < p
+    user_keys = np.array([uuid.uuid4().bytes for _ in range(users)], dtype="S16")
+    item_ids = [uuid.uuid4() for _ in range(difficulty.size)]
+    item_keys = np.array([item.bytes for item in item_ids], dtype="S16")
+    rows = (
+        np.repeat(user_keys, difficulty.size),
+        np.tile(item_keys, users),
+        correct.reshape(-1),
+    )
+    order = rng.permutation(rows[0].size)
+    return item_ids, tuple(column[order] for column in rows)
+
+
+def _feed(calibrator: ItemCalibrator, rows, chunk: int) -> None:
+    for step in (calibrator.count, calibrator.observe):
+        for start in range(0, rows[0].size, chunk):
+            step(*(column[start : start + chunk] for column in rows))
+
+
+def test_calibration_recovers_item_ordering_and_flags_a_wrong_key():
+    rng = np.random.default_rng(7)
+    difficulty = np.linspace(-1.5, 1.5, 15)
+    discrimination = np.full(15, 1.2)
+    discrimination[4] = -1.0  # answer key pointing at a distractor
+    item_ids, rows = _simulate(rng, 600, discrimination, difficulty)
+
+    calibrator = ItemCalibrator()
+    _feed(calibrator, rows, chunk=1000)
+    stats = {item.question_id: item for item in calibrator.results(min_attempts=100)}
+
+    assert calibrator.rows == 600 * 15
+    assert all(stats[item].attempts == 600 for item in item_ids)
+    expected = rows[2].reshape(-1)[np.argsort(rows[1], kind="stable")].reshape(15, -1)
+    observed = [stats[item].p_value for item in sorted(item_ids, key=lambda item: item.bytes)]
+    assert observed == pytest.approx(expected.mean(axis=1), abs=1e-4)
+
+    good = [item for index, item in enumerate(item_ids) if index != 4]
+    assert stats[item_ids[4]].point_biserial < 0
+    assert stats[item_ids[4]].irt_discrimination < 0
+    assert stats[item_ids[4]].irt_difficulty is None
+    assert min(stats[item].point_biserial for item in good) > 0.2
+    assert min(stats[item].irt_discrimination for item in good) > 0.5
+    fitted = [stats[item].irt_difficulty for item in good]
+    assert np.corrcoef(fitted, np.delete(difficulty, 4))[0, 1] > 0.95
+
+
+def test_items_below_min_attempts_only_get_p_values():
+    rng = np.random.default_rng(3)
+    _, rows = _simulate(rng, 40, np.ones(3), np.zeros(3))
+
+    calibrator = ItemCalibrator()
+    _feed(calibrator, rows, chunk=7)
+    for item in calibrator.results(min_attempts=100):
+        assert item.attempts == 40
+        assert 0 <= item.p_value <= 1
+        assert (item.point_biserial, item.irt_difficulty, item.irt_discrimination) == (
+            None,
+            None,
+            None,
+        )
+
+
+def test_index_round_trips_keys_ending_in_nul_bytes():
+    index = DenseIndex()
+    trailing = uuid.UUID(bytes=b"\x01" * 14 + b"\0\0")
+    keys = np.array([trailing.bytes, uuid.UUID(int=1).bytes, trailing.bytes], dtype="S16")
+
+    assert index.lookup(keys, grow=True).tolist() == [1, 0, 1]
+    assert index.lookup(np.array([uuid.uuid4().bytes], dtype="S16"), grow=False).tolist() == [-1]
+    assert index.keys() == [uuid.UUID(int=1), trailing]
+
+
+@pytest.mark.asyncio
+async def test_calibrate_questions_streams_attempts_and_replaces_stats(tmp_path):
+    engine = create_async_engine(f"sqlite+aiosqlite:///{tmp_path / 'calibration.db'}")
+    async with engine.begin() as conn:
+        await conn.run_sync(SQLModel.metadata.create_all)
+    questions = [uuid.uuid4() for _ in range(3)]
+    old = NOW - timedelta(days=1)
+
+    async with AsyncSession(engine) as session:
+        for user in range(10):
+            quiz_session = QuizSession(user_id=uuid.uuid4(), mode=QuizMode.sprint)
+            session.add(quiz_session)
+            for index, question_id in enumerate(questions):
+                session.add(
+                    QuizAttempt(
+                        session_id=quiz_session.id,
+                        question_id=question_id,
+                        is_correct=user > index * 3,
+                        created_at=old,
+                    )
+                )
+        # Too recent: it could still be waiting in the hot state of another session.
+        session.add(
+            QuizAttempt(session_id=quiz_session.id, question_id=uuid.uuid4(), created_at=NOW)
+        )
+        session.add(QuestionStats(question_id=uuid.uuid4(), p_value=0.5, calibrated_at=old))
+        await session.commit()
+
+        async with unit_of_work(session):
+            report = await calibrate_questions(
+                engine, session, chunk_rows=7, min_attempts=5, now=NOW
+            )
+
+        assert (report.rows, report.rows_read, report.questions) == (30, 60, 3)
+        assert report.rows_per_second > 0
+        stats = {
+            item.question_id: item for item in (await session.exec(select(QuestionStats))).all()
+        }
+        assert set(stats) == set(questions)
+        assert [stats[question_id].p_value for question_id in questions] == [0.9, 0.6, 0.3]
+        assert all(item.calibrated_at == NOW for item in stats.values())
+        assert all(item.point_biserial > 0 for item in stats.values())
+    await engine.dispose()
@@ -0,0 +1,67 @@
+from __future__ import annotations
+
+import pytest
+from sqlalchemy.ext.asyncio import create_async_engine
+from sqlmodel import SQLModel
+from sqlmodel.ext.asyncio.session import AsyncSession
+
+from app.domain.models import AnatomyStructure
+from app.domain.services.catalog import ANATOMY, ContentCatalog, bump_content_version
+from app.infrastructure.db.unit_of_work import unit_of_work
+from app.infrastructure.observability.queries import assert_max_queries
+
+
+@pytest.fixture()
+async def engine(tmp_path):
+    engine = create_async_engine(f"sqlite+aiosqlite:///{tmp_path / 'catalog.db'}")
+    async with engine.begin() as conn:
+        await conn.run_sync(SQLModel.metadata.create_all)
+    yield engine
+    await engine.dispose()
+
+
+def _structure(name: str) -> AnatomyStructure:
+    return AnatomyStructure(
+        name=name, system="skeletal", region="membro", description=name, tags=[]
+    )
+
+
+@pytest.mark.asyncio
+async def test_hot_reads_skip_the_database_until_the_version_moves(engine):
+    catalog = ContentCatalog()
+    async with AsyncSession(engine) as session, unit_of_work(session):
+        session.add(_structure("Femur"))
+        await bump_content_version(session, ANATOMY)
+
+    async with AsyncSession(engine) as session:
+        await catalog.refresh(session, preload=True)
+        assert catalog.loaded_version(ANATOMY) == 1
+        with assert_max_queries(0):
+            anatomy = await catalog.anatomy(session)
+        assert [entry.name for entry in anatomy.search("skeletal", "FEM")] == ["Femur"]
+
+    async with AsyncSession(engine) as session, unit_of_work(session):
+        session.add(_structure("Tibia"))
+        await bump_content_version(session, ANATOMY)
+
+    async with AsyncSession(engine) as session:
+        # Another worker wrote; only the periodic version check notices.
+        assert len((await catalog.anatomy(session)).structures) == 1
+        await catalog.refresh(session)
+        anatomy = await catalog.anatomy(session)
+    assert catalog.loaded_version(ANATOMY) == 2
+    assert [entry.name for entry in anatomy.structures] == ["Femur", "Tibia"]
+
+
+@pytest.mark.asyncio
+async def test_stale_section_reloads_on_next_read(engine):
+    catalog = ContentCatalog()
+    async with AsyncSession(engine) as session:
+        assert (await catalog.anatomy(session)).structures == ()
+        session.add(_structure("Umero"))
+        await session.commit()
+
+        catalog.mark_stale(ANATOMY)
+        anatomy = await catalog.anatomy(session)
+
+    assert [entry.name for entry in anatomy.structures] == ["Umero"]
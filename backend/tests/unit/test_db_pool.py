@@ -0,0 +1,38 @@
+from __future__ import annotations
+
+import pytest
+from prometheus_client import REGISTRY
+from sqlalchemy import exc, text
+from sqlalchemy.ext.asyncio import create_async_engine
+
+from app.infrastructure.db.pool import InstrumentedQueuePool, instrument_engine
+
+
+def _sample(name: str) -> float:
+    return REGISTRY.get_sample_value(name, {"pool": "test"}) or 0.0
+
+
+@pytest.mark.asyncio
+async def test_instrumented_pool_reports_checkouts_and_timeouts(tmp_path):
+    engine = create_async_engine(
+        f"sqlite+aiosqlite:///{tmp_path / 'pool.db'}",
+        poolclass=InstrumentedQueuePool,
+        pool_logging_name="test",
+        pool_size=1,
+        max_overflow=0,
+        pool_timeout=0.05,
+    )
+    instrument_engine(engine, "test")
+    timeouts = _sample("db_pool_timeouts_total")
+
+    async with engine.connect() as conn:
+        await conn.execute(text("SELECT 1"))
+        assert _sample("db_pool_checked_out") == 1
+        with pytest.raises(exc.TimeoutError):
+            async with engine.connect():
+                pass
+
+    assert _sample("db_pool_timeouts_total") == timeouts + 1
+    assert _sample("db_pool_checked_out") == 0
+    assert _sample("db_pool_checkout_wait_seconds_count") >= 2
+    await engine.dispose()
@@ -0,0 +1,43 @@
+from __future__ import annotations
+
+import pytest
+from sqlmodel import SQLModel
+
+from app.domain.models import AnatomyStructure
+from app.infrastructure.db.routing import ReadYourWrites, ReplicaSet
+from app.infrastructure.db.session import AsyncSessionLocal, engine
+
+
+@pytest.mark.asyncio
+async def test_replica_set_skips_unreachable_replicas(tmp_path):
+    healthy_url = f"sqlite+aiosqlite:///{tmp_path / 'replica.db'}"
+    broken_url = f"sqlite+aiosqlite:///{tmp_path / 'missing' / 'replica.db'}"
+    replicas = ReplicaSet([healthy_url, broken_url], max_lag_seconds=5)
+
+    await replicas.check()
+
+    assert [replica.healthy for replica in replicas.replicas] == [True, False]
+    assert {replicas.pick().name for _ in range(4)} == {replicas.replicas[0].name}
+    replicas.replicas[0].mark(False, "test")
+    assert replicas.pick() is None
+    await replicas.dispose()
+
+
+@pytest.mark.asyncio
+async def test_read_your_writes_marks_author_after_commit():
+    sticky = ReadYourWrites(window_seconds=30)
+    async with engine.begin() as conn:
+        await conn.run_sync(SQLModel.metadata.create_all)
+
+    async with AsyncSessionLocal() as session:
+        session.sync_session.info["on_write"] = lambda: sticky.mark_local("author")
+        await session.commit()
+        assert not sticky.is_sticky_locally("author")
+
+        session.add(
+            AnatomyStructure(name="Tibia", system="skeletal", region="leg", description="d")
+        )
+        await session.commit()
+
+    assert sticky.is_sticky_locally("author")
+    assert not sticky.is_sticky_locally("someone-else")
@@ -0,0 +1,105 @@
+from __future__ import annotations
+
+import uuid
+from collections import Counter
+from types import MappingProxyType
+
+import pytest
+from sqlmodel.ext.asyncio.session import AsyncSession
+
+from app.domain.models import DifficultyLevel, QuestionType
+from app.domain.services import elo
+from app.domain.services.catalog import (
+    QuestionCatalog,
+    QuestionEntry,
+    content_catalog,
+    rating_bucket,
+)
+from app.domain.services.elo import QuestionRatingBuffer, expected_score, write_question_ratings
+from app.domain.services.question_pool import pack_question_ids
+from app.infrastructure.db.session import engine
+from app.infrastructure.db.unit_of_work import unit_of_work
+
+
+def _catalog(ratings: list[int]) -> QuestionCatalog:
+    entries = {
+        uuid.UUID(int=index): QuestionEntry(
+            id=uuid.UUID(int=index),
+            prompt=f"q{index}",
+            anatomy_system="skeletal",
+            type=QuestionType.multiple_choice,
+            difficulty=DifficultyLevel.medium,
+            media_url=None,
+            elo_rating=rating,
+            options=(),
+        )
+        for index, rating in enumerate(ratings)
+    }
+    buckets = pack_question_ids(
+        (entry.id, rating_bucket(entry.anatomy_system, entry.difficulty, entry.elo_rating))
+        for entry in entries.values()
+    )
+    return QuestionCatalog(
+        version=1, by_id=MappingProxyType(entries), buckets=MappingProxyType(buckets)
+    )
+
+
+def test_expected_score_is_symmetric():
+    assert expected_score(1200, 1200) == pytest.approx(0.5)
+    assert expected_score(1400, 1200) + expected_score(1200, 1400) == pytest.approx(1)
+    assert expected_score(1600, 1200) == pytest.approx(0.909, abs=1e-3)
+
+
+def test_sample_near_prefers_the_players_band():
+    catalog = _catalog([800] * 20 + [1210] * 4 + [1290] * 4 + [1650] * 20)
+
+    bands = Counter(
+        entry.elo_rating // 100
+        for _ in range(50)
+        for entry in catalog.sample_near("skeletal", None, 1230, 5)
+    )
+    assert set(bands) == {12}
+    assert sum(bands.values()) == 250
+    assert {entry.elo_rating for entry in catalog.sample_near(None, None, 700, 10)} == {800}
+
+    # Band 16 holds 20 questions, so a draw of 25 widens to the next closest band.
+    wide = catalog.sample_near("skeletal", None, 1650, 25)
+    assert len({entry.id for entry in wide}) == 25
+    assert {entry.elo_rating // 100 for entry in wide} <= {12, 16}
+
+
+@pytest.mark.asyncio
+async def test_rating_buffer_coalesces_and_keeps_fractions():
+    buffer = QuestionRatingBuffer()
+    hot, cold = uuid.uuid4(), uuid.uuid4()
+    for _ in range(10):
+        await buffer.merge({hot: -7.25})
+    await buffer.merge({cold: 0.4})
+
+    assert buffer.take() == {hot: -72}
+    assert buffer.pending(hot) == pytest.approx(-0.5)
+    assert buffer.pending(cold) == pytest.approx(0.4)
+
+    await buffer.restore({hot: -72})
+    assert buffer.pending(hot) == pytest.approx(-72.5)
+
+
+@pytest.mark.asyncio
+async def test_written_ratings_count_only_once_the_flush_commits(monkeypatch):
+    buffer = QuestionRatingBuffer()
+    monkeypatch.setattr(elo, "question_ratings", buffer)
+    question = uuid.uuid4()
+
+    async with AsyncSession(engine) as session:
+        version = (await content_catalog.questions(session)).version
+        with pytest.raises(RuntimeError):
+            async with unit_of_work(session):
+                await write_question_ratings(session, {question: 12})
+                raise RuntimeError("flush interrupted")
+        assert buffer.applied(question, version) == 0
+
+        async with unit_of_work(session):
+            await write_question_ratings(session, {question: 12})
+    assert buffer.applied(question, version) == 12
+    # A newer catalog snapshot already includes them.
+    assert buffer.applied(question, version + 1) == 0
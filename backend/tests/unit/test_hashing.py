@@ -0,0 +1,34 @@
+from __future__ import annotations
+
+import asyncio
+import time
+
+import pytest
+
+from app.core.hashing import PasswordHashPool, PasswordHashPoolSaturated
+from app.core.security import hash_password_async, verify_password_async
+
+
+@pytest.mark.asyncio
+async def test_async_hash_roundtrip():
+    hashed = await hash_password_async("StrongPass123")
+
+    assert await verify_password_async("StrongPass123", hashed)
+    assert not await verify_password_async("WrongPass123", hashed)
+
+
+@pytest.mark.asyncio
+async def test_pool_rejects_when_queue_is_full():
+    pool = PasswordHashPool(kind="thread", max_workers=1, max_queue=0, retry_after=3)
+    try:
+        running = asyncio.create_task(pool.run("hash", time.sleep, 0.2))
+        await asyncio.sleep(0)
+
+        with pytest.raises(PasswordHashPoolSaturated) as exc_info:
+            await pool.run("hash", time.sleep, 0)
+        assert exc_info.value.retry_after == 3
+
+        await running
+        assert pool.in_flight == 0
+    finally:
+        pool.shutdown()
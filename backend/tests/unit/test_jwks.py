@@ -0,0 +1,83 @@
+from __future__ import annotations
+
+import asyncio
+import json
+import time
+
+import pytest
+from cryptography.hazmat.primitives import serialization
+from cryptography.hazmat.primitives.asymmetric import rsa
+from jose import jwk, jwt
+
+from app.core.jwks import JWKSCache
+
+
+def _rsa_keypair(kid: str) -> tuple[str, dict]:
+    private_key = rsa.generate_private_key(public_exponent=65537, key_size=2048)
+    private_pem = private_key.private_bytes(
+        serialization.Encoding.PEM,
+        serialization.PrivateFormat.PKCS8,
+        serialization.NoEncryption(),
+    ).decode()
+    public_pem = private_key.public_key().public_bytes(
+        serialization.Encoding.PEM, serialization.PublicFormat.SubjectPublicKeyInfo
+    ).decode()
+    public_jwk = jwk.construct(public_pem, "RS256").to_dict()
+    public_jwk.update({"kid": kid, "use": "sig", "alg": "RS256"})
+    return private_pem, public_jwk
+
+
+def _token(private_pem: str, kid: str, **claims) -> str:
+    payload = {
+        "sub": "stack-user",
+        "aud": "project-1",
+        "iss": "https://stack",
+        "exp": time.time() + 60,
+    }
+    payload.update(claims)
+    return jwt.encode(payload, private_pem, algorithm="RS256", headers={"kid": kid})
+
+
+@pytest.mark.asyncio
+async def test_jwks_cache_verifies_tokens_from_local_file(tmp_path):
+    private_pem, public_jwk = _rsa_keypair("key-1")
+    jwks_path = tmp_path / "jwks.json"
+    jwks_path.write_text(json.dumps({"keys": [public_jwk]}), encoding="utf-8")
+
+    cache = JWKSCache(f"file://{jwks_path}", audiences=["project-1"], issuers=["https://stack"])
+    await cache.refresh()
+
+    payload = cache.decode(_token(private_pem, "key-1"))
+    assert payload is not None and payload["sub"] == "stack-user"
+    assert cache.decode(_token(private_pem, "key-1", aud="other-project")) is None
+    assert cache.decode(_token(private_pem, "key-1", iss="https://evil")) is None
+
+
+@pytest.mark.asyncio
+async def test_unknown_kid_triggers_a_single_background_refetch(tmp_path):
+    _, old_jwk = _rsa_keypair("old")
+    new_pem, new_jwk = _rsa_keypair("new")
+    jwks_path = tmp_path / "jwks.json"
+    jwks_path.write_text(json.dumps({"keys": [old_jwk]}), encoding="utf-8")
+
+    cache = JWKSCache(f"file://{jwks_path}", unknown_kid_cooldown_seconds=60)
+    await cache.refresh()
+    jwks_path.write_text(json.dumps({"keys": [old_jwk, new_jwk]}), encoding="utf-8")
+
+    fetches = 0
+    original_fetch = cache._fetch_document
+
+    async def counting_fetch():
+        nonlocal fetches
+        fetches += 1
+        return await original_fetch()
+
+    cache._fetch_document = counting_fetch  # type: ignore[method-assign]
+
+    token = _token(new_pem, "new")
+    assert cache.decode(token) is None
+    assert cache.decode(token) is None
+    await asyncio.sleep(0.01)
+
+    assert fetches == 1
+    assert cache.decode(token) is not None
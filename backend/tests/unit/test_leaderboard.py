@@ -0,0 +1,252 @@
+from __future__ import annotations
+
+import uuid
+
+import fakeredis
+import pytest
+from redis.exceptions import ConnectionError as RedisConnectionError
+from sqlalchemy.ext.asyncio import create_async_engine
+from sqlmodel import SQLModel, select
+from sqlmodel.ext.asyncio.session import AsyncSession
+
+from app.domain.models import (
+    Campaign,
+    CampaignLesson,
+    CampaignProgressStatus,
+    ClassroomMembership,
+    LeaderboardScope,
+    User,
+)
+from app.domain.services import campaigns as campaign_service
+from app.domain.services import leaderboard as leaderboard_service
+from app.infrastructure.cache import leaderboard as leaderboard_cache
+from app.infrastructure.cache.leaderboard import (
+    BUILT_KEY,
+    PROFILES_KEY,
+    LeaderboardStore,
+    Profile,
+    board_key,
+)
+from app.infrastructure.db.unit_of_work import unit_of_work
+
+
+def test_profile_is_stored_compactly():
+    profile = Profile(display_name="Ana", streak=3, avatar=None)
+
+    assert profile.dump() == '["Ana",3,null]'
+    assert Profile.load(profile.dump()) == profile
+    assert board_key("global") == "leaderboard:board:global"
+
+
+@pytest.mark.asyncio
+async def test_store_reads_fall_back_when_disabled_or_unreachable(monkeypatch):
+    user_id = uuid.uuid4()
+    disabled = LeaderboardStore(enabled=False)
+    assert await disabled.top(board_key("global"), 10) is None
+    assert await disabled.around(board_key("global"), user_id, 2) is None
+
+    async def unreachable():
+        raise RedisConnectionError("connection refused")
+
+    monkeypatch.setattr(leaderboard_cache, "get_client", unreachable)
+    store = LeaderboardStore(enabled=True)
+    await store.add_xp(user_id, 50, [board_key("global")], Profile("Ana", 0, None))
+    assert await store.top(board_key("global"), 10) is None
+    assert await store.around(board_key("global"), user_id, 2) is None
+    assert not await store.is_built()
+
+
+@pytest.fixture()
+def redis_client(monkeypatch):
+    client = fakeredis.FakeAsyncRedis(decode_responses=True)
+
+    async def get_client():
+        return client
+
+    monkeypatch.setattr(leaderboard_cache, "get_client", get_client)
+    return client
+
+
+GLOBAL = board_key("global")
+ANA, BIA, CAIO, DANI = (uuid.UUID(int=index) for index in range(1, 5))
+
+
+@pytest.mark.asyncio
+async def test_store_ranks_increments_and_ties_from_the_sorted_set(redis_client):
+    store = LeaderboardStore(enabled=True)
+    await store.add_xp(ANA, 100, [GLOBAL], Profile("Ana", 1, None))
+    # Unbuilt boards may be partial, so reads fall back until the first rebuild.
+    assert await store.top(GLOBAL, 10) is None
+    assert await store.around(GLOBAL, ANA, 1) is None
+
+    await store.rebuild({GLOBAL: {str(ANA): 100, str(BIA): 300, str(CAIO): 300}}, {})
+    await store.add_xp(ANA, 200, [GLOBAL], Profile("Ana", 2, "fox.png"))
+    await store.add_xp(DANI, 50, [GLOBAL], Profile("Dani", 0, None))
+
+    top = await store.top(GLOBAL, 3)
+    # Three-way tie at 300 ranks by member, highest first.
+    assert [(s.user_id, s.xp, s.rank) for s in top] == [
+        (CAIO, 300, 1),
+        (BIA, 300, 2),
+        (ANA, 300, 3),
+    ]
+    assert top[2].profile == Profile("Ana", 2, "fox.png")
+    assert top[0].profile is None
+
+    rank, window = await store.around(GLOBAL, BIA, 1)
+    assert rank == 2
+    assert [(s.user_id, s.rank) for s in window] == [(CAIO, 1), (BIA, 2), (ANA, 3)]
+    rank, window = await store.around(GLOBAL, CAIO, 2)
+    assert rank == 1
+    assert [s.user_id for s in window] == [CAIO, BIA, ANA]
+    rank, window = await store.around(GLOBAL, DANI, 1)
+    assert rank == 4
+    assert [(s.user_id, s.xp) for s in window] == [(ANA, 300), (DANI, 50)]
+    assert await store.around(GLOBAL, uuid.uuid4(), 1) == (None, [])
+
+
+@pytest.mark.asyncio
+async def test_rebuild_swaps_boards_and_drops_stale_ones(redis_client):
+    store = LeaderboardStore(enabled=True)
+    stale = board_key("classroom", uuid.uuid4())
+    emptied = board_key("classroom", uuid.uuid4())
+    await redis_client.zadd(GLOBAL, {str(ANA): 999})
+    await redis_client.zadd(stale, {str(ANA): 10})
+    await redis_client.zadd(emptied, {str(ANA): 10})
+    await redis_client.hset(PROFILES_KEY, str(DANI), Profile("Dani", 0, None).dump())
+
+    await store.rebuild(
+        {GLOBAL: {str(ANA): 40, str(BIA): 20}, emptied: {}},
+        {str(ANA): Profile("Ana", 0, None).dump()},
+    )
+
+    assert await redis_client.zrevrange(GLOBAL, 0, -1, withscores=True) == [
+        (str(ANA), 40.0),
+        (str(BIA), 20.0),
+    ]
+    assert await redis_client.hgetall(PROFILES_KEY) == {str(ANA): '["Ana",0,null]'}
+    assert not await redis_client.exists(stale)
+    assert not await redis_client.exists(emptied)
+    assert not [key async for key in redis_client.scan_iter(match="*:rebuild")]
+    assert await redis_client.exists(BUILT_KEY)
+    assert await store.is_built()
+
+
+def _user(name: str, xp: int, **fields) -> User:
+    return User(
+        email=f"{name}@example.com",
+        hashed_password="x",
+        display_name=name,
+        xp=xp,
+        preferences={},
+        **fields,
+    )
+
+
+@pytest.mark.asyncio
+async def test_sql_standing_ranks_ties_like_the_sorted_sets(tmp_path):
+    engine = create_async_engine(f"sqlite+aiosqlite:///{tmp_path / 'leaderboard.db'}")
+    async with engine.begin() as conn:
+        await conn.run_sync(SQLModel.metadata.create_all)
+    classroom_id = uuid.uuid4()
+
+    async with AsyncSession(engine, expire_on_commit=False) as session:
+        users = [_user(f"user{index}", xp) for index, xp in enumerate([500, 300, 300, 300, 100])]
+        session.add_all(users)
+        session.add_all(
+            ClassroomMembership(classroom_id=classroom_id, user_id=user.id, role="student")
+            for user in users[2:]
+        )
+        await session.commit()
+        expected = sorted(users, key=lambda user: (user.xp, str(user.id)), reverse=True)
+
+        # The middle of three tied users.
+        result = await leaderboard_service.standing(
+            session, expected[2], LeaderboardScope.global_scope, radius=1
+        )
+        assert result.rank == 3
+        assert [(entry.user_id, entry.rank) for entry in result.entries] == [
+            (str(user.id), rank) for rank, user in enumerate(expected[1:4], start=2)
+        ]
+
+        in_class = [user for user in expected if user in users[2:]]
+        result = await leaderboard_service.standing(
+            session, in_class[0], LeaderboardScope.classroom, str(classroom_id), radius=5
+        )
+        assert result.rank == 1
+        assert [entry.user_id for entry in result.entries] == [str(user.id) for user in in_class]
+
+        result = await leaderboard_service.standing(
+            session, users[0], LeaderboardScope.classroom, str(classroom_id)
+        )
+        assert (result.rank, result.entries) == (None, [])
+        assert await leaderboard_service.top_entries(session, LeaderboardScope.global_scope) is None
+    await engine.dispose()
+
+
+@pytest.mark.asyncio
+async def test_completing_a_lesson_grants_its_xp_once(tmp_path):
+    engine = create_async_engine(f"sqlite+aiosqlite:///{tmp_path / 'lessons.db'}")
+    async with engine.begin() as conn:
+        await conn.run_sync(SQLModel.metadata.create_all)
+
+    async with AsyncSession(engine, expire_on_commit=False) as session:
+        user = _user("learner", 0)
+        campaign = Campaign(title="Ossos", description="", anatomy_system="skeletal")
+        session.add_all([user, campaign])
+        await session.flush()
+        lesson = CampaignLesson(
+            campaign_id=campaign.id, order=1, title="Femur", content_url="/femur", xp_reward=120
+        )
+        session.add(lesson)
+        await session.commit()
+
+        for status in (
+            CampaignProgressStatus.in_progress,
+            CampaignProgressStatus.completed,
+            CampaignProgressStatus.completed,
+        ):
+            async with unit_of_work(session):
+                await campaign_service.record_lesson_progress(session, user, lesson.id, status)
+
+        assert user.xp == 120
+        stored = (await session.exec(select(User.xp).where(User.id == user.id))).one()
+        assert stored == 120
+    await engine.dispose()
+
+
+@pytest.mark.asyncio
+async def test_reconcile_builds_global_organization_and_classroom_boards(
+    tmp_path, redis_client, monkeypatch
+):
+    store = LeaderboardStore(enabled=True)
+    monkeypatch.setattr(leaderboard_service, "leaderboard_store", store)
+    engine = create_async_engine(f"sqlite+aiosqlite:///{tmp_path / 'reconcile.db'}")
+    async with engine.begin() as conn:
+        await conn.run_sync(SQLModel.metadata.create_all)
+    organization_id, classroom_id = uuid.uuid4(), uuid.uuid4()
+
+    async with AsyncSession(engine, expire_on_commit=False) as session:
+        member = _user("member", 70, organization_id=organization_id)
+        loner = _user("loner", 30)
+        loner.preferences = {"avatar": "owl.png"}
+        session.add_all([member, loner])
+        session.add(
+            ClassroomMembership(classroom_id=classroom_id, user_id=loner.id, role="student")
+        )
+        await session.commit()
+
+        assert await leaderboard_service.reconcile_leaderboards(session) == 2
+    await engine.dispose()
+
+    assert await redis_client.zrevrange(GLOBAL, 0, -1, withscores=True) == [
+        (str(member.id), 70.0),
+        (str(loner.id), 30.0),
+    ]
+    assert await redis_client.zrange(board_key("organization", organization_id), 0, -1) == [
+        str(member.id)
+    ]
+    assert await redis_client.zrange(board_key("classroom", classroom_id), 0, -1) == [
+        str(loner.id)
+    ]
+    assert await redis_client.hget(PROFILES_KEY, str(loner.id)) == '["loner",0,"owl.png"]'
@@ -0,0 +1,59 @@
+from __future__ import annotations
+
+import pytest
+
+from app.infrastructure.cache import redis as cache
+from app.infrastructure.cache.local import LocalCache
+
+
+def test_local_cache_evicts_least_recently_used_over_byte_budget():
+    cache = LocalCache(max_bytes=100, ttl_seconds=60)
+    cache.set("a", ["a"], size=40)
+    cache.set("b", ["b"], size=40)
+    assert cache.get("a") == ["a"]
+
+    cache.set("c", ["c"], size=40)
+
+    assert cache.get("b") is None
+    assert cache.get("a") == ["a"]
+    assert cache.get("c") == ["c"]
+    assert cache.size_bytes == 80
+
+
+def test_local_cache_skips_oversized_values_and_honours_ttl():
+    cache = LocalCache(max_bytes=100, ttl_seconds=60)
+    cache.set("big", "x", size=101)
+    cache.set("short", "y", size=1, ttl_seconds=0)
+
+    assert cache.get("big") is None
+    assert cache.get("short") is None
+    assert len(cache) == 0
+
+
+def test_local_cache_delete_and_replace_track_bytes():
+    cache = LocalCache(max_bytes=100, ttl_seconds=60)
+    cache.set("a", 1, size=10)
+    cache.set("a", 2, size=30)
+    assert cache.size_bytes == 30
+
+    cache.delete("a", "missing")
+
+    assert cache.get("a") is None
+    assert cache.size_bytes == 0
+
+
+@pytest.mark.asyncio
+async def test_get_many_serves_local_hits_without_redis(monkeypatch):
+    async def unavailable():
+        raise AssertionError("Redis should not be reached for local hits")
+
+    monkeypatch.setattr(cache, "get_binary_client", unavailable)
+    cache.local_cache.clear()
+    cache.local_cache.set("summary:a", {"xp": 1}, size=8)
+    cache.local_cache.set("summary:b", [1, 2], size=5)
+
+    assert await cache.get_many(["summary:a", "summary:b", "summary:a"]) == {
+        "summary:a": {"xp": 1},
+        "summary:b": [1, 2],
+    }
+    cache.local_cache.clear()
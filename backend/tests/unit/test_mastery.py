@@ -0,0 +1,195 @@
+from __future__ import annotations
+
+import uuid
+from datetime import date, datetime, timedelta
+
+import numpy as np
+import pytest
+from sqlalchemy.ext.asyncio import create_async_engine
+from sqlmodel import SQLModel, select
+from sqlmodel.ext.asyncio.session import AsyncSession
+
+from app.domain.models import (
+    AnatomySystem,
+    QuizAttempt,
+    QuizMode,
+    QuizQuestion,
+    QuizSession,
+    UserSystemProgress,
+)
+from app.domain.services.mastery import (
+    IDENTITY,
+    SYSTEMS,
+    BktParameters,
+    MasteryBuffer,
+    MasteryTracer,
+    apply,
+    compose,
+    observation,
+    recompute_mastery,
+    step,
+    write_mastery,
+)
+from app.domain.services.progress import insert_missing_progress
+from app.infrastructure.db.unit_of_work import unit_of_work
+
+PARAMS = BktParameters(p_init=0.1, p_transit=0.15, p_slip=0.1, p_guess=0.25)
+TODAY = date(2026, 3, 1)
+
+
+def _replay(mastery: float, answers: list[bool]) -> float:
+    for correct in answers:
+        mastery = float(step(PARAMS, mastery, correct))
+    return mastery
+
+
+def _fold(answers: list[bool]):
+    transform = IDENTITY
+    for correct in answers:
+        transform = compose(observation(PARAMS, correct), transform)
+    return transform
+
+
+def test_composed_transform_matches_step_by_step_updates():
+    rng = np.random.default_rng(11)
+    answers = (rng.random(400) < 0.7).tolist()
+
+    transform = _fold(answers)
+    for prior in (0.0, 0.1, 0.5, 0.97):
+        assert apply(transform, prior) == pytest.approx(_replay(prior, answers), abs=1e-9)
+    assert _replay(0.1, [True] * 5) > 0.9
+    assert _replay(0.9, [False] * 5) < 0.5
+
+
+@pytest.mark.asyncio
+async def test_buffer_keeps_answer_order_across_merge_and_restore():
+    key = (uuid.uuid4(), AnatomySystem.nervous)
+    buffer = MasteryBuffer()
+
+    await buffer.merge({key: (_fold([True, False]), TODAY)})
+    taken = buffer.take()
+    assert len(buffer) == 0
+    await buffer.merge({key: (_fold([False]), TODAY + timedelta(days=1))})
+    await buffer.restore(taken)
+
+    assert apply(buffer.pending(key), 0.3) == pytest.approx(_replay(0.3, [True, False, False]))
+    assert buffer.take()[key][1] == TODAY + timedelta(days=1)
+
+
+def test_tracer_replays_each_pair_in_order_across_chunks():
+    rng = np.random.default_rng(5)
+    users = [uuid.uuid4() for _ in range(4)]
+    rows = [
+        (users[rng.integers(4)], int(rng.integers(-1, len(SYSTEMS))), bool(rng.random() < 0.6))
+        for _ in range(300)
+    ]
+    tracer = MasteryTracer(PARAMS)
+    for start in range(0, len(rows), 64):
+        chunk = rows[start : start + 64]
+        tracer.observe(
+            np.array([user.bytes for user, _, _ in chunk], dtype="S16"),
+            np.array([code for _, code, _ in chunk], dtype=np.int64),
+            np.array([correct for _, _, correct in chunk], dtype=np.bool_),
+        )
+
+    expected: dict[tuple[uuid.UUID, AnatomySystem], list[bool]] = {}
+    for user, code, correct in rows:
+        if code >= 0:
+            expected.setdefault((user, SYSTEMS[code]), []).append(correct)
+    results = dict(tracer.results())
+    assert tracer.rows == sum(len(answers) for answers in expected.values())
+    assert results.keys() == expected.keys()
+    for key, answers in expected.items():
+        assert results[key] == pytest.approx(_replay(PARAMS.p_init, answers))
+
+
+@pytest.mark.asyncio
+async def test_write_and_recompute_update_progress_rows(tmp_path, monkeypatch):
+    monkeypatch.setattr("app.core.config.settings.bkt_p_init", PARAMS.p_init)
+    engine = create_async_engine(f"sqlite+aiosqlite:///{tmp_path / 'mastery.db'}")
+    async with engine.begin() as conn:
+        await conn.run_sync(SQLModel.metadata.create_all)
+    user_id = uuid.uuid4()
+    answers = [True, True, False, True]
+
+    async with AsyncSession(engine) as session:
+        session.add(
+            UserSystemProgress(user_id=user_id, system=AnatomySystem.skeletal, completion_rate=0.4)
+        )
+        await session.commit()
+
+        async with unit_of_work(session):
+            await write_mastery(
+                session,
+                {
+                    (user_id, AnatomySystem.skeletal): (_fold(answers), TODAY),
+                    # No row yet: created at p_init, then updated.
+                    (user_id, AnatomySystem.nervous): (_fold([False]), TODAY),
+                },
+            )
+        rows = {
+            row.system: row
+            for row in (await session.exec(select(UserSystemProgress))).all()
+        }
+        assert rows[AnatomySystem.skeletal].completion_rate == pytest.approx(_replay(0.4, answers))
+        assert rows[AnatomySystem.skeletal].last_interaction == TODAY
+        assert rows[AnatomySystem.nervous].completion_rate == pytest.approx(
+            _replay(PARAMS.p_init, [False])
+        )
+
+        question = QuizQuestion(prompt="femur", anatomy_system="skeletal")
+        quiz_session = QuizSession(user_id=user_id, mode=QuizMode.sprint)
+        session.add_all([question, quiz_session])
+        started = datetime(2026, 3, 1, 9, 0, 0)
+        for index, correct in enumerate(answers):
+            session.add(
+                QuizAttempt(
+                    session_id=quiz_session.id,
+                    question_id=question.id,
+                    is_correct=correct,
+                    created_at=started + timedelta(minutes=index),
+                )
+            )
+        await session.commit()
+
+        async with unit_of_work(session):
+            report = await recompute_mastery(engine, session, PARAMS, chunk_rows=3)
+        assert (report.rows, report.pairs) == (4, 1)
+        session.expire_all()
+        rows = {
+            row.system: row
+            for row in (await session.exec(select(UserSystemProgress))).all()
+        }
+        assert rows[AnatomySystem.skeletal].completion_rate == pytest.approx(
+            _replay(PARAMS.p_init, answers)
+        )
+        assert rows[AnatomySystem.nervous].completion_rate == pytest.approx(PARAMS.p_init)
+    await engine.dispose()
+
+
+@pytest.mark.asyncio
+async def test_insert_missing_progress_skips_pairs_another_writer_created(tmp_path):
+    engine = create_async_engine(f"sqlite+aiosqlite:///{tmp_path / 'progress.db'}")
+    async with engine.begin() as conn:
+        await conn.run_sync(SQLModel.metadata.create_all)
+    user_id = uuid.uuid4()
+
+    async with AsyncSession(engine) as session:
+        session.add(
+            UserSystemProgress(user_id=user_id, system=AnatomySystem.skeletal, completion_rate=0.4)
+        )
+        await session.commit()
+
+        # Both pairs looked missing to this writer; one was inserted meanwhile.
+        async with unit_of_work(session):
+            await insert_missing_progress(
+                session,
+                [(user_id, AnatomySystem.skeletal), (user_id, AnatomySystem.nervous)],
+                PARAMS.p_init,
+            )
+        rows = (await session.exec(select(UserSystemProgress))).all()
+        assert sorted((row.system.value, row.completion_rate) for row in rows) == [
+            ("nervous", PARAMS.p_init),
+            ("skeletal", 0.4),
+        ]
+    await engine.dispose()
@@ -0,0 +1,71 @@
+from __future__ import annotations
+
+import pytest
+from sqlalchemy import inspect
+
+from app.domain.models import User
+from app.infrastructure.cache import principal
+from app.infrastructure.cache.principal import PrincipalCache
+
+
+def _user(name: str) -> User:
+    return User(email=f"{name}@example.com", hashed_password="x", display_name=name, preferences={})
+
+
+@pytest.mark.asyncio
+async def test_principal_cache_lru_and_invalidation():
+    cache = PrincipalCache(max_entries=2, ttl_seconds=60)
+    first, second, third = _user("first"), _user("second"), _user("third")
+
+    await cache.set(first)
+    await cache.set(second)
+    assert (await cache.get(first.id)).display_name == "first"
+
+    await cache.set(third)
+    assert len(cache) == 2
+    assert await cache.get(second.id) is None
+    assert await cache.get(first.id) is not None
+
+    await cache.invalidate(first.id)
+    assert await cache.get(first.id) is None
+
+
+@pytest.mark.asyncio
+async def test_principal_cache_returns_independent_instances():
+    cache = PrincipalCache(max_entries=10, ttl_seconds=60)
+    user = _user("copy")
+    await cache.set(user)
+
+    cached = await cache.get(user.id)
+    cached.display_name = "changed"
+
+    assert (await cache.get(user.id)).display_name == "copy"
+
+
+@pytest.mark.asyncio
+async def test_principal_cache_expires_entries():
+    cache = PrincipalCache(max_entries=10, ttl_seconds=0)
+    user = _user("expired")
+    await cache.set(user)
+
+    assert await cache.get(user.id) is None
+    assert len(cache) == 0
+
+
+@pytest.mark.asyncio
+async def test_principal_cache_never_stores_password_hash(monkeypatch):
+    written = {}
+
+    async def fake_set_json(key, value, ttl_seconds):
+        written[key] = value
+
+    monkeypatch.setattr(principal, "set_json", fake_set_json)
+    cache = PrincipalCache(max_entries=10, ttl_seconds=60, redis_enabled=True)
+    user = _user("secret")
+    await cache.set(user)
+
+    assert "hashed_password" not in written[f"principal:{user.id}"]
+    assert "hashed_password" not in cache._entries[user.id][1]
+    cached = await cache.get(user.id)
+    assert cached.display_name == "secret"
+    assert "hashed_password" in inspect(cached).unloaded
@@ -0,0 +1,41 @@
+from __future__ import annotations
+
+import pytest
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import create_async_engine
+
+from app.infrastructure.observability.queries import (
+    assert_max_queries,
+    statement_shape,
+    track_queries,
+)
+
+
+def test_statement_shape_collapses_expanded_parameter_lists():
+    assert statement_shape("SELECT * FROM t WHERE id IN (?, ?, ?)") == statement_shape(
+        "SELECT *\n  FROM t WHERE id IN (?)"
+    )
+    assert statement_shape("INSERT INTO t (a, b) VALUES (%s, %s)") == (
+        "INSERT INTO t (a, b) VALUES (?)"
+    )
+
+
+@pytest.mark.asyncio
+async def test_nested_scopes_count_statements_and_flag_repeats(tmp_path):
+    engine = create_async_engine(f"sqlite+aiosqlite:///{tmp_path / 'queries.db'}")
+    async with engine.connect() as conn:
+        with track_queries("outer") as outer:
+            with track_queries("request") as inner:
+                for value in range(7):
+                    await conn.execute(text("SELECT :value"), {"value": value})
+            await conn.execute(text("SELECT 1"))
+
+        with pytest.raises(AssertionError, match="at most 1 queries, got 2"), assert_max_queries(1):
+            await conn.execute(text("SELECT 1"))
+            await conn.execute(text("SELECT 2"))
+    await engine.dispose()
+
+    assert inner.count == 7
+    assert inner.warned == {"SELECT ?"}
+    assert outer.count == 8
+    assert outer.duration >= inner.duration > 0
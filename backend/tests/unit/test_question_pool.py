@@ -0,0 +1,37 @@
+from __future__ import annotations
+
+import uuid
+from collections import Counter
+
+from app.domain.services.question_pool import bucket_size, pack_question_ids, sample_question_ids
+
+
+def _rows():
+    for index in range(30):
+        yield uuid.UUID(int=index), ("skeletal" if index < 20 else "nervous", index % 2)
+
+
+def test_sample_draws_distinct_ids_from_the_given_buckets():
+    buckets = pack_question_ids(_rows())
+    assert bucket_size(buckets, ("skeletal", 1)) == 10
+
+    sampled = sample_question_ids(buckets, [("skeletal", 1)], 5)
+    assert len(set(sampled)) == 5
+    assert all(question_id.int < 20 and question_id.int % 2 for question_id in sampled)
+
+    everything = sample_question_ids(buckets, list(buckets), 100)
+    assert sorted(question_id.int for question_id in everything) == list(range(30))
+    assert sample_question_ids(buckets, [("muscular", 0)], 5) == []
+
+
+def test_sample_is_uniform_across_buckets():
+    buckets = pack_question_ids(_rows())
+
+    draws = Counter(
+        question_id.int < 20
+        for _ in range(3000)
+        for question_id in sample_question_ids(buckets, list(buckets), 1)
+    )
+
+    # 20 of the 30 questions are skeletal.
+    assert 0.6 < draws[True] / 3000 < 0.73
@@ -0,0 +1,157 @@
+from __future__ import annotations
+
+import time
+import uuid
+from datetime import datetime
+
+import pytest
+from redis.exceptions import RedisError
+
+from app.infrastructure.cache import quiz_state
+from app.infrastructure.cache.quiz_state import ACTIVE_KEY, HotAttempt, QuizState, QuizStateStore
+
+QUESTION = uuid.UUID(int=1)
+RIGHT, WRONG, FOREIGN = uuid.UUID(int=10), uuid.UUID(int=11), uuid.UUID(int=12)
+
+
+def _attempt(option_id: uuid.UUID) -> HotAttempt:
+    return HotAttempt(
+        id=uuid.uuid4(),
+        question_id=QUESTION,
+        selected_option_id=option_id,
+        is_correct=option_id == RIGHT,
+        answered_at=datetime(2026, 1, 1, 12, 0, 0),
+    )
+
+
+@pytest.fixture()
+def redis_client(quiz_state_redis):
+    return quiz_state_redis
+
+
+async def _open(store: QuizStateStore) -> QuizState:
+    return await store.open(
+        uuid.uuid4(), uuid.uuid4(), "skeletal", {QUESTION: (RIGHT, frozenset({RIGHT, WRONG}))}
+    )
+
+
+def test_grade_accepts_only_served_options():
+    state = QuizState(
+        session_id=uuid.uuid4(),
+        user_id=uuid.uuid4(),
+        system=None,
+        key={QUESTION: (RIGHT, frozenset({RIGHT, WRONG}))},
+        expires_at=time.time() + 60,
+    )
+
+    assert state.grade(QUESTION, RIGHT) is True
+    assert state.grade(QUESTION, WRONG) is False
+    assert state.grade(QUESTION, FOREIGN) is None
+    assert state.grade(uuid.UUID(int=2), RIGHT) is None
+
+    restored = QuizState.load(state.session_id, state.dump())
+    assert restored.key == state.key
+    attempt = _attempt(RIGHT)
+    assert HotAttempt.load(attempt.dump()) == attempt
+
+
+@pytest.mark.asyncio
+async def test_state_keeps_drained_attempts_until_closed(redis_client):
+    store = QuizStateStore(ttl_seconds=60, redis_enabled=True)
+    state = await _open(store)
+
+    assert await store.get(state.session_id) is state
+    assert await store.record(state, _attempt(RIGHT))
+    assert await store.record(state, _attempt(WRONG))
+
+    assert await store.claim(state.session_id)
+    assert not await store.claim(state.session_id)
+    attempts = await store.drain(state.session_id)
+    assert [attempt.is_correct for attempt in attempts] == [True, False]
+    assert await store.get(state.session_id) is None
+    # An answer racing the drain goes to the database instead.
+    assert not await store.record(state, _attempt(RIGHT))
+
+    # A failed persist hands the session back with its attempts.
+    await store.release(state.session_id)
+    assert await store.claim(state.session_id)
+    assert len(await store.drain(state.session_id)) == 2
+
+    await store.close(state.session_id)
+    assert await redis_client.keys("quiz-state:*") == []
+
+
+@pytest.mark.asyncio
+async def test_no_hot_state_is_kept_without_redis(monkeypatch):
+    disabled = QuizStateStore(ttl_seconds=60)
+    assert await _open(disabled) is None
+    assert await disabled.claim(uuid.uuid4())
+    assert await disabled.drain(uuid.uuid4()) == []
+    assert await disabled.claim_expired() == []
+
+    async def unavailable():
+        raise RedisError("connection refused")
+
+    monkeypatch.setattr(quiz_state, "get_client", unavailable)
+    down = QuizStateStore(ttl_seconds=60, redis_enabled=True)
+    assert await _open(down) is None
+    assert len(down) == 0
+    with pytest.raises(RedisError):
+        await down.claim(uuid.uuid4())
+
+
+@pytest.mark.asyncio
+async def test_shared_answer_after_drain_is_refused_without_touching_drained_ones(redis_client):
+    owner = QuizStateStore(ttl_seconds=60, redis_enabled=True)
+    other = QuizStateStore(ttl_seconds=60, redis_enabled=True)
+    state = await _open(owner)
+    remote = await other.get(state.session_id)
+    assert remote is not None and remote is not state
+    assert await other.record(remote, _attempt(RIGHT))
+
+    assert await owner.claim(state.session_id)
+    drained = await owner.drain(state.session_id)
+    assert [attempt.is_correct for attempt in drained] == [True]
+
+    assert not await other.record(remote, _attempt(WRONG))
+    assert await other.get(state.session_id) is None
+    assert await redis_client.lrange(f"quiz-state:{state.session_id}:attempts", 0, -1) == [
+        drained[0].dump()
+    ]
+
+    await owner.close(state.session_id)
+    assert await redis_client.keys("quiz-state:*") == []
+
+
+@pytest.mark.asyncio
+async def test_shared_release_lets_another_worker_retry_the_drained_attempts(redis_client):
+    first = QuizStateStore(ttl_seconds=60, redis_enabled=True)
+    second = QuizStateStore(ttl_seconds=60, redis_enabled=True)
+    state = await _open(first)
+    assert await first.record(state, _attempt(RIGHT))
+
+    assert await first.claim(state.session_id)
+    assert not await second.claim(state.session_id)
+    assert len(await first.drain(state.session_id)) == 1
+    await first.release(state.session_id)
+
+    assert await second.claim(state.session_id)
+    assert len(await second.drain(state.session_id)) == 1
+    await second.close(state.session_id)
+    assert await redis_client.zscore(ACTIVE_KEY, str(state.session_id)) is None
+
+
+@pytest.mark.asyncio
+async def test_expired_shared_session_is_claimed_by_exactly_one_worker(redis_client):
+    workers = [QuizStateStore(ttl_seconds=60, redis_enabled=True) for _ in range(3)]
+    state = await _open(workers[0])
+    await redis_client.zadd(ACTIVE_KEY, {str(state.session_id): time.time() - 1})
+
+    claims = [await worker.claim_expired() for worker in workers]
+    assert sorted(len(claimed) for claimed in claims) == [0, 0, 1]
+    # Still listed as active: a worker dying now leaves it to the next once the claim expires.
+    assert await redis_client.zscore(ACTIVE_KEY, str(state.session_id)) is not None
+    assert 0 < await redis_client.ttl(f"quiz-state:{state.session_id}:claim") <= 300
+
+    await redis_client.delete(f"quiz-state:{state.session_id}:claim")
+    assert await workers[1].claim_expired() == [state.session_id]
@@ -0,0 +1,92 @@
+from __future__ import annotations
+
+import pytest
+from fastapi import Depends, FastAPI
+from httpx import ASGITransport, AsyncClient
+
+from app.api.common import rate_limit
+from app.api.common.rate_limit import RateLimit, RateLimitDecision, RateLimiter
+from app.api.error_handlers import register_error_handlers
+from app.core.security import create_access_token
+
+
+def _app(limiter: RateLimiter) -> FastAPI:
+    app = FastAPI()
+    register_error_handlers(app)
+
+    @app.get("/limited", dependencies=[Depends(limiter)])
+    async def limited() -> dict[str, str]:
+        return {"status": "ok"}
+
+    return app
+
+
+@pytest.mark.asyncio
+async def test_rate_limiter_charges_cost_per_ip_and_user_buckets(monkeypatch):
+    calls = []
+
+    async def fake_evaluate(buckets, cost):
+        calls.append(([key for key, _ in buckets], cost))
+        return RateLimitDecision(
+            True, limit=10, remaining=7, reset_seconds=18, retry_after_seconds=0
+        )
+
+    monkeypatch.setattr(rate_limit, "_evaluate_strict", fake_evaluate)
+    limiter = RateLimiter(
+        cost=3, limits=[RateLimit(scope="ip", limit=100), RateLimit(scope="user", limit=10)]
+    )
+    headers = {"Authorization": f"Bearer {create_access_token('user-1')}"}
+
+    transport = ASGITransport(app=_app(limiter))
+    async with AsyncClient(transport=transport, base_url="http://test") as client:
+        response = await client.get("/limited", headers=headers)
+
+    assert response.status_code == 200
+    assert response.headers["RateLimit-Remaining"] == "7"
+    assert calls == [(["rate:ip:60:127.0.0.1", "rate:user:60:user-1"], 3)]
+
+
+@pytest.mark.asyncio
+async def test_rate_limiter_rejects_with_retry_after(monkeypatch):
+    async def fake_evaluate(buckets, cost):
+        return RateLimitDecision(
+            False, limit=10, remaining=0, reset_seconds=30, retry_after_seconds=6
+        )
+
+    monkeypatch.setattr(rate_limit, "_evaluate_strict", fake_evaluate)
+
+    async with AsyncClient(
+        transport=ASGITransport(app=_app(RateLimiter())), base_url="http://test"
+    ) as client:
+        response = await client.get("/limited")
+
+    assert response.status_code == 429
+    assert response.headers["Retry-After"] == "6"
+    assert response.headers["RateLimit-Limit"] == "10"
+
+
+@pytest.mark.asyncio
+async def test_leased_quota_spends_locally_and_keeps_global_limit(monkeypatch):
+    buckets: dict[str, int] = {}
+    round_trips = 0
+
+    async def fake_lease(requests):
+        nonlocal round_trips
+        round_trips += 1
+        grants = []
+        for key, limit, want, refund in requests:
+            available = buckets.get(key, limit.limit) + refund
+            granted = min(want, available)
+            buckets[key] = available - granted
+            grants.append((granted, buckets[key], 60_000))
+        return grants
+
+    monkeypatch.setattr(rate_limit, "_lease_remote", fake_lease)
+    quota = rate_limit.LeasedQuota(block_size=10, lease_seconds=60)
+    limits = [("rate:user:60:u1", RateLimit(scope="user", limit=50))]
+
+    decisions = [await quota.evaluate(limits, 1) for _ in range(60)]
+
+    assert sum(decision.allowed for decision in decisions) == 50
+    assert round_trips <= 5 + 10
+    assert decisions[-1].retry_after_seconds >= 1
@@ -9,3 +9,32 @@ def test_token_roundtrip():
 
     assert decode_access_token(access) == "user-id"
     assert decode_refresh_token(refresh) == "user-id"
+
+
+async def test_revoked_family_rejects_tokens_and_refresh_ids_are_single_use():
+    from app.core.security import decode_token_claims, new_token_family
+    from app.infrastructure.cache.revocation import RevocationList
+
+    revocations = RevocationList(family_ttl_seconds=60)
+    family = new_token_family()
+    access_claims = decode_token_claims(create_access_token("user-id", family), "access")
+    refresh_claims = decode_token_claims(create_refresh_token("user-id", family), "refresh")
+
+    assert access_claims["jti"] != refresh_claims["jti"]
+    assert await revocations.claim(refresh_claims["jti"], refresh_claims["exp"])
+    assert not await revocations.claim(refresh_claims["jti"], refresh_claims["exp"])
+
+    assert not revocations.is_revoked(access_claims)
+    await revocations.revoke_family(family)
+    assert revocations.is_revoked(access_claims)
+
+
+def test_external_token_without_subject_is_rejected(monkeypatch):
+    from types import SimpleNamespace
+
+    from app.core import security
+
+    stub = SimpleNamespace(enabled=True, decode=lambda token: {"aud": "project-1"})
+    monkeypatch.setattr(security, "jwks_cache", stub)
+
+    assert decode_access_token("external-token") is None
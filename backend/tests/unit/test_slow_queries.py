@@ -0,0 +1,65 @@
+from __future__ import annotations
+
+import asyncio
+import uuid
+
+import pytest
+from sqlalchemy.ext.asyncio import create_async_engine
+from sqlmodel import SQLModel
+from sqlmodel.ext.asyncio.session import AsyncSession
+
+from app.domain.services import users as users_service
+from app.infrastructure.observability import queries
+from app.infrastructure.observability.slow_queries import SlowQueryLog, redact_parameters
+
+
+def test_redact_parameters_keeps_numbers_and_ids_but_not_text():
+    user_id = uuid.UUID(int=1)
+
+    assert redact_parameters(("%femur%", 10, None, user_id)) == [
+        "<str:7>",
+        10,
+        None,
+        str(user_id),
+    ]
+    assert redact_parameters({"hashed_password": 3, "limit": 5}) == {
+        "hashed_password": "<redacted>",
+        "limit": 5,
+    }
+
+
+def test_slow_query_log_ranks_shapes_by_total_time():
+    log = SlowQueryLog(threshold_ms=10, explain_sample_rate=0, max_shapes=2)
+    log.observe(None, "SELECT 1", (), "SELECT 1", 0.005)
+    log.observe(None, "SELECT a", (), "SELECT a", 0.050)
+    log.observe(None, "SELECT b", (), "SELECT b", 0.020)
+    log.observe(None, "SELECT b", (), "SELECT b", 0.040)
+    log.observe(None, "SELECT c", (), "SELECT c", 0.030)
+
+    # "SELECT 1" is under the threshold; "SELECT a" had the least time when
+    # "SELECT c" needed room.
+    assert [(entry.shape, entry.count) for entry in log.top()] == [
+        ("SELECT b", 2),
+        ("SELECT c", 1),
+    ]
+    assert log.top(1)[0].max_ms == pytest.approx(40)
+
+
+@pytest.mark.asyncio
+async def test_slow_select_records_caller_and_sampled_plan(tmp_path, monkeypatch):
+    engine = create_async_engine(f"sqlite+aiosqlite:///{tmp_path / 'slow.db'}")
+    async with engine.begin() as conn:
+        await conn.run_sync(SQLModel.metadata.create_all)
+
+    log = SlowQueryLog(threshold_ms=1e-6, explain_sample_rate=1.0)
+    log.register_engine(engine)
+    monkeypatch.setattr(queries, "slow_query_log", log)
+
+    async with AsyncSession(engine) as session:
+        await users_service.get_user_by_email(session, "femur@example.com")
+    await asyncio.gather(*log._tasks)
+
+    entry = next(item for item in log.top() if "FROM users" in item.shape)
+    assert entry.caller == "app.domain.services.users.get_user_by_email"
+    assert entry.explain and any("users" in line for line in entry.explain)
+    await engine.dispose()
@@ -0,0 +1,71 @@
+from __future__ import annotations
+
+import uuid
+from datetime import datetime, timedelta
+
+import pytest
+from sqlalchemy.ext.asyncio import create_async_engine
+from sqlmodel import SQLModel
+from sqlmodel.ext.asyncio.session import AsyncSession
+
+from app.domain.models import ReviewState
+from app.domain.services.srs import (
+    MIN_EASE,
+    RELEARN_DELAY,
+    Review,
+    due_question_ids,
+    record_reviews,
+    schedule,
+)
+from app.infrastructure.observability.queries import assert_max_queries
+
+NOW = datetime(2026, 3, 1, 9, 0, 0)
+
+
+def test_sm2_intervals_grow_and_reset_on_lapse():
+    state = ReviewState(user_id=uuid.uuid4(), question_id=uuid.uuid4())
+
+    intervals = []
+    for day in range(3):
+        schedule(state, True, NOW + timedelta(days=day))
+        intervals.append(state.interval_days)
+    assert intervals == [1.0, 6.0, 15.0]
+    assert state.due_at == NOW + timedelta(days=2 + 15)
+
+    schedule(state, False, NOW)
+    assert (state.repetitions, state.lapses, state.interval_days) == (0, 1, 0.0)
+    assert state.due_at == NOW + RELEARN_DELAY
+    assert state.ease == pytest.approx(2.5 - 0.54)
+
+    for _ in range(5):
+        schedule(state, False, NOW)
+    assert state.ease == MIN_EASE
+
+
+@pytest.mark.asyncio
+async def test_due_queue_is_one_range_query_ordered_by_due_time(tmp_path):
+    engine = create_async_engine(f"sqlite+aiosqlite:///{tmp_path / 'srs.db'}")
+    async with engine.begin() as conn:
+        await conn.run_sync(SQLModel.metadata.create_all)
+    user_id = uuid.uuid4()
+    missed, learned, fresh = uuid.uuid4(), uuid.uuid4(), uuid.uuid4()
+
+    async with AsyncSession(engine) as session:
+        await record_reviews(
+            session,
+            user_id,
+            [
+                Review(learned, True, NOW - timedelta(days=3)),
+                Review(missed, False, NOW - timedelta(days=2)),
+                Review(fresh, True, NOW - timedelta(hours=1)),
+                Review(missed, True, NOW - timedelta(days=2, minutes=-15)),
+            ],
+        )
+        await session.commit()
+
+        with assert_max_queries(1):
+            due = await due_question_ids(session, user_id, NOW, limit=10)
+        # "learned" came due two days ago, "missed" one day ago; "fresh" is not due.
+        assert due == [learned, missed]
+        assert await due_question_ids(session, uuid.uuid4(), NOW, limit=10) == []
+    await engine.dispose()
@@ -0,0 +1,79 @@
+from __future__ import annotations
+
+import pytest
+from sqlalchemy import event
+from sqlalchemy.ext.asyncio import create_async_engine
+from sqlmodel import SQLModel, select
+from sqlmodel.ext.asyncio.session import AsyncSession
+
+from app.domain.models import Organization
+from app.infrastructure.db.unit_of_work import on_commit, on_rollback, unit_of_work
+
+
+@pytest.fixture()
+async def engine(tmp_path):
+    engine = create_async_engine(f"sqlite+aiosqlite:///{tmp_path / 'uow.db'}")
+    async with engine.begin() as conn:
+        await conn.run_sync(SQLModel.metadata.create_all)
+    yield engine
+    await engine.dispose()
+
+
+@pytest.mark.asyncio
+async def test_unit_of_work_commits_once_then_runs_callbacks(engine):
+    commits: list[str] = []
+    events: list[str] = []
+    event.listen(engine.sync_engine, "commit", lambda conn: commits.append("commit"))
+
+    async def invalidate() -> None:
+        events.append(f"invalidated after {len(commits)} commit(s)")
+
+    async with AsyncSession(engine) as session, unit_of_work(session):
+        session.add(Organization(name="Anatomia I"))
+        await session.flush()
+        await on_commit(session, invalidate)
+        session.add(Organization(name="Anatomia II"))
+        await session.flush()
+        assert events == []
+
+    assert commits == ["commit"]
+    assert events == ["invalidated after 1 commit(s)"]
+    async with AsyncSession(engine) as session:
+        assert len((await session.exec(select(Organization))).all()) == 2
+
+
+@pytest.mark.asyncio
+async def test_unit_of_work_rolls_back_and_drops_callbacks_on_error(engine):
+    events: list[str] = []
+
+    async def invalidate() -> None:
+        events.append("invalidated")
+
+    async def release() -> None:
+        events.append("released")
+
+    async with AsyncSession(engine) as session:
+        with pytest.raises(RuntimeError):
+            async with unit_of_work(session):
+                session.add(Organization(name="Anatomia III"))
+                await session.flush()
+                await on_commit(session, invalidate)
+                await on_rollback(session, release)
+                raise RuntimeError("boom")
+
+    assert events == ["released"]
+    async with AsyncSession(engine) as session:
+        assert (await session.exec(select(Organization))).all() == []
+
+
+@pytest.mark.asyncio
+async def test_on_commit_runs_immediately_outside_unit_of_work(engine):
+    events: list[str] = []
+
+    async def invalidate() -> None:
+        events.append("invalidated")
+
+    async with AsyncSession(engine) as session:
+        await on_commit(session, invalidate)
+
+    assert events == ["invalidated"]
@@ -0,0 +1,113 @@
+from __future__ import annotations
+
+import json
+import uuid
+
+import pytest
+from sqlalchemy import func, select
+from sqlalchemy.exc import OperationalError
+from sqlmodel.ext.asyncio.session import AsyncSession
+
+from app.domain.models import QuizAttempt
+from app.infrastructure.db.session import engine
+from app.infrastructure.db.write_behind import (
+    AttemptBufferFull,
+    AttemptWriteBehind,
+    _load,
+    _row,
+)
+
+
+def _attempts(session_id: uuid.UUID, count: int) -> list[QuizAttempt]:
+    return [
+        QuizAttempt(session_id=session_id, question_id=uuid.uuid4(), is_correct=bool(index % 2))
+        for index in range(count)
+    ]
+
+
+async def _stored(session_id: uuid.UUID) -> int:
+    async with engine.connect() as conn:
+        result = await conn.execute(
+            select(func.count()).where(QuizAttempt.__table__.c.session_id == session_id)
+        )
+        return result.scalar_one()
+
+
+def _writer(tmp_path, **overrides) -> AttemptWriteBehind:
+    options = {"flush_size": 100, "flush_interval": 60, "max_pending": 100}
+    return AttemptWriteBehind(journal_dir=str(tmp_path), **(options | overrides))
+
+
+@pytest.mark.asyncio
+async def test_flush_inserts_in_bulk_and_drops_the_journal(tmp_path):
+    writer = _writer(tmp_path)
+    session_id = uuid.uuid4()
+    async with AsyncSession(engine) as session:
+        await writer.add(session, _attempts(session_id, 5))
+
+    assert len(writer) == 5
+    assert len(list(tmp_path.glob("attempts-*.jsonl"))) == 1
+    assert await writer.flush() == 5
+    assert await _stored(session_id) == 5
+    assert list(tmp_path.glob("attempts-*.jsonl")) == []
+
+
+@pytest.mark.asyncio
+async def test_journal_of_a_dead_worker_is_replayed_once(tmp_path):
+    crashed = _writer(tmp_path)
+    session_id = uuid.uuid4()
+    async with AsyncSession(engine) as session:
+        await crashed.add(session, _attempts(session_id, 3))
+    live = _writer(tmp_path)
+    assert await live.replay() == 0  # still locked by its owner
+
+    crashed._segment.handle.close()  # the worker dies; its lock goes with it
+    assert await live.replay() == 3
+    assert await _stored(session_id) == 3
+    assert list(tmp_path.glob("attempts-*.jsonl")) == []
+
+
+@pytest.mark.asyncio
+async def test_full_buffer_pushes_back_while_the_database_is_down(tmp_path, monkeypatch):
+    writer = _writer(tmp_path, max_pending=4)
+    session_id = uuid.uuid4()
+
+    async def unavailable(rows):
+        raise OperationalError("INSERT", {}, Exception("database is down"))
+
+    monkeypatch.setattr(writer, "_insert", unavailable)
+    async with AsyncSession(engine) as session:
+        await writer.add(session, _attempts(session_id, 4))
+        with pytest.raises(AttemptBufferFull):
+            await writer.add(session, _attempts(session_id, 1))
+    assert len(writer) == 4
+    assert len(list(tmp_path.glob("attempts-*.jsonl"))) == 1
+
+    monkeypatch.undo()
+    async with AsyncSession(engine) as session:
+        # The stalled writer flushes the backlog, then gets in.
+        await writer.add(session, _attempts(session_id, 1))
+    assert await writer.flush() == 1
+    assert await _stored(session_id) == 5
+    assert list(tmp_path.glob("attempts-*.jsonl")) == []
+
+
+@pytest.mark.asyncio
+async def test_refused_row_is_dead_lettered_without_blocking_the_batch(tmp_path):
+    writer = _writer(tmp_path)
+    session_id = uuid.uuid4()
+    attempts = _attempts(session_id, 3)
+    async with engine.begin() as conn:
+        # Already stored, so inserting it again always violates the primary key.
+        await conn.execute(QuizAttempt.__table__.insert(), [_row(attempts[1])])
+    async with AsyncSession(engine) as session:
+        await writer.add(session, attempts)
+
+    assert await writer.flush() == 2
+    assert len(writer) == 0
+    assert await _stored(session_id) == 3
+    assert list(tmp_path.glob("attempts-*.jsonl")) == []
+    [rejected] = tmp_path.glob("rejected-*.jsonl")
+    [line] = rejected.read_text(encoding="utf-8").splitlines()
+    assert _load(line)["id"] == attempts[1].id
+    assert "error" in json.loads(line)